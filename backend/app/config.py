@@ -59,7 +59,87 @@ class Settings(BaseSettings):
     # ── OpenAI ─────────────────────────────────────────────────
     OPENAI_API_KEY: str = ""
     OPENAI_API_KEY_2: str = ""
+    OPENAI_EXTRA_API_KEYS: list[str] = []  # Further keys for the key pool
     OPENAI_MODEL_NAME: str = "gpt-4o-mini"
+    OPENAI_BASE_URL: str = ""  # Override API base URL (e.g., a local mock server)
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENAI_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    OPENAI_HTTP2: bool = True
+    OPENAI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    OPENAI_TIMEOUT_SECONDS: float = 60.0
+    OPENAI_MAX_RETRIES: int = 2
+
+    # ── LLM Scheduler ──────────────────────────────────────────
+    LLM_MAX_CONCURRENCY: int = 32
+    LLM_MAX_QUEUE: int = 256
+    # Max queue wait per request class before failing fast with 503
+    LLM_QUEUE_DEADLINES_MS: dict[str, int] = {
+        "paid_chat": 15_000,
+        "agent_recommend": 10_000,
+        "company_search": 5_000,
+        "free_chat": 3_000,
+        "translation": 2_000,
+    }
+
+    # ── LLM Resilience ─────────────────────────────────────────
+    # Total time budget per request class (queue wait + all attempts)
+    LLM_DEADLINES_SECONDS: dict[str, float] = {
+        "paid_chat": 60,
+        "agent_recommend": 45,
+        "company_search": 20,
+        "free_chat": 30,
+        "translation": 20,
+    }
+    LLM_RETRY_BASE_DELAY_MS: int = 250
+    # Classes that fire a second request once the first passes its p95 latency
+    LLM_HEDGE_CLASSES: list[str] = ["company_search", "agent_recommend"]
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+
+    # ── Model Routing ──────────────────────────────────────────
+    # Per-route overrides of model_router.DEFAULT_ROUTES, e.g.
+    # {"brief": {"models": ["gpt-4o"], "max_tokens": 2000, "timeout": 90}}
+    MODEL_ROUTES: dict[str, dict] = {}
+
+    # ── History Compaction ─────────────────────────────────────
+    # Histories above this estimate are sent as summary + recent turns
+    HISTORY_TOKEN_BUDGET: int = 1500
+    HISTORY_KEEP_MESSAGES: int = 6
+    HISTORY_SUMMARY_STEP: int = 6  # Summary advances this many messages at a time
+    HISTORY_SUMMARY_MAX_TOKENS: int = 250
+    HISTORY_SUMMARY_CACHE_ENTRIES: int = 5000
+    HISTORY_SUMMARY_RETRY_SECONDS: int = 30  # Back-off after a failed summary
+
+    # ── Conversation Store ─────────────────────────────────────
+    CONVERSATION_BACKEND: str = "memory"  # memory | sqlite
+    CONVERSATION_DB_PATH: str = "var/conversations.db"
+    CONVERSATION_MAX_ENTRIES: int = 10_000  # Conversations kept in memory
+    CONVERSATION_MAX_MESSAGES: int = 200  # Most recent messages kept per conversation
+    CONVERSATION_TTL_SECONDS: int = 7 * 24 * 60 * 60
+
+    # ── Chat Response Cache ────────────────────────────────────
+    # Opt-in: cached personas repeat one sampled reply for identical requests
+    CHAT_CACHE_PERSONAS: list[str] = []  # e.g. ["product"]
+    CHAT_CACHE_MAX_ENTRIES: int = 2000
+    CHAT_CACHE_TTL_SECONDS: int = 60 * 60
+
+    # ── TTS Audio Cache ────────────────────────────────────────
+    TTS_CACHE_DIR: str = "var/tts_cache"  # "" disables
+    TTS_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # Per worker process
+    TTS_CACHE_MAX_ENTRIES: int = 50_000
+    TTS_PIPELINE_CONCURRENCY: int = 3  # Sentences synthesized in parallel by /speak/stream
+
+    # ── Translation Memory ─────────────────────────────────────
+    TRANSLATION_MEMORY_PATH: str = "var/translations.db"  # "" keeps it in memory only
+    TRANSLATION_MEMORY_MAX_ENTRIES: int = 20_000
+
+    # ── Question Cache ─────────────────────────────────────────
+    QUESTION_CACHE_PATH: str = "var/question_cache.json"  # "" keeps it in memory only
+
+    # ── Recommendation Cache ───────────────────────────────────
+    RECOMMENDATION_CACHE_PATH: str = "var/recommendations.db"  # "" keeps it in memory only
+    RECOMMENDATION_CACHE_MAX_ENTRIES: int = 5000
+    RECOMMENDATION_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
 
     # ── Supabase ───────────────────────────────────────────────
     SUPABASE_URL: str = "https://bbaydychuoahmdkbgghw.supabase.co"
@@ -78,13 +158,28 @@ class Settings(BaseSettings):
 
     # ── Google Sheets ──────────────────────────────────────────
     GOOGLE_SHEETS_WEBHOOK_URL: str = ""
+    GOOGLE_SHEETS_BASE_URL: str = "https://docs.google.com"  # Override for a local mock
 
     # ── Rate Limiting ──────────────────────────────────────────
+    RATE_LIMIT_ENABLED: bool = True  # Disable for local load tests only
     RATE_LIMIT_CHAT: str = "10/minute"
     RATE_LIMIT_COMPANIES: str = "30/minute"
     RATE_LIMIT_SPEAK: str = "5/minute"
     RATE_LIMIT_DEFAULT: str = "60/minute"
 
+    # ── Agent Sessions ─────────────────────────────────────────
+    SESSION_BACKEND: str = "memory"  # memory | redis | sqlite
+    REDIS_URL: str = "redis://localhost:6379/0"
+    SESSION_SQLITE_PATH: str = "var/sessions.db"
+    SESSION_FLUSH_INTERVAL_MS: int = 5
+    SESSION_FLUSH_BATCH_SIZE: int = 500
+    SESSION_SNAPSHOT_PATH: str = "var/sessions.snapshot"  # memory backend only; "" disables
+    SESSION_MAX_ENTRIES: int = 100_000
+    SESSION_IDLE_TTL_SECONDS: int = 6 * 60 * 60
+    SESSION_MAX_BYTES: int = 256 * 1024 * 1024
+    SESSION_COMPLETED_TTL_SECONDS: int = 30 * 60
+    SESSION_SWEEP_INTERVAL_SECONDS: int = 60
+
     # ── Computed Properties ────────────────────────────────────
 
     @property
@@ -109,6 +204,12 @@ class Settings(BaseSettings):
         """Return the primary key, fallback to secondary."""
         return self.OPENAI_API_KEY or self.OPENAI_API_KEY_2
 
+    @property
+    def openai_api_keys(self) -> list[str]:
+        """Every configured OpenAI key (deduplicated), for the key pool."""
+        keys = [self.OPENAI_API_KEY, self.OPENAI_API_KEY_2, *self.OPENAI_EXTRA_API_KEYS]
+        return list(dict.fromkeys(k for k in keys if k))
+
 
 @lru_cache
 def get_settings() -> Settings:
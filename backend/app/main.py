@@ -4,12 +4,13 @@ IKSHAN BACKEND — FastAPI Application Entry Point
 
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 import structlog
 import uvicorn
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
 from app.config import get_settings
 from app.middleware.rate_limit import setup_rate_limiter
@@ -54,9 +55,54 @@ async def lifespan(app: FastAPI):
     from app.services.persona_doc_service import preload_all_docs
     preload_all_docs()
 
+    # One pooled OpenAI client for every chat / TTS / translation / agent call
+    from app.services import openai_service
+    await openai_service.init_client()
+
+    # Index the on-disk TTS audio cache
+    from app.services import tts_cache
+    await tts_cache.init_cache()
+
+    # Open the translation memory used by translate_text / TTS
+    from app.services import translation_memory
+    await translation_memory.init_memory()
+
+    # Server-side chat histories (conversationId mode)
+    from app.services import conversation_store
+    await conversation_store.init_store()
+
+    # Precomputed agent questions (built by scripts.warm_question_cache)
+    from app.services import question_cache
+    await question_cache.init_cache()
+
+    # Recommendations keyed by answer vector
+    from app.services import recommendation_cache
+    await recommendation_cache.init_cache()
+
+    # Connect the agent session backend and map the previous snapshot
+    from app.services import session_store
+    await session_store.init_backend()
+    await session_store.restore_snapshot()
+    sweeper = asyncio.create_task(session_store.run_sweeper())
+
     yield
+    sweeper.cancel()
+    await session_store.save_snapshot()
+    await session_store.close_backend()
+    await translation_memory.close_memory()
+    await conversation_store.close_store()
+    await question_cache.close_cache()
+    await recommendation_cache.close_cache()
+    await openai_service.close_client()
     logger.info("🛑 Ikshan Backend shutting down")
 
+async def label_endpoint(request: Request) -> None:
+    """Tag metrics recorded while serving this request with its route template."""
+    from app.services import metrics
+    route = request.scope.get("route")
+    metrics.label_request(endpoint=getattr(route, "path", request.url.path))
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
 
@@ -66,6 +112,7 @@ def create_app() -> FastAPI:
         openapi_url="/openapi.json",
         default_response_class=ORJSONResponse,
         lifespan=lifespan,
+        dependencies=[Depends(label_endpoint)],
     )
 
     app.add_middleware(
@@ -78,6 +125,55 @@ def create_app() -> FastAPI:
 
     setup_rate_limiter(app)
 
+    from app.services.llm_resilience import LLMDeadlineExceeded
+    from app.services.llm_scheduler import LLMOverloadedError
+    from app.services.conversation_store import (
+        ConversationConflictError,
+        ConversationNotFoundError,
+    )
+    from app.services.session_store import SessionConflictError
+
+    @app.exception_handler(LLMOverloadedError)
+    async def llm_overloaded_handler(request: Request, exc: LLMOverloadedError):
+        return ORJSONResponse(
+            status_code=503,
+            content={"detail": "AI service is busy, please retry shortly"},
+            headers={"Retry-After": "2"},
+        )
+
+    @app.exception_handler(LLMDeadlineExceeded)
+    async def llm_deadline_handler(request: Request, exc: LLMDeadlineExceeded):
+        return ORJSONResponse(
+            status_code=504,
+            content={"detail": "AI service took too long to respond, please retry"},
+            headers={"Retry-After": "2"},
+        )
+
+    @app.exception_handler(SessionConflictError)
+    async def session_conflict_handler(request: Request, exc: SessionConflictError):
+        return ORJSONResponse(
+            status_code=409,
+            content={"detail": "Session was modified concurrently, please retry"},
+        )
+
+    @app.exception_handler(ConversationConflictError)
+    async def conversation_conflict_handler(request: Request, exc: ConversationConflictError):
+        return ORJSONResponse(
+            status_code=409,
+            content={
+                "detail": "Conversation has moved on or a reply is still in progress",
+                "conversationId": exc.conversation_id,
+                "conversationVersion": exc.actual,
+            },
+        )
+
+    @app.exception_handler(ConversationNotFoundError)
+    async def conversation_not_found_handler(request: Request, exc: ConversationNotFoundError):
+        return ORJSONResponse(
+            status_code=404,
+            content={"detail": "Conversation not found or expired"},
+        )
+
     # ── Routers ────────────────────────────────────────────────
     from app.routers import (
         chat,
@@ -110,7 +206,41 @@ def create_app() -> FastAPI:
 
     @app.get("/health", tags=["System"])
     async def health_check():
-        return {"status": "healthy", "version": settings.APP_VERSION}
+        from app.services import (
+            conversation_store,
+            history_compactor,
+            model_router,
+            openai_service,
+            question_cache,
+            recommendation_cache,
+            session_store,
+            tts_cache,
+        )
+        from app.services.llm_resilience import latency
+        from app.services.llm_scheduler import get_scheduler
+        return {
+            "status": "healthy",
+            "version": settings.APP_VERSION,
+            "sessions": session_store.get_store_stats(),
+            "chat_cache": openai_service.get_chat_cache_stats(),
+            "conversations": conversation_store.stats(),
+            "question_cache": question_cache.stats(),
+            "recommendation_cache": recommendation_cache.stats(),
+            "history_summaries": history_compactor.stats(),
+            "tts_cache": tts_cache.stats(),
+            "llm_scheduler": get_scheduler().stats(),
+            "openai_keys": openai_service.get_key_pool_stats(),
+            "llm_latency": latency.stats(),
+            "model_routes": model_router.stats(),
+        }
+
+    @app.get("/metrics", tags=["System"], include_in_schema=False)
+    async def prometheus_metrics():
+        from app.services import metrics
+        return PlainTextResponse(
+            metrics.render_prometheus(),
+            media_type="text/plain; version=0.0.4",
+        )
 
     return app
 
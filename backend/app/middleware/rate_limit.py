@@ -10,9 +10,11 @@ from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 from fastapi import FastAPI
 
+from app.config import get_settings
+
 
 # Global limiter instance — keyed by client IP
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=get_remote_address, enabled=get_settings().RATE_LIMIT_ENABLED)
 
 
 def setup_rate_limiter(app: FastAPI) -> None:
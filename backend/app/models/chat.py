@@ -26,13 +26,25 @@ class ChatRequest(BaseModel):
     context: Optional[ChatContext] = None
     # We use List[ConversationMessage] directly so the generator sees the class
     conversationHistory: Optional[List[ConversationMessage]] = None
+    # Server-side history: send conversationVersion=0 (no id) to start, then the
+    # returned id + version each turn; conversationHistory is then ignored
+    conversationId: Optional[str] = None
+    conversationVersion: Optional[int] = Field(default=None, ge=0)
     stage: int = Field(default=1, ge=1, le=2)
     payment_order_id: Optional[str] = None
 
 class ChatResponse(BaseModel):
     message: str
     usage: Optional[Dict[str, Any]] = None
+    conversationId: Optional[str] = None
+    conversationVersion: Optional[int] = None
+
+class ConversationResponse(BaseModel):
+    conversationId: str
+    conversationVersion: int
+    messages: List[ConversationMessage]
 
 # 2. Force the rebuild so the doc generator doesn't see "ForwardRef"
 ChatRequest.model_rebuild()
-ChatResponse.model_rebuild()
\ No newline at end of file
+ChatResponse.model_rebuild()
+ConversationResponse.model_rebuild()
\ No newline at end of file
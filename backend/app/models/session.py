@@ -5,16 +5,26 @@ SESSION MODELS — Chat Session Context Preservation
 Models for tracking the full conversational context across
 all stages: initial Q1-Q3, dynamic persona questions, and
 tool recommendations.
+
+Two representations of a session:
+  • SessionRecord / QARecord — compact __slots__ dataclasses used on
+    the hot path by the session store (no validation per mutation)
+  • SessionContext / QuestionAnswer — the original validated pydantic
+    models (scripts/bench_session_memory.py compares the two)
 """
 
 from __future__ import annotations
 
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any, Optional
 
 from pydantic import BaseModel, Field
 
+from app.utils.interning import intern_text, register_canonical
+
 
 class SessionStage(str, Enum):
     """Current stage of the user's session flow."""
@@ -76,6 +86,88 @@ class SessionContext(BaseModel):
     agent_conversation: list[dict[str, str]] = []
 
 
+# ── Compact Internal Representation ───────────────────────────
+
+
+@dataclass(slots=True)
+class QARecord:
+    """A single question-answer pair (internal, unvalidated)."""
+    question: str
+    answer: str
+    question_type: str = "static"
+
+
+register_canonical("static", "dynamic")
+
+
+@dataclass(slots=True)
+class SessionRecord:
+    """
+    Hot-path session state held by the session store.
+
+    Same attribute names as SessionContext so routers can use either, but
+    without pydantic validation on construction or mutation. Timestamps
+    are epoch seconds (floats) instead of datetime objects, and `version`
+    counts committed writes for optimistic concurrency control.
+    """
+    session_id: str
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    version: int = 0  # bumped on every write; used for compare-and-swap
+    stage: SessionStage = SessionStage.OUTCOME
+    outcome: Optional[str] = None
+    outcome_label: Optional[str] = None
+    domain: Optional[str] = None
+    task: Optional[str] = None
+    persona_doc_name: Optional[str] = None
+    persona_context_loaded: bool = False
+    questions_answers: list[QARecord] = field(default_factory=list)
+    dynamic_questions: list[str] = field(default_factory=list)
+    dynamic_questions_asked: int = 0
+    dynamic_questions_total: int = 0
+    recommended_extensions: list[dict[str, Any]] = field(default_factory=list)
+    recommended_gpts: list[dict[str, Any]] = field(default_factory=list)
+    recommended_companies: list[dict[str, Any]] = field(default_factory=list)
+    agent_conversation: list[dict[str, str]] = field(default_factory=list)
+
+    def to_dict(self, include_qa: bool = True) -> dict[str, Any]:
+        """Compact JSON-ready dict; empty/default fields are omitted."""
+        data: dict[str, Any] = {
+            "session_id": self.session_id,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "stage": self.stage.value,
+        }
+        for name in (
+            "version", "outcome", "outcome_label", "domain", "task", "persona_doc_name",
+            "persona_context_loaded", "dynamic_questions",
+            "dynamic_questions_asked", "dynamic_questions_total",
+            "recommended_extensions", "recommended_gpts",
+            "recommended_companies", "agent_conversation",
+        ):
+            value = getattr(self, name)
+            if value:
+                data[name] = value
+        if include_qa and self.questions_answers:
+            data["qa"] = [
+                [qa.question, qa.answer, qa.question_type]
+                for qa in self.questions_answers
+            ]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SessionRecord":
+        """Inverse of to_dict()."""
+        fields = dict(data)
+        qa = fields.pop("qa", ())
+        fields["stage"] = SessionStage(fields.get("stage", SessionStage.OUTCOME))
+        record = cls(**fields)
+        record.questions_answers = [
+            QARecord(intern_text(q), a, intern_text(t)) for q, a, t in qa
+        ]
+        return record
+
+
 # ── API Request/Response Models ────────────────────────────────
 
 
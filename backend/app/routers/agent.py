@@ -10,18 +10,23 @@ POST /api/v1/agent/session/domain       — Record Q2 (domain)
 POST /api/v1/agent/session/task         — Record Q3 (task) + generate dynamic Qs
 POST /api/v1/agent/session/answer       — Submit dynamic question answer
 POST /api/v1/agent/session/recommend    — Get final personalized recommendations
+POST /api/v1/agent/session/recommend/stream — Same, streamed tool by tool (NDJSON)
 GET  /api/v1/agent/session/{id}         — Get full session context
 GET  /api/v1/agent/personas             — List available persona domains
 """
 
+import orjson
 import structlog
 from fastapi import APIRouter, Body, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 from app.config import get_settings
 from app.middleware.rate_limit import limiter
 from app.services import session_store, agent_service
+from app.services.llm_resilience import LLMDeadlineExceeded
+from app.services.llm_scheduler import LLMOverloadedError
 from app.services.persona_doc_service import get_available_personas, get_doc_for_domain, get_diagnostic_sections
 from app.models.session import (
     SessionStage,
@@ -85,6 +90,49 @@ class SessionContextResponse(BaseModel):
     recommendations: dict[str, Any] = {}
 
 
+def _tool_recommendation(category: str, tool: dict) -> ToolRecommendation:
+    """Map one tool from the LLM's recommendation JSON to the response model."""
+    return ToolRecommendation(
+        name=tool.get("name", ""),
+        description=tool.get("description", ""),
+        url=tool.get("url"),
+        category=category,
+        free=tool.get("free") if category == "extension" else None,
+        rating=tool.get("rating") if category == "gpt" else None,
+        why_recommended=tool.get("why_recommended", ""),
+    )
+
+
+def _ndjson(data: dict) -> bytes:
+    return orjson.dumps(data) + b"\n"
+
+
+async def _recommendation_profile(session_id: str):
+    """The session plus the keyword arguments for the recommendation calls."""
+    if not get_settings().openai_api_key_active:
+        raise HTTPException(
+            status_code=503,
+            detail="AI service unavailable — OpenAI API key not configured.",
+        )
+
+    session = await session_store.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    # Build Q&A list
+    qa_list = [
+        {"q": qa.question, "a": qa.answer, "type": qa.question_type}
+        for qa in session.questions_answers
+    ]
+    return session, {
+        "outcome": session.outcome or "",
+        "outcome_label": session.outcome_label or "",
+        "domain": session.domain or "",
+        "task": session.task or "",
+        "questions_answers": qa_list,
+    }
+
+
 # ── Endpoints ──────────────────────────────────────────────────
 
 
@@ -92,7 +140,7 @@ class SessionContextResponse(BaseModel):
 @limiter.limit(lambda: get_settings().RATE_LIMIT_DEFAULT)
 async def create_session(request: Request):
     """Create a new chat session."""
-    session = session_store.create_session()
+    session = await session_store.create_session()
     return CreateSessionResponse(
         session_id=session.session_id,
         stage=session.stage.value,
@@ -103,7 +151,7 @@ async def create_session(request: Request):
 @limiter.limit(lambda: get_settings().RATE_LIMIT_DEFAULT)
 async def set_outcome(request: Request, body: SetOutcomeRequest = Body(...)):
     """Record Q1: Outcome / Growth Bucket selection."""
-    session = session_store.set_outcome(
+    session = await session_store.set_outcome(
         body.session_id, body.outcome, body.outcome_label
     )
     if not session:
@@ -119,7 +167,7 @@ async def set_outcome(request: Request, body: SetOutcomeRequest = Body(...)):
 @limiter.limit(lambda: get_settings().RATE_LIMIT_DEFAULT)
 async def set_domain(request: Request, body: SetDomainRequest = Body(...)):
     """Record Q2: Domain / Sub-Category selection."""
-    session = session_store.set_domain(body.session_id, body.domain)
+    session = await session_store.set_domain(body.session_id, body.domain)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
@@ -138,14 +186,12 @@ async def set_task_and_generate_questions(request: Request, body: SetTaskRequest
     No GPT call — content comes straight from the pre-parsed .docx files.
     Returns Problems, RCA Bridge symptoms, and Opportunities as structured questions.
     """
-    session = session_store.set_task(body.session_id, body.task)
+    session = await session_store.set_task(body.session_id, body.task)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
     # Look up which persona doc this domain maps to
     persona_doc_name = get_doc_for_domain(session.domain or "")
-    session.persona_doc_name = persona_doc_name
-    session.persona_context_loaded = persona_doc_name is not None
 
     # Load diagnostic sections from pre-parsed document (instant, no GPT)
     diagnostic = get_diagnostic_sections(
@@ -167,10 +213,14 @@ async def set_task_and_generate_questions(request: Request, body: SetTaskRequest
                 section_label=section["label"],
             )
             dynamic_qs.append(dq)
-            session.dynamic_questions.append(section["question"])
 
-    session.dynamic_questions_total = len(dynamic_qs)
-    session_store.update_session(session)
+    session = await session_store.set_dynamic_questions(
+        session.session_id,
+        questions=[dq.question for dq in dynamic_qs],
+        persona_doc_name=persona_doc_name,
+    )
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
 
     logger.info(
         "Task set, diagnostic sections loaded from document",
@@ -195,24 +245,18 @@ async def set_task_and_generate_questions(request: Request, body: SetTaskRequest
 @limiter.limit(lambda: get_settings().RATE_LIMIT_CHAT)
 async def submit_dynamic_answer(request: Request, body: SubmitDynamicAnswerRequest = Body(...)):
     """Submit an answer to a dynamic question."""
-    session = session_store.get_session(body.session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-
-    if body.question_index >= len(session.dynamic_questions):
+    try:
+        session = await session_store.add_dynamic_answer(
+            body.session_id, body.question_index, body.answer
+        )
+    except ValueError:
         raise HTTPException(status_code=400, detail="Invalid question index")
-
-    question_text = session.dynamic_questions[body.question_index]
-
-    session = session_store.add_dynamic_answer(
-        body.session_id, question_text, body.answer
-    )
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
     # Determine next question or if all done
     next_index = body.question_index + 1
-    all_answered = next_index >= session.dynamic_questions_total
+    all_answered = session.dynamic_questions_asked >= session.dynamic_questions_total
 
     next_question = None
     if not all_answered and next_index < len(session.dynamic_questions):
@@ -239,34 +283,13 @@ async def get_recommendations(request: Request, body: GetRecommendationsRequest
     Generate final personalized tool recommendations based on
     all Q&A (static Q1-Q3 + dynamic questions).
     """
-    settings = get_settings()
-    if not settings.openai_api_key_active:
-        raise HTTPException(
-            status_code=503,
-            detail="AI service unavailable — OpenAI API key not configured.",
-        )
-
-    session = session_store.get_session(body.session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-
-    # Build Q&A list
-    qa_list = [
-        {"q": qa.question, "a": qa.answer, "type": qa.question_type}
-        for qa in session.questions_answers
-    ]
+    session, profile = await _recommendation_profile(body.session_id)
 
     # Generate personalized recommendations
-    recs = await agent_service.generate_personalized_recommendations(
-        outcome=session.outcome or "",
-        outcome_label=session.outcome_label or "",
-        domain=session.domain or "",
-        task=session.task or "",
-        questions_answers=qa_list,
-    )
+    recs = await agent_service.generate_personalized_recommendations(**profile)
 
     # Store in session
-    session_store.set_recommendations(
+    await session_store.set_recommendations(
         session.session_id,
         extensions=recs.get("extensions", []),
         gpts=recs.get("gpts", []),
@@ -274,43 +297,13 @@ async def get_recommendations(request: Request, body: GetRecommendationsRequest
     )
 
     # Build response
-    extensions = [
-        ToolRecommendation(
-            name=ext.get("name", ""),
-            description=ext.get("description", ""),
-            url=ext.get("url"),
-            category="extension",
-            free=ext.get("free"),
-            why_recommended=ext.get("why_recommended", ""),
-        )
-        for ext in recs.get("extensions", [])
-    ]
-
-    gpts = [
-        ToolRecommendation(
-            name=gpt.get("name", ""),
-            description=gpt.get("description", ""),
-            url=gpt.get("url"),
-            category="gpt",
-            rating=gpt.get("rating"),
-            why_recommended=gpt.get("why_recommended", ""),
-        )
-        for gpt in recs.get("gpts", [])
-    ]
-
-    companies = [
-        ToolRecommendation(
-            name=co.get("name", ""),
-            description=co.get("description", ""),
-            url=co.get("url"),
-            category="company",
-            why_recommended=co.get("why_recommended", ""),
-        )
-        for co in recs.get("companies", [])
-    ]
+    extensions, gpts, companies = (
+        [_tool_recommendation(category, tool) for tool in recs.get(key, [])]
+        for key, category in agent_service.RECOMMENDATION_CATEGORIES.items()
+    )
 
     # Get session summary for context
-    summary = session_store.get_session_summary(session.session_id) or {}
+    summary = await session_store.get_session_summary(session.session_id) or {}
 
     return GetRecommendationsResponse(
         session_id=session.session_id,
@@ -322,11 +315,72 @@ async def get_recommendations(request: Request, body: GetRecommendationsRequest
     )
 
 
+@router.post("/session/recommend/stream")
+@limiter.limit(lambda: get_settings().RATE_LIMIT_CHAT)
+async def stream_recommendations(request: Request, body: GetRecommendationsRequest = Body(...)):
+    """
+    Same as /session/recommend, streamed as NDJSON: one
+    {"type": "tool", "tool": ToolRecommendation} line per recommendation
+    as soon as the model has finished writing it, then a final
+    {"type": "done", ...} line with the summary and session context,
+    sent after the recommendations are stored in the session. Failures
+    after the first line are reported as {"type": "error"}.
+    """
+    session, profile = await _recommendation_profile(body.session_id)
+    events = agent_service.stream_personalized_recommendations(**profile)
+    try:
+        # Wait for the first event so upstream failures still map to an HTTP error
+        first = await anext(events)
+    except (LLMOverloadedError, LLMDeadlineExceeded):
+        raise
+    except Exception as e:
+        await events.aclose()
+        logger.error("Streaming recommendations failed", error=str(e))
+        raise HTTPException(status_code=500, detail="Recommendation service error")
+
+    async def relay() -> AsyncIterator[bytes]:
+        event = first
+        try:
+            while True:
+                if event["type"] == "tool":
+                    tool = _tool_recommendation(event["category"], event["tool"])
+                    yield _ndjson({"type": "tool", "tool": tool.model_dump()})
+                else:
+                    recs = event["recommendations"]
+                    await session_store.set_recommendations(
+                        session.session_id,
+                        extensions=recs["extensions"],
+                        gpts=recs["gpts"],
+                        companies=recs["companies"],
+                    )
+                    summary = await session_store.get_session_summary(session.session_id) or {}
+                    yield _ndjson({
+                        "type": "done",
+                        "session_id": session.session_id,
+                        "summary": recs["summary"],
+                        "session_context": summary,
+                    })
+                event = await anext(events)
+        except StopAsyncIteration:
+            pass
+        except Exception as e:
+            logger.error("Recommendation stream failed", error=str(e))
+            yield _ndjson({"type": "error", "detail": "Recommendation stream interrupted"})
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        relay(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/session/{session_id}", response_model=SessionContextResponse)
 @limiter.limit(lambda: get_settings().RATE_LIMIT_DEFAULT)
 async def get_session_context(request: Request, session_id: str):
     """Get the full session context (for debugging or UI state recovery)."""
-    summary = session_store.get_session_summary(session_id)
+    summary = await session_store.get_session_summary(session_id)
     if not summary:
         raise HTTPException(status_code=404, detail="Session not found")
 
@@ -5,17 +5,180 @@ CHAT ROUTER — 2-Stage AI Chat with JusPay Payment Gating
 """
 
 # REMOVED: from __future__ import annotations
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+import orjson
 import structlog
 from fastapi import APIRouter, Body, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
 from app.config import get_settings
 from app.middleware.rate_limit import limiter
-from app.models.chat import ChatRequest, ChatResponse
-from app.services import openai_service, juspay_service
+from app.models.chat import ChatRequest, ChatResponse, ConversationResponse
+from app.services import conversation_store, history_compactor, openai_service, juspay_service
+from app.services.conversation_store import (
+    Conversation,
+    ConversationConflictError,
+    ConversationNotFoundError,
+)
+from app.services.llm_resilience import LLMDeadlineExceeded
+from app.services.llm_scheduler import LLMClass, LLMOverloadedError
 
 logger = structlog.get_logger()
 router = APIRouter()
 
+
+async def _enforce_stage2_gate(body: ChatRequest) -> None:
+    """Raise 402 unless a Stage 2 request carries a verified payment."""
+    if body.stage != 2:
+        return
+
+    if not body.payment_order_id:
+        raise HTTPException(
+            status_code=402,
+            detail={
+                "error": "Payment required for Stage 2 chat",
+                "message": "Please complete payment to access premium features.",
+                "action": "create_order",
+            },
+        )
+
+    verification = await juspay_service.verify_payment_for_stage2(
+        body.payment_order_id,
+    )
+    if not verification.get("verified"):
+        raise HTTPException(
+            status_code=402,
+            detail={
+                "error": "Payment not verified",
+                "reason": verification.get("reason", "Unknown"),
+                "status": verification.get("status"),
+            },
+        )
+
+
+def _llm_class(body: ChatRequest) -> LLMClass:
+    """Paid Stage 2 chats are scheduled ahead of free Stage 1 traffic."""
+    return LLMClass.PAID_CHAT if body.stage == 2 else LLMClass.FREE_CHAT
+
+
+async def _resolve_history(
+    body: ChatRequest,
+) -> tuple[Optional[list[dict]], Optional[Conversation]]:
+    """
+    History for this turn: the server-side conversation when the client
+    sends conversationVersion (claiming its next turn), otherwise the
+    transcript uploaded in conversationHistory.
+    """
+    if body.conversationVersion is not None:
+        conversation = await conversation_store.begin_turn(
+            body.conversationId, body.conversationVersion
+        )
+        return conversation.messages, conversation
+    history = [msg.model_dump() for msg in body.conversationHistory] if body.conversationHistory else None
+    return history, None
+
+
+def _history_scope(conversation: Optional[Conversation]) -> Optional[history_compactor.HistoryScope]:
+    if conversation is None:
+        return None
+    return history_compactor.HistoryScope(conversation.id, conversation.trimmed)
+
+
+# ── Server-Sent Events ─────────────────────────────────────────
+
+
+class _RelayResponse(StreamingResponse):
+    """
+    StreamingResponse that runs `cleanup` once the response is over, even
+    when the client disconnected before the body generator ever started
+    (a generator's own `finally` never runs in that case).
+    """
+
+    def __init__(self, content, cleanup: Callable[[], Awaitable[None]], **kwargs):
+        super().__init__(content, **kwargs)
+        self._cleanup = cleanup
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self._cleanup()
+
+
+def _sse(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+async def sse_chat_response(
+    message: str,
+    persona: str,
+    context: Optional[dict],
+    conversation_history: Optional[list[dict]],
+    llm_class: LLMClass = LLMClass.FREE_CHAT,
+    conversation: Optional[Conversation] = None,
+) -> StreamingResponse:
+    """
+    Relay chat_completion_stream() as SSE: `token` events with content
+    deltas, then a final `done` event with the full message and usage.
+
+    The upstream call is awaited up to its first event before the response
+    starts, so failures to reach OpenAI still surface as an HTTP error;
+    failures mid-stream are reported as an `error` event. With a claimed
+    `conversation`, the turn is recorded before `done` is sent and the
+    event carries the new conversationId / conversationVersion.
+    """
+    events = openai_service.chat_completion_stream(
+        message=message,
+        persona=persona,
+        context=context,
+        conversation_history=conversation_history,
+        llm_class=llm_class,
+        history_scope=_history_scope(conversation),
+    )
+    try:
+        first = await anext(events)
+    except BaseException:
+        if conversation is not None:
+            conversation_store.abort_turn(conversation)
+        raise
+
+    # Set once end_turn() owns the claim: it releases it even on failure,
+    # and a later abort_turn() could release the client's next turn
+    completed = False
+
+    async def relay() -> AsyncIterator[bytes]:
+        nonlocal completed
+        event = first
+        try:
+            while True:
+                if event["type"] == "done" and conversation is not None:
+                    event["conversationId"] = conversation.id
+                    completed = True
+                    event["conversationVersion"] = await conversation_store.end_turn(
+                        conversation, message, event["message"]
+                    )
+                yield _sse(event["type"], event)
+                event = await anext(events)
+        except StopAsyncIteration:
+            pass
+        except Exception as e:
+            logger.error("Chat stream failed", error=str(e))
+            yield _sse("error", {"type": "error", "detail": "Chat stream interrupted"})
+
+    async def cleanup() -> None:
+        if conversation is not None and not completed:
+            conversation_store.abort_turn(conversation)
+        await events.aclose()
+
+    return _RelayResponse(
+        relay(),
+        cleanup,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/chat", response_model=ChatResponse)
 @limiter.limit(lambda: get_settings().RATE_LIMIT_CHAT)
 async def chat(request: Request, body: ChatRequest = Body(...)):
@@ -31,51 +194,98 @@ async def chat(request: Request, body: ChatRequest = Body(...)):
         )
 
     # ── Stage 2 Payment Gate ───────────────────────────────────
-    if body.stage == 2:
-        if not body.payment_order_id:
-            raise HTTPException(
-                status_code=402,
-                detail={
-                    "error": "Payment required for Stage 2 chat",
-                    "message": "Please complete payment to access premium features.",
-                    "action": "create_order",
-                },
-            )
-
-        verification = await juspay_service.verify_payment_for_stage2(
-            body.payment_order_id,
-        )
-        if not verification.get("verified"):
-            raise HTTPException(
-                status_code=402,
-                detail={
-                    "error": "Payment not verified",
-                    "reason": verification.get("reason", "Unknown"),
-                    "status": verification.get("status"),
-                },
-            )
+    await _enforce_stage2_gate(body)
 
     # ── Build context and history ──────────────────────────────
     context = body.context.model_dump() if body.context else None
-    history = [msg.model_dump() for msg in body.conversationHistory] if body.conversationHistory else None
+    history, conversation = await _resolve_history(body)
 
     # ── Call OpenAI ────────────────────────────────────────────
+    completed = False  # see sse_chat_response()
     try:
         result = await openai_service.chat_completion(
             message=body.message,
             persona=body.persona.value,
             context=context,
             conversation_history=history,
+            llm_class=_llm_class(body),
+            history_scope=_history_scope(conversation),
         )
+        if conversation is None:
+            return ChatResponse(message=result["message"], usage=result.get("usage"))
 
+        completed = True
+        version = await conversation_store.end_turn(conversation, body.message, result["message"])
         return ChatResponse(
             message=result["message"],
             usage=result.get("usage"),
+            conversationId=conversation.id,
+            conversationVersion=version,
         )
 
+    except (LLMOverloadedError, LLMDeadlineExceeded, ConversationConflictError):
+        raise
     except Exception as e:
         logger.error("Chat completion failed", error=str(e))
         raise HTTPException(
             status_code=500,
             detail=f"Chat service error: {str(e)}",
-        )
\ No newline at end of file
+        )
+    finally:
+        if conversation is not None and not completed:
+            conversation_store.abort_turn(conversation)
+
+
+@router.post("/chat/stream")
+@limiter.limit(lambda: get_settings().RATE_LIMIT_CHAT)
+async def chat_stream(request: Request, body: ChatRequest = Body(...)):
+    """
+    Streaming variant of /chat: relays tokens over Server-Sent Events as
+    the model produces them. Same persona handling and Stage 2 gate.
+    """
+    settings = get_settings()
+
+    if not settings.openai_api_key_active:
+        raise HTTPException(
+            status_code=503,
+            detail="Chat service unavailable — OpenAI API key not configured.",
+        )
+
+    await _enforce_stage2_gate(body)
+
+    context = body.context.model_dump() if body.context else None
+    history, conversation = await _resolve_history(body)
+
+    try:
+        return await sse_chat_response(
+            message=body.message,
+            persona=body.persona.value,
+            context=context,
+            conversation_history=history,
+            llm_class=_llm_class(body),
+            conversation=conversation,
+        )
+    except (LLMOverloadedError, LLMDeadlineExceeded):
+        raise
+    except Exception as e:
+        logger.error("Chat stream failed to start", error=str(e))
+        raise HTTPException(
+            status_code=500,
+            detail=f"Chat service error: {str(e)}",
+        )
+
+
+@router.get("/chat/conversations/{conversation_id}", response_model=ConversationResponse)
+async def get_conversation(conversation_id: str):
+    """
+    Server-side history of a conversation, e.g. to resync a client after
+    a 409 or a page reload.
+    """
+    conversation = await conversation_store.get_conversation(conversation_id)
+    if conversation is None:
+        raise ConversationNotFoundError(conversation_id)
+    return ConversationResponse(
+        conversationId=conversation.id,
+        conversationVersion=conversation.version,
+        messages=conversation.messages,
+    )
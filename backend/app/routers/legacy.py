@@ -10,7 +10,10 @@ from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 
 from app.config import get_settings
+from app.routers.chat import sse_chat_response
 from app.services import openai_service, sheets_service
+from app.services.llm_resilience import LLMDeadlineExceeded
+from app.services.llm_scheduler import LLMOverloadedError
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -64,10 +67,32 @@ async def legacy_chat(request: Request, body: LegacyChatRequest = Body(...)):
             conversation_history=body.conversationHistory,
         )
         return {"message": result["message"], "usage": result.get("usage")}
+    except (LLMOverloadedError, LLMDeadlineExceeded):
+        raise
     except Exception as e:
         logger.error("Legacy chat error", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/chat/stream")
+async def legacy_chat_stream(request: Request, body: LegacyChatRequest = Body(...)):
+    """Legacy streaming chat endpoint (SSE), counterpart of /api/chat."""
+    settings = get_settings()
+    if not settings.openai_api_key_active:
+        raise HTTPException(status_code=500, detail="API key not configured")
+
+    try:
+        return await sse_chat_response(
+            message=body.message,
+            persona=body.persona,
+            context=body.context,
+            conversation_history=body.conversationHistory,
+        )
+    except (LLMOverloadedError, LLMDeadlineExceeded):
+        raise
+    except Exception as e:
+        logger.error("Legacy chat stream error", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/companies")
 async def legacy_companies(domain: Optional[str] = Query(None)):
     return await sheets_service.fetch_companies_by_domain(domain)
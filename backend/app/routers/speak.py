@@ -2,19 +2,25 @@
 ═══════════════════════════════════════════════════════════════
 TEXT-TO-SPEECH ROUTER — OpenAI TTS with Hindi Translation
 ═══════════════════════════════════════════════════════════════
-POST /api/v1/speak — Convert text to speech (English or Hindi)
+POST /api/v1/speak        — Convert text to speech (English or Hindi)
+POST /api/v1/speak/stream — Same, streamed sentence by sentence
+
+Audio is served from the content-addressed disk cache when possible
+(see services/tts_cache.py); the cache key doubles as a strong ETag.
 """
 
 # ❌ REMOVED: from __future__ import annotations
 
 import structlog
 from fastapi import APIRouter, Body, HTTPException, Request
-from fastapi.responses import Response
+from fastapi.responses import FileResponse, Response, StreamingResponse
 
 from app.config import get_settings
 from app.middleware.rate_limit import limiter
 from app.models.speak import SpeakRequest
-from app.services import openai_service
+from app.services import openai_service, speech_pipeline, tts_cache
+from app.services.llm_resilience import LLMDeadlineExceeded
+from app.services.llm_scheduler import LLMOverloadedError
 
 logger = structlog.get_logger()
 
@@ -37,24 +43,101 @@ async def text_to_speech(request: Request, body: SpeakRequest = Body(...)):
             detail="TTS service unavailable — OpenAI API key not configured.",
         )
 
+    speed = openai_service.tts_speed(body.language)
+    key = tts_cache.cache_key(body.text, body.language, openai_service.TTS_VOICE, speed)
+    etag = f'"{key}"'
+    headers = {
+        "Content-Disposition": "inline; filename=speech.mp3",
+        "Cache-Control": "no-cache",
+        "ETag": etag,
+    }
+
+    path = tts_cache.lookup(key)
+    if path is not None:
+        try:
+            # Another worker may have evicted it since lookup; synthesize then
+            stat_result = path.stat()
+        except FileNotFoundError:
+            pass
+        else:
+            return FileResponse(
+                path, stat_result=stat_result, media_type="audio/mpeg", headers=headers
+            )
+
     try:
         audio_bytes = await openai_service.text_to_speech(
             text=body.text,
             language=body.language,
         )
+    except (LLMOverloadedError, LLMDeadlineExceeded):
+        raise
+    except Exception as e:
+        logger.error("TTS failed", error=str(e))
+        raise HTTPException(
+            status_code=500,
+            detail=f"TTS service error: {str(e)}",
+        )
+
+    try:
+        await tts_cache.store(key, audio_bytes)
+    except OSError as e:
+        logger.warning("Failed to cache TTS audio", error=str(e))
 
-        return Response(
-            content=audio_bytes,
-            media_type="audio/mpeg",
-            headers={
-                "Content-Disposition": "inline; filename=speech.mp3",
-                "Cache-Control": "no-cache",
-            },
+    return Response(
+        content=audio_bytes,
+        media_type="audio/mpeg",
+        headers=headers,
+    )
+
+
+@router.post("/speak/stream")
+@limiter.limit(lambda: get_settings().RATE_LIMIT_SPEAK)
+async def text_to_speech_stream(request: Request, body: SpeakRequest = Body(...)):
+    """
+    Pipelined TTS: sentences are translated concurrently and synthesized
+    in order, and MP3 audio is streamed back as each sentence completes,
+    so playback can start after the first sentence.
+    """
+    settings = get_settings()
+
+    if not settings.openai_api_key_active:
+        raise HTTPException(
+            status_code=503,
+            detail="TTS service unavailable — OpenAI API key not configured.",
         )
 
+    chunks = speech_pipeline.stream_speech(body.text, body.language)
+    try:
+        # Wait for the first sentence so upstream failures still map to a 500
+        first = await anext(chunks)
+    except StopAsyncIteration:
+        return Response(content=b"", media_type="audio/mpeg")
+    except (LLMOverloadedError, LLMDeadlineExceeded):
+        raise
     except Exception as e:
-        logger.error("TTS failed", error=str(e))
+        await chunks.aclose()
+        logger.error("Streaming TTS failed", error=str(e))
         raise HTTPException(
             status_code=500,
             detail=f"TTS service error: {str(e)}",
-        )
\ No newline at end of file
+        )
+
+    async def relay():
+        try:
+            yield first
+            async for chunk in chunks:
+                yield chunk
+        except Exception as e:
+            # Headers are already sent; end the audio early
+            logger.error("Streaming TTS interrupted", error=str(e))
+        finally:
+            await chunks.aclose()
+
+    return StreamingResponse(
+        relay(),
+        media_type="audio/mpeg",
+        headers={
+            "Content-Disposition": "inline; filename=speech.mp3",
+            "Cache-Control": "no-cache",
+        },
+    )
@@ -15,22 +15,26 @@ documented problems and diagnostic signals from the persona docs.
 """
 
 import json
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 import structlog
-from openai import AsyncOpenAI
 
 from app.config import get_settings
-from app.services.persona_doc_service import load_persona_doc, load_task_context
+from app.services import metrics, model_router, question_cache, recommendation_cache
+from app.services.llm_resilience import LLMDeadlineExceeded
+from app.services.llm_scheduler import LLMClass, LLMOverloadedError
+from app.services.json_stream import ArrayItemParser
+from app.services.openai_service import create_chat_completion, routed_completion, stream_completion
+from app.services.persona_doc_service import (
+    get_diagnostic_sections,
+    load_persona_doc,
+    load_task_context,
+)
+from app.services.single_flight import SingleFlight, make_key
 
 logger = structlog.get_logger()
 
 
-def _get_client() -> AsyncOpenAI:
-    settings = get_settings()
-    return AsyncOpenAI(api_key=settings.openai_api_key_active)
-
-
 # ── Dynamic Question Generation ────────────────────────────────
 
 
@@ -68,22 +72,57 @@ OUTPUT FORMAT (strict JSON):
 Return ONLY valid JSON, no markdown, no explanation."""
 
 
+_questions_flight: SingleFlight[list[dict]] = SingleFlight("agent_questions")
+
+
+def questions_fingerprint() -> str:
+    """Identifies the prompt + model behind cached questions."""
+    return make_key(QUESTION_GENERATION_SYSTEM_PROMPT, get_settings().OPENAI_MODEL_NAME)[:16]
+
+
 async def generate_dynamic_questions(
     outcome: str,
     outcome_label: str,
     domain: str,
     task: str,
     num_questions: int = 3,
+    refresh: bool = False,
 ) -> list[dict]:
     """
     Generate dynamic follow-up questions based on parsed persona task context.
 
+    Served from the question cache when possible (see question_cache.py);
+    `refresh` skips the lookup and regenerates. Cached results are shared,
+    so treat them as read-only.
+    """
+    metrics.label_request(persona="agent")
+    key = question_cache.cache_key(outcome_label, domain, task, num_questions)
+    fingerprint = questions_fingerprint()
+    if not refresh:
+        cached = question_cache.lookup(key, fingerprint)
+        if cached is not None:
+            return cached
+
+    return await _questions_flight.do(
+        key,
+        lambda: _generate_questions(outcome_label, domain, task, num_questions, key, fingerprint),
+    )
+
+
+async def _generate_questions(
+    outcome_label: str,
+    domain: str,
+    task: str,
+    num_questions: int,
+    cache_key: str,
+    fingerprint: str,
+) -> list[dict]:
+    """
     Loads the persona doc, parses the task-specific block (Problems, Opportunities,
     Strategies, RCA Bridge), and uses those sections to generate targeted diagnostic
-    questions.
+    questions. LLM answers are written back to the question cache; fallbacks are not.
     """
     settings = get_settings()
-    client = _get_client()
 
     # ── Load structured task context from persona doc ──────────
     task_ctx = load_task_context(domain, task)
@@ -157,7 +196,8 @@ Each question should directly map to documented content — not generic consulti
     )
 
     try:
-        response = await client.chat.completions.create(
+        response = await create_chat_completion(
+            LLMClass.AGENT_RECOMMEND,
             model=settings.OPENAI_MODEL_NAME,
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -178,9 +218,21 @@ Each question should directly map to documented content — not generic consulti
             task=task,
             count=len(questions),
         )
+        if questions:
+            question_cache.store(
+                cache_key,
+                fingerprint,
+                questions,
+                outcome_label=outcome_label,
+                domain=domain,
+                task=task,
+                num_questions=num_questions,
+            )
 
         return questions
 
+    except (LLMOverloadedError, LLMDeadlineExceeded):
+        raise
     except json.JSONDecodeError as e:
         logger.error("Failed to parse dynamic questions JSON", error=str(e))
         return _fallback_questions(domain, task, task_ctx)
@@ -316,29 +368,48 @@ RULES:
 Return ONLY valid JSON."""
 
 
-async def generate_personalized_recommendations(
-    outcome: str,
-    outcome_label: str,
-    domain: str,
-    task: str,
-    questions_answers: list[dict],
-) -> dict:
-    """
-    Generate personalized tool recommendations based on all Q&A.
+_recommend_flight: SingleFlight[str] = SingleFlight("agent_recommend")
 
-    Args:
-        outcome: The outcome ID
-        outcome_label: The outcome display label
-        domain: The domain/sub-category
-        task: The specific task
-        questions_answers: List of all Q&A pairs (static + dynamic)
 
-    Returns:
-        Dict with 'extensions', 'gpts', 'companies', 'summary'
+def recommendation_key(domain: str, task: str, questions_answers: list[dict]) -> Optional[str]:
     """
-    settings = get_settings()
-    client = _get_client()
+    Canonical answer-vector key for the recommendation cache, or None when
+    any diagnostic answer is free text (or the task has no option lists).
+    """
+    diagnostic = get_diagnostic_sections(domain, task)
+    if not diagnostic or not diagnostic.get("sections"):
+        return None
+    options = {
+        section["question"]: {item: f"{section['key']}:{i}" for i, item in enumerate(section["items"])}
+        for section in diagnostic["sections"]
+    }
+
+    option_ids = []
+    for qa in questions_answers:
+        if qa.get("type") != "dynamic":
+            continue
+        option_id = options.get(qa.get("q", ""), {}).get(qa.get("a", ""))
+        if option_id is None:
+            return None
+        option_ids.append(option_id)
+
+    route = model_router.get_route("recommendation")
+    return make_key(
+        " ".join(domain.split()).casefold(),
+        diagnostic["task_matched"],
+        sorted(option_ids),
+        RECOMMENDATION_SYSTEM_PROMPT,
+        route.models,
+    )
+
 
+def _recommendation_user_message(
+    outcome_label: str,
+    domain: str,
+    task: str,
+    questions_answers: list[dict],
+) -> str:
+    """User prompt for recommendations: profile, Q&A and persona context."""
     # Load structured task context from persona doc
     task_ctx = load_task_context(domain, task)
     if task_ctx and task_ctx.get("problems"):
@@ -361,7 +432,7 @@ async def generate_personalized_recommendations(
         qa_text += f"Q{i} ({qa.get('type', 'static')}): {qa.get('q', qa.get('question', ''))}\n"
         qa_text += f"A{i}: {qa.get('a', qa.get('answer', ''))}\n\n"
 
-    user_message = f"""USER PROFILE:
+    return f"""USER PROFILE:
 - Growth Goal: {outcome_label}
 - Domain: {domain}
 - Task: {task}
@@ -374,19 +445,57 @@ PERSONA CONTEXT (domain expertise):
 
 Based on everything above, recommend the most relevant AI tools, Chrome extensions, Custom GPTs, and AI companies for this user's specific situation."""
 
-    try:
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_MODEL_NAME,
+
+async def generate_personalized_recommendations(
+    outcome: str,
+    outcome_label: str,
+    domain: str,
+    task: str,
+    questions_answers: list[dict],
+) -> dict:
+    """
+    Generate personalized tool recommendations based on all Q&A.
+
+    Args:
+        outcome: The outcome ID
+        outcome_label: The outcome display label
+        domain: The domain/sub-category
+        task: The specific task
+        questions_answers: List of all Q&A pairs (static + dynamic)
+
+    Returns:
+        Dict with 'extensions', 'gpts', 'companies', 'summary'
+    """
+    metrics.label_request(persona="agent")
+
+    # Sessions that only picked listed options share cached recommendations
+    cache_key = recommendation_key(domain, task, questions_answers)
+    if cache_key is None:
+        recommendation_cache.record_bypass()
+    else:
+        cached = await recommendation_cache.lookup(cache_key)
+        if cached is not None:
+            return cached
+
+    user_message = _recommendation_user_message(outcome_label, domain, task, questions_answers)
+
+    async def recommend() -> str:
+        response = await routed_completion(
+            "recommendation",
+            LLMClass.AGENT_RECOMMEND,
+            model_router.json_object("extensions", "gpts", "companies"),
             messages=[
                 {"role": "system", "content": RECOMMENDATION_SYSTEM_PROMPT},
                 {"role": "user", "content": user_message},
             ],
             temperature=0.5,
-            max_tokens=2000,
             response_format={"type": "json_object"},
         )
+        return response.choices[0].message.content or "{}"
 
-        raw = response.choices[0].message.content or "{}"
+    try:
+        # Identical profiles in flight at once share one LLM call
+        raw = await _recommend_flight.do(make_key(user_message), recommend)
         parsed = json.loads(raw)
 
         logger.info(
@@ -398,16 +507,95 @@ Based on everything above, recommend the most relevant AI tools, Chrome extensio
             companies=len(parsed.get("companies", [])),
         )
 
-        return {
+        recommendations = {
             "extensions": parsed.get("extensions", []),
             "gpts": parsed.get("gpts", []),
             "companies": parsed.get("companies", []),
             "summary": parsed.get("summary", ""),
         }
+        if cache_key is not None and any(recommendations.values()):
+            await recommendation_cache.store(cache_key, recommendations)
+        return recommendations
 
+    except (LLMOverloadedError, LLMDeadlineExceeded):
+        raise
     except json.JSONDecodeError as e:
         logger.error("Failed to parse recommendations JSON", error=str(e))
         return {"extensions": [], "gpts": [], "companies": [], "summary": ""}
     except Exception as e:
         logger.error("Failed to generate recommendations", error=str(e))
         return {"extensions": [], "gpts": [], "companies": [], "summary": ""}
+
+
+# Top-level arrays of the recommendation JSON → ToolRecommendation.category
+RECOMMENDATION_CATEGORIES = {"extensions": "extension", "gpts": "gpt", "companies": "company"}
+
+
+async def stream_personalized_recommendations(
+    outcome: str,
+    outcome_label: str,
+    domain: str,
+    task: str,
+    questions_answers: list[dict],
+) -> AsyncIterator[dict]:
+    """
+    Streaming variant of generate_personalized_recommendations().
+
+    Yields {"type": "tool", "category": "extension" | "gpt" | "company",
+    "tool": dict} as soon as each recommendation is complete in the
+    model's output, then one {"type": "done", "recommendations": dict}
+    with the same shape the non-streaming call returns. Cached answer
+    vectors are replayed at once. The route's first model is used
+    without a cascade, since streamed tools cannot be taken back.
+    """
+    metrics.label_request(persona="agent")
+
+    cache_key = recommendation_key(domain, task, questions_answers)
+    if cache_key is None:
+        recommendation_cache.record_bypass()
+    else:
+        cached = await recommendation_cache.lookup(cache_key)
+        if cached is not None:
+            for key, category in RECOMMENDATION_CATEGORIES.items():
+                for tool in cached.get(key, []):
+                    yield {"type": "tool", "category": category, "tool": tool}
+            yield {"type": "done", "recommendations": cached}
+            return
+
+    user_message = _recommendation_user_message(outcome_label, domain, task, questions_answers)
+    parser = ArrayItemParser()
+    streamed: dict[str, list[dict]] = {key: [] for key in RECOMMENDATION_CATEGORIES}
+    deltas = stream_completion(
+        LLMClass.AGENT_RECOMMEND,
+        model_router.get_route("recommendation"),
+        messages=[
+            {"role": "system", "content": RECOMMENDATION_SYSTEM_PROMPT},
+            {"role": "user", "content": user_message},
+        ],
+        temperature=0.5,
+        response_format={"type": "json_object"},
+    )
+    async for delta in deltas:
+        for key, tool in parser.feed(delta):
+            if key in streamed:
+                streamed[key].append(tool)
+                yield {"type": "tool", "category": RECOMMENDATION_CATEGORIES[key], "tool": tool}
+
+    try:
+        summary = parser.result().get("summary", "")
+        complete = True
+    except json.JSONDecodeError as e:
+        # Keep the tools that did arrive complete
+        logger.error("Failed to parse streamed recommendations JSON", error=str(e))
+        summary, complete = "", False
+
+    recommendations = {**streamed, "summary": summary}
+    logger.info(
+        "Personalized recommendations streamed",
+        domain=domain,
+        task=task,
+        **{key: len(tools) for key, tools in streamed.items()},
+    )
+    if cache_key is not None and complete and any(streamed.values()):
+        await recommendation_cache.store(cache_key, recommendations)
+    yield {"type": "done", "recommendations": recommendations}
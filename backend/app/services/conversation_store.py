@@ -0,0 +1,389 @@
+"""
+═══════════════════════════════════════════════════════════════
+CONVERSATION STORE — Server-side chat history
+═══════════════════════════════════════════════════════════════
+Lets /chat clients send only the new message plus a conversation id
+and version instead of re-uploading the whole transcript every turn:
+
+  • hot conversations live in an in-process LRUStore (idle TTL)
+  • a pluggable ConversationBackend persists them:
+      - MemoryConversationBackend — nothing beyond the LRU front
+      - SQLiteConversationBackend — WAL-mode SQLite, one row per
+        message, so a turn is an O(1) append
+  • `version` counts completed turns; a turn must start from the
+    current version and only one turn per conversation may be in
+    flight, otherwise ConversationConflictError (served as 409)
+
+Select with CONVERSATION_BACKEND=memory|sqlite.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import structlog
+
+from app.config import get_settings
+from app.services import metrics
+from app.services.lru_store import LRUStore
+
+logger = structlog.get_logger()
+
+
+@dataclass(slots=True)
+class Conversation:
+    """A conversation's transcript; `version` = number of completed turns."""
+    id: str
+    version: int = 0
+    messages: list[dict] = field(default_factory=list)
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def trimmed(self) -> int:
+        """Messages dropped from the head (every turn appends two)."""
+        return max(0, 2 * self.version - len(self.messages))
+
+
+class ConversationConflictError(Exception):
+    """The client's conversation version is stale, or a turn is already running."""
+
+    def __init__(self, conversation_id: str, expected: int, actual: Optional[int]):
+        super().__init__(
+            f"Conversation {conversation_id} is at version {actual}, not {expected}"
+        )
+        self.conversation_id = conversation_id
+        self.expected = expected
+        self.actual = actual
+
+
+class ConversationNotFoundError(Exception):
+    """No conversation with that id (never created, or expired)."""
+
+
+# ── Backends ───────────────────────────────────────────────────
+
+
+class ConversationBackend(ABC):
+    """Persistence behind the in-memory conversation cache."""
+
+    name = "abstract"
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def load(self, conversation_id: str) -> Optional[Conversation]:
+        ...
+
+    @abstractmethod
+    async def append(self, conversation: Conversation, new_messages: list[dict]) -> bool:
+        """
+        Persist `new_messages` as the turn that moved the conversation to
+        `conversation.version`. Returns False if the stored copy is no
+        longer at the previous version (another worker got there first).
+        """
+
+    def stats(self) -> dict:
+        return {"backend": self.name}
+
+
+class MemoryConversationBackend(ConversationBackend):
+    """No persistence: conversations live only in the LRU front."""
+
+    name = "memory"
+
+    async def load(self, conversation_id: str) -> Optional[Conversation]:
+        return None
+
+    async def append(self, conversation: Conversation, new_messages: list[dict]) -> bool:
+        return True
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id         TEXT PRIMARY KEY,
+    version    INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS conversation_messages (
+    conversation_id TEXT NOT NULL,
+    seq             INTEGER NOT NULL,
+    role            TEXT NOT NULL,
+    content         TEXT NOT NULL,
+    PRIMARY KEY (conversation_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteConversationBackend(ConversationBackend):
+    """Durable WAL-mode SQLite; conversations idle past `ttl` are purged at start."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, ttl: float, max_messages: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_messages = max_messages
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _purge(self) -> int:
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "DELETE FROM conversation_messages WHERE conversation_id IN "
+                    "(SELECT id FROM conversations WHERE updated_at < ?)",
+                    (cutoff,),
+                )
+                purged = self._conn.execute(
+                    "DELETE FROM conversations WHERE updated_at < ?", (cutoff,)
+                ).rowcount
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return purged
+
+    async def start(self) -> None:
+        if self._conn is None:
+            self._conn = await asyncio.to_thread(self._connect)
+        purged = await asyncio.to_thread(self._purge)
+        logger.info("Conversation store ready", path=self.path, purged=purged)
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+            self._conn = None
+
+    def _load(self, conversation_id: str) -> Optional[Conversation]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, updated_at FROM conversations WHERE id = ?",
+                (conversation_id,),
+            ).fetchone()
+            if row is None or row[1] < time.time() - self.ttl:
+                return None
+            messages = [
+                {"role": role, "content": content}
+                for role, content in self._conn.execute(
+                    "SELECT role, content FROM conversation_messages "
+                    "WHERE conversation_id = ? ORDER BY seq DESC LIMIT ?",
+                    (conversation_id, self.max_messages),
+                )
+            ]
+        messages.reverse()
+        return Conversation(conversation_id, row[0], messages, row[1])
+
+    def _append(self, conversation: Conversation, start: int, new_messages: list[dict]) -> bool:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                if conversation.version == 1:
+                    swapped = self._conn.execute(
+                        "INSERT OR IGNORE INTO conversations (id, version, updated_at) VALUES (?, ?, ?)",
+                        (conversation.id, conversation.version, conversation.updated_at),
+                    ).rowcount
+                else:
+                    swapped = self._conn.execute(
+                        "UPDATE conversations SET version = ?, updated_at = ? WHERE id = ? AND version = ?",
+                        (conversation.version, conversation.updated_at, conversation.id, conversation.version - 1),
+                    ).rowcount
+                if not swapped:
+                    self._conn.execute("ROLLBACK")
+                    return False
+                self._conn.executemany(
+                    "INSERT INTO conversation_messages "
+                    "(conversation_id, seq, role, content) VALUES (?, ?, ?, ?)",
+                    [
+                        (conversation.id, start + i, m["role"], m["content"])
+                        for i, m in enumerate(new_messages)
+                    ],
+                )
+                self._conn.execute("COMMIT")
+                return True
+            except Exception:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+
+    async def load(self, conversation_id: str) -> Optional[Conversation]:
+        return await asyncio.to_thread(self._load, conversation_id)
+
+    async def append(self, conversation: Conversation, new_messages: list[dict]) -> bool:
+        # Sequence numbers keep growing even if the in-memory copy is capped
+        start = (conversation.version - 1) * len(new_messages)
+        return await asyncio.to_thread(self._append, conversation, start, new_messages)
+
+
+def build_backend() -> ConversationBackend:
+    settings = get_settings()
+    if settings.CONVERSATION_BACKEND == "sqlite":
+        return SQLiteConversationBackend(
+            settings.CONVERSATION_DB_PATH,
+            settings.CONVERSATION_TTL_SECONDS,
+            settings.CONVERSATION_MAX_MESSAGES,
+        )
+    return MemoryConversationBackend()
+
+
+# ── Store ──────────────────────────────────────────────────────
+
+_backend: Optional[ConversationBackend] = None
+_cache: Optional[LRUStore[Conversation]] = None
+
+# Conversations with a turn in flight in this process
+_active: set[str] = set()
+_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def get_backend() -> ConversationBackend:
+    global _backend
+    if _backend is None:
+        _backend = build_backend()
+    return _backend
+
+
+def _get_cache() -> LRUStore[Conversation]:
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        _cache = LRUStore(
+            max_entries=settings.CONVERSATION_MAX_ENTRIES,
+            idle_ttl=settings.CONVERSATION_TTL_SECONDS,
+        )
+    return _cache
+
+
+def _lock_for(conversation_id: str) -> asyncio.Lock:
+    lock = _locks.get(conversation_id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _locks[conversation_id] = lock
+    return lock
+
+
+async def init_store() -> None:
+    """Start the persistent backend. Called from lifespan."""
+    await get_backend().start()
+
+
+async def close_store() -> None:
+    global _backend
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
+
+
+async def _get(conversation_id: str) -> Optional[Conversation]:
+    cache = _get_cache()
+    conversation = cache.get(conversation_id)
+    if conversation is None:
+        conversation = await get_backend().load(conversation_id)
+        if conversation is not None:
+            cache.set(conversation_id, conversation)
+    return conversation
+
+
+async def get_conversation(conversation_id: str) -> Optional[Conversation]:
+    return await _get(conversation_id)
+
+
+async def begin_turn(conversation_id: Optional[str], version: int) -> Conversation:
+    """
+    Claim the next turn of a conversation and return it (a new one when
+    `conversation_id` is None). Must be paired with end_turn() or abort_turn().
+
+    Raises:
+        ConversationNotFoundError: unknown or expired id.
+        ConversationConflictError: `version` is stale or a turn is running.
+    """
+    if conversation_id is None:
+        if version != 0:
+            raise ConversationConflictError("new", version, 0)
+        conversation = Conversation(uuid.uuid4().hex)
+        _get_cache().set(conversation.id, conversation)
+        _active.add(conversation.id)
+        metrics.inc("chat_conversations_created_total")
+        return conversation
+
+    async with _lock_for(conversation_id):
+        conversation = await _get(conversation_id)
+        if conversation is not None and conversation.version < version:
+            # Another worker advanced it: our cached copy is stale
+            conversation = await get_backend().load(conversation_id) or conversation
+            _get_cache().set(conversation_id, conversation)
+        if conversation is None:
+            raise ConversationNotFoundError(conversation_id)
+        if conversation.version != version or conversation_id in _active:
+            metrics.inc("chat_conversation_conflicts_total")
+            raise ConversationConflictError(conversation_id, version, conversation.version)
+        _active.add(conversation_id)
+        return conversation
+
+
+async def end_turn(conversation: Conversation, user_message: str, reply: str) -> int:
+    """
+    Append a completed turn, release the claim and return the new version.
+
+    Raises:
+        ConversationConflictError: another worker recorded a turn first.
+    """
+    new_messages = [
+        {"role": "user", "content": user_message},
+        {"role": "assistant", "content": reply},
+    ]
+    max_messages = get_settings().CONVERSATION_MAX_MESSAGES
+    try:
+        async with _lock_for(conversation.id):
+            updated = Conversation(
+                conversation.id,
+                conversation.version + 1,
+                (conversation.messages + new_messages)[-max_messages:],
+            )
+            try:
+                stored = await get_backend().append(updated, new_messages)
+            except sqlite3.Error as e:
+                logger.warning("Failed to persist conversation turn", error=str(e))
+                stored = True
+            if not stored:
+                _get_cache().pop(conversation.id)
+                metrics.inc("chat_conversation_conflicts_total")
+                raise ConversationConflictError(
+                    conversation.id, conversation.version, None
+                )
+            _get_cache().set(conversation.id, updated)
+            return updated.version
+    finally:
+        _active.discard(conversation.id)
+
+
+def abort_turn(conversation: Conversation) -> None:
+    """Release a claimed turn without recording anything."""
+    _active.discard(conversation.id)
+
+
+def stats() -> dict:
+    return {"active_turns": len(_active), **get_backend().stats(), **_get_cache().stats()}
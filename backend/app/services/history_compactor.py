@@ -0,0 +1,223 @@
+"""
+═══════════════════════════════════════════════════════════════
+HISTORY COMPACTOR — Token-budgeted conversation history
+═══════════════════════════════════════════════════════════════
+Keeps prompt size flat as chats grow. Once the history the client
+sends exceeds HISTORY_TOKEN_BUDGET (local estimate, no tokenizer
+dependency), it is sent to OpenAI as:
+
+  • one system message with a rolling summary of the older turns
+  • the most recent turns verbatim (HISTORY_KEEP_MESSAGES, plus up to
+    HISTORY_SUMMARY_STEP - 1 more so the summary advances in steps)
+
+Summaries are cached by a hash of the conversation prefix they cover,
+so each one is computed once per conversation and extended
+incrementally (previous summary + newly aged-out turns). Server-side
+conversations pass a HistoryScope instead: they are trimmed at the
+head once they reach CONVERSATION_MAX_MESSAGES, so their summaries are
+keyed by conversation id + absolute message offset, which stays stable
+as old messages drop off. A missing
+summary is built in the background (openai_service schedules it at the
+lowest LLM priority); until it lands, the newest older summary plus as many uncovered turns
+as still fit the budget are used, so a chat request never waits on
+summarization and never exceeds the budget by more than the recent
+turns themselves. A failed summary is not retried for
+HISTORY_SUMMARY_RETRY_SECONDS.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+import orjson
+import structlog
+
+from app.config import get_settings
+from app.services import metrics
+from app.services.lru_store import LRUStore
+
+logger = structlog.get_logger()
+
+# Per-message formatting overhead of the chat format, in tokens
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+Summarizer = Callable[[Optional[str], list[dict]], Awaitable[str]]
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryScope:
+    """A server-side conversation whose history may be trimmed at the head."""
+    conversation_id: str
+    offset: int  # Messages dropped before history[0]
+
+_summaries: Optional[LRUStore[str]] = None
+_pending: dict[str, asyncio.Task] = {}
+# digest -> monotonic time before which a failed summary is not retried
+_failed: Optional[LRUStore[float]] = None
+
+
+def _get_summaries() -> LRUStore[str]:
+    global _summaries
+    if _summaries is None:
+        _summaries = LRUStore(max_entries=get_settings().HISTORY_SUMMARY_CACHE_ENTRIES)
+    return _summaries
+
+
+def _get_failed() -> LRUStore[float]:
+    global _failed
+    if _failed is None:
+        _failed = LRUStore(max_entries=get_settings().HISTORY_SUMMARY_CACHE_ENTRIES)
+    return _failed
+
+
+def _recently_failed(digest: str) -> bool:
+    retry_at = _get_failed().get(digest)
+    if retry_at is None:
+        return False
+    if time.monotonic() >= retry_at:
+        _get_failed().pop(digest)
+        return False
+    return True
+
+
+# ── Token Estimate ─────────────────────────────────────────────
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 UTF-8 bytes per token: exact enough for budgeting, and non-Latin
+    scripts (3 bytes/char) count proportionally heavier."""
+    return (len(text.encode("utf-8")) + 3) // 4
+
+
+def estimate_messages(messages: list[dict]) -> int:
+    return sum(MESSAGE_OVERHEAD_TOKENS + estimate_tokens(m.get("content") or "") for m in messages)
+
+
+def _prefix_digests(history: list[dict]) -> list[str]:
+    """digests[i] identifies history[:i + 1] (one incremental pass)."""
+    h = hashlib.sha256()
+    digests = []
+    for message in history:
+        h.update(orjson.dumps([message.get("role"), message.get("content")]))
+        digests.append(h.copy().hexdigest())
+    return digests
+
+
+# ── Compaction ─────────────────────────────────────────────────
+
+
+def _summary_message(summary: str) -> dict:
+    return {"role": "system", "content": SUMMARY_PREFIX + summary}
+
+
+def _fit_start(
+    history: list[dict], covered: int, cut: int, summary: Optional[str], budget: int
+) -> int:
+    """
+    First index in [covered, cut] from which history (plus the summary
+    message) fits `budget`; uncovered turns before it are dropped until
+    their summary is ready. The recent turns from `cut` on always stay.
+    """
+    tokens = estimate_messages(history[covered:])
+    if summary is not None:
+        tokens += estimate_messages([_summary_message(summary)])
+    start = covered
+    while start < cut and tokens > budget:
+        tokens -= estimate_messages([history[start]])
+        start += 1
+    return start
+
+
+async def _build_summary(
+    digest: str, previous: Optional[str], turns: list[dict], summarize: Summarizer
+) -> None:
+    try:
+        summary = await summarize(previous, turns)
+    except Exception as e:
+        logger.warning("History summary failed", error=str(e))
+        summary = None
+    finally:
+        _pending.pop(digest, None)
+    if summary:
+        _get_summaries().set(digest, summary)
+    else:
+        _get_failed().set(digest, time.monotonic() + get_settings().HISTORY_SUMMARY_RETRY_SECONDS)
+
+
+async def compact(
+    history: Optional[list[dict]],
+    summarize: Summarizer,
+    scope: Optional[HistoryScope] = None,
+) -> Optional[list[dict]]:
+    """
+    Return `history` trimmed to the token budget: a summary message plus
+    the recent turns. Histories within budget are returned unchanged.
+
+    Args:
+        history: Prior {role, content} messages, oldest first.
+        summarize: async (previous_summary, turns) -> summary text.
+        scope: Set for server-side conversations (see HistoryScope).
+    """
+    settings = get_settings()
+    if not history or estimate_messages(history) <= settings.HISTORY_TOKEN_BUDGET:
+        return history
+
+    # Summary boundaries are aligned on absolute positions, so they stay
+    # put when a scoped conversation is trimmed at the head
+    offset = scope.offset if scope is not None else 0
+    step = max(1, settings.HISTORY_SUMMARY_STEP)
+    cut = (offset + len(history) - settings.HISTORY_KEEP_MESSAGES) // step * step - offset
+    if cut <= 0:
+        return history
+
+    summaries = _get_summaries()
+    if scope is not None:
+        keys = [f"{scope.conversation_id}:{offset + end}" for end in range(1, cut + 1)]
+    else:
+        keys = _prefix_digests(history[:cut])
+
+    # Newest cached summary covering history[:covered]
+    covered, summary = 0, None
+    for end in range(cut, 0, -step):
+        summary = summaries.get(keys[end - 1])
+        if summary is not None:
+            covered = end
+            break
+
+    start = covered
+    if covered < cut:
+        target = keys[cut - 1]
+        if target not in _pending and not _recently_failed(target):
+            _pending[target] = asyncio.create_task(
+                _build_summary(target, summary, history[covered:cut], summarize)
+            )
+        metrics.inc("chat_history_summaries_total", result="miss")
+        start = _fit_start(history, covered, cut, summary, settings.HISTORY_TOKEN_BUDGET)
+    else:
+        metrics.inc("chat_history_summaries_total", result="hit")
+
+    compacted = history[start:]
+    if summary is not None:
+        compacted = [_summary_message(summary), *compacted]
+
+    saved = estimate_messages(history) - estimate_messages(compacted)
+    if saved > 0:
+        metrics.inc("chat_history_tokens_saved_total", saved)
+    logger.info(
+        "Chat history compacted",
+        messages=len(history),
+        kept=len(history) - start,
+        dropped=start - covered,
+        tokens_saved=max(saved, 0),
+    )
+    return compacted
+
+
+def stats() -> dict:
+    return {"pending": len(_pending), "failed": len(_get_failed()), **_get_summaries().stats()}
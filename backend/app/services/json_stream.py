@@ -0,0 +1,78 @@
+"""
+═══════════════════════════════════════════════════════════════
+JSON STREAM — Incremental parsing of a streamed JSON object
+═══════════════════════════════════════════════════════════════
+LLM answers in JSON mode arrive token by token, e.g.
+
+  {"extensions": [{...}, {...}], "gpts": [{...}], "summary": "..."}
+
+ArrayItemParser is fed those deltas and hands back every object inside
+a top-level array as soon as its closing brace arrives, tagged with the
+array's key, so callers can act on the first item long before the
+whole answer is complete. Each character is scanned once; only the
+finished item is handed to json.loads. Text before the opening brace
+(e.g. a markdown fence) is ignored.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Optional
+
+
+class ArrayItemParser:
+    """Yields (key, item) for each object element of a top-level array."""
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._item_start = 0
+
+    def feed(self, delta: str) -> list[tuple[str, dict[str, Any]]]:
+        """Consume `delta`; return the items completed by it."""
+        self.text += delta
+        items: list[tuple[str, dict[str, Any]]] = []
+        text, stack = self.text, self._stack
+        for i in range(self._pos, len(text)):
+            char = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(stack) == 1:
+                        self._last_string = json.loads(text[self._string_start:i + 1])
+            elif char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char == ":" and len(stack) == 1:
+                self._key = self._last_string
+            elif char in "{[":
+                if char == "{" and stack == ["{", "["]:
+                    self._item_start = i
+                stack.append(char)
+            elif char in "}]" and stack:
+                stack.pop()
+                if char == "}" and stack == ["{", "["] and self._key is not None:
+                    try:
+                        item = json.loads(text[self._item_start:i + 1])
+                    except json.JSONDecodeError:
+                        continue
+                    items.append((self._key, item))
+        self._pos = len(text)
+        return items
+
+    def result(self) -> dict[str, Any]:
+        """The complete object, once fully fed. Raises json.JSONDecodeError."""
+        start, end = self.text.find("{"), self.text.rfind("}")
+        if start < 0 or end < start:
+            raise json.JSONDecodeError("No JSON object in response", self.text, 0)
+        return json.loads(self.text[start:end + 1])
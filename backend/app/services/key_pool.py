@@ -0,0 +1,179 @@
+"""
+═══════════════════════════════════════════════════════════════
+KEY POOL — Load balancing across OpenAI API keys
+═══════════════════════════════════════════════════════════════
+Spreads calls over every configured key (OPENAI_API_KEY,
+OPENAI_API_KEY_2, OPENAI_EXTRA_API_KEYS) instead of using the second
+key only as a fallback:
+
+  • each key gets its own AsyncOpenAI view over ONE shared httpx
+    connection pool (client.with_options)
+  • calls go to the healthy key with the fewest in-flight requests,
+    preferring the one with the most rate-limit headroom
+  • `x-ratelimit-remaining-*` / `x-ratelimit-reset-*` headers are read
+    on every response; a key that is out of requests or tokens, or
+    returns 429, is drained until its limit resets
+  • a 429 is retried immediately on another healthy key (the per-key
+    clients have SDK retries disabled so throttling is handled here;
+    connection errors and 5xx are retried by llm_resilience.py)
+  • per-key request / throttle counters and remaining-quota gauges
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import structlog
+from openai import AsyncOpenAI, RateLimitError
+
+from app.services import metrics
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+# Drain a key when fewer tokens than this remain in its window
+MIN_REMAINING_TOKENS = 2_000
+
+# Drain period when a 429 carries no usable reset / retry-after hint
+DEFAULT_DRAIN_SECONDS = 1.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Parse OpenAI reset durations like '1s', '6m0s', '20ms' into seconds."""
+    if not value:
+        return None
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(n) * _UNIT_SECONDS[unit] for n, unit in parts)
+
+
+def _int_header(headers, name: str) -> Optional[int]:
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+class PooledKey:
+    """One API key, its client view and its rate-limit state."""
+
+    __slots__ = (
+        "label", "client", "in_flight", "drained_until",
+        "remaining_requests", "remaining_tokens",
+    )
+
+    def __init__(self, label: str, client: AsyncOpenAI):
+        self.label = label
+        self.client = client
+        self.in_flight = 0
+        self.drained_until = 0.0
+        self.remaining_requests: Optional[int] = None
+        self.remaining_tokens: Optional[int] = None
+
+    def healthy(self, now: float) -> bool:
+        return self.drained_until <= now
+
+    def drain(self, seconds: float, reason: str) -> None:
+        self.drained_until = max(self.drained_until, time.monotonic() + seconds)
+        metrics.inc("openai_key_drained_total", key=self.label, reason=reason)
+        logger.warning("OpenAI key drained", key=self.label, reason=reason, seconds=round(seconds, 3))
+
+
+class KeyPool:
+    """Round-robin-by-load selection over several API keys."""
+
+    def __init__(self, base_client: AsyncOpenAI, api_keys: list[str]):
+        # max_retries=0: a 429 is retried here, on another key, not by the SDK
+        self.keys = [
+            PooledKey(f"key{i + 1}", base_client.with_options(api_key=key, max_retries=0))
+            for i, key in enumerate(api_keys)
+        ]
+
+    def pick(self, exclude: tuple[PooledKey, ...] = ()) -> PooledKey:
+        now = time.monotonic()
+        candidates = [k for k in self.keys if k not in exclude] or self.keys
+        healthy = [k for k in candidates if k.healthy(now)]
+        if not healthy:
+            # Everything is throttled: use whichever key recovers first
+            return min(candidates, key=lambda k: k.drained_until)
+        return min(
+            healthy,
+            key=lambda k: (k.in_flight, -(k.remaining_requests if k.remaining_requests is not None else 1 << 30)),
+        )
+
+    def observe(self, key: PooledKey, headers) -> None:
+        """Update a key's quota from x-ratelimit-* response headers."""
+        remaining_requests = _int_header(headers, "x-ratelimit-remaining-requests")
+        remaining_tokens = _int_header(headers, "x-ratelimit-remaining-tokens")
+        if remaining_requests is not None:
+            key.remaining_requests = remaining_requests
+            metrics.set_gauge("openai_key_remaining_requests", remaining_requests, key=key.label)
+            if remaining_requests == 0:
+                reset = parse_reset(headers.get("x-ratelimit-reset-requests"))
+                key.drain(reset or DEFAULT_DRAIN_SECONDS, "requests_exhausted")
+        if remaining_tokens is not None:
+            key.remaining_tokens = remaining_tokens
+            metrics.set_gauge("openai_key_remaining_tokens", remaining_tokens, key=key.label)
+            if remaining_tokens < MIN_REMAINING_TOKENS:
+                reset = parse_reset(headers.get("x-ratelimit-reset-tokens"))
+                key.drain(reset or DEFAULT_DRAIN_SECONDS, "tokens_exhausted")
+
+    def _throttled(self, key: PooledKey, error: RateLimitError) -> None:
+        headers = error.response.headers
+        metrics.inc("openai_key_throttled_total", key=key.label)
+        wait = (
+            parse_reset(headers.get("retry-after"))
+            or parse_reset(headers.get("x-ratelimit-reset-requests"))
+            or parse_reset(headers.get("x-ratelimit-reset-tokens"))
+            or DEFAULT_DRAIN_SECONDS
+        )
+        self.observe(key, headers)
+        key.drain(wait, "429")
+
+    async def call(self, op: Callable[[AsyncOpenAI], Awaitable[T]]) -> T:
+        """
+        Run `op(client)` on the best key. `op` must return a raw response
+        (`.with_raw_response`); its headers feed the key's quota and its
+        parsed value is returned. 429s fail over to the next key.
+        """
+        tried: tuple[PooledKey, ...] = ()
+        while True:
+            key = self.pick(exclude=tried)
+            tried += (key,)
+            key.in_flight += 1
+            try:
+                raw = await op(key.client)
+            except RateLimitError as e:
+                self._throttled(key, e)
+                if len(tried) >= len(self.keys):
+                    raise
+                logger.info("Retrying on another OpenAI key after 429", key=key.label)
+                continue
+            finally:
+                key.in_flight -= 1
+
+            metrics.inc("openai_key_requests_total", key=key.label)
+            self.observe(key, raw.headers)
+            return raw.parse()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            k.label: {
+                "healthy": k.healthy(now),
+                "in_flight": k.in_flight,
+                "remaining_requests": k.remaining_requests,
+                "remaining_tokens": k.remaining_tokens,
+            }
+            for k in self.keys
+        }
@@ -0,0 +1,171 @@
+"""
+═══════════════════════════════════════════════════════════════
+LLM RESILIENCE — Deadline-aware retries and hedged requests
+═══════════════════════════════════════════════════════════════
+Wraps a single LLM attempt so one slow or failed upstream response
+doesn't drag out the whole request:
+
+  • every call has a deadline (per request class); attempts are cut
+    off when it passes and LLMDeadlineExceeded is raised (served as a
+    504 with Retry-After, see main.py)
+  • transient failures (connection errors / timeouts, 5xx, 429 when
+    every key is throttled) are retried with full-jitter exponential
+    backoff, but only while the backoff still fits in the deadline
+  • optional hedging: if the first attempt hasn't finished after the
+    class's observed p95 latency, a second identical attempt is fired;
+    whichever succeeds first wins and the other is cancelled
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import structlog
+from openai import APIConnectionError, InternalServerError, RateLimitError
+
+from app.services import metrics
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+RETRYABLE_ERRORS = (APIConnectionError, InternalServerError, RateLimitError)
+
+# Upper bound of a single backoff sleep
+MAX_BACKOFF_SECONDS = 4.0
+
+
+class LLMDeadlineExceeded(Exception):
+    """An LLM call did not complete within its request deadline."""
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies per label."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, label: str, seconds: float) -> None:
+        samples = self._samples.get(label)
+        if samples is None:
+            samples = self._samples[label] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def count(self, label: str) -> int:
+        return len(self._samples.get(label, ()))
+
+    def percentile(self, label: str, pct: float) -> Optional[float]:
+        samples = self._samples.get(label)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+    def stats(self) -> dict:
+        return {
+            label: {
+                "samples": len(samples),
+                "p50_ms": round(self.percentile(label, 0.50) * 1000, 1),
+                "p95_ms": round(self.percentile(label, 0.95) * 1000, 1),
+            }
+            for label, samples in self._samples.items()
+            if samples
+        }
+
+
+latency = LatencyTracker()
+
+
+async def _hedged(label: str, attempt: Callable[[], Awaitable[T]], delay: float) -> T:
+    """Run `attempt`, firing a duplicate after `delay`; first success wins."""
+    primary = asyncio.ensure_future(attempt())
+    pending: set[asyncio.Future] = {primary}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return primary.result()
+
+        hedge = asyncio.ensure_future(attempt())
+        pending.add(hedge)
+        metrics.inc("llm_hedges_total", llm_class=label)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    metrics.inc(
+                        "llm_hedge_wins_total",
+                        llm_class=label,
+                        winner="hedge" if task is hedge else "primary",
+                    )
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        # Cancel the loser (or both, if we were cancelled / timed out)
+        for task in pending:
+            task.cancel()
+
+
+async def call_with_deadline(
+    label: str,
+    attempt: Callable[[], Awaitable[T]],
+    deadline: float,
+    max_retries: int = 2,
+    base_delay: float = 0.25,
+    hedge: bool = False,
+    hedge_min_samples: int = 20,
+) -> T:
+    """
+    Run `attempt()` until it succeeds, retrying transient errors, all
+    within `deadline` (a time.monotonic() timestamp).
+
+    Raises:
+        LLMDeadlineExceeded: the deadline passed before a success.
+        Any non-retryable error from `attempt`, or the last retryable
+        one when retries (or time for them) run out.
+    """
+    retries = 0
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            metrics.inc("llm_deadline_exceeded_total", llm_class=label)
+            raise LLMDeadlineExceeded(f"{label} call exceeded its deadline")
+
+        hedge_delay = (
+            latency.percentile(label, 0.95)
+            if hedge and latency.count(label) >= hedge_min_samples
+            else None
+        )
+        start = time.monotonic()
+        try:
+            if hedge_delay is not None and hedge_delay < remaining:
+                result = await asyncio.wait_for(_hedged(label, attempt, hedge_delay), remaining)
+            else:
+                result = await asyncio.wait_for(attempt(), remaining)
+        except asyncio.TimeoutError:
+            metrics.inc("llm_deadline_exceeded_total", llm_class=label)
+            raise LLMDeadlineExceeded(f"{label} call exceeded its deadline") from None
+        except RETRYABLE_ERRORS as e:
+            retries += 1
+            backoff = random.uniform(0, min(MAX_BACKOFF_SECONDS, base_delay * 2 ** (retries - 1)))
+            if retries > max_retries or time.monotonic() + backoff >= deadline:
+                raise
+            metrics.inc("llm_retries_total", llm_class=label, error=type(e).__name__)
+            logger.info(
+                "Retrying LLM call",
+                llm_class=label,
+                attempt=retries,
+                error=type(e).__name__,
+                backoff_ms=round(backoff * 1000),
+            )
+            await asyncio.sleep(backoff)
+            continue
+
+        latency.record(label, time.monotonic() - start)
+        return result
@@ -0,0 +1,216 @@
+"""
+═══════════════════════════════════════════════════════════════
+LLM SCHEDULER — Priority admission control for outbound LLM calls
+═══════════════════════════════════════════════════════════════
+Every OpenAI call goes through one process-wide scheduler:
+
+  • at most LLM_MAX_CONCURRENCY calls are in flight at once
+  • waiting calls queue per request class and are admitted strictly
+    by priority (paid chat > agent recommend > company search >
+    free chat > translation/speech), FIFO within a class
+  • each class has a queue-time deadline; a call that cannot start in
+    time, or arrives when the queue is full, fails fast with
+    LLMOverloadedError (served as 503) instead of piling up. A full
+    queue first sheds a lower-priority waiter to make room.
+
+A released slot is handed directly to the highest-priority waiter,
+so queued calls never race new arrivals for capacity.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator, Optional
+
+import structlog
+
+from app.config import get_settings
+from app.services import metrics
+
+logger = structlog.get_logger()
+
+
+class LLMClass(IntEnum):
+    """Request classes; lower value = higher priority."""
+    PAID_CHAT = 0
+    AGENT_RECOMMEND = 1
+    COMPANY_SEARCH = 2
+    FREE_CHAT = 3
+    TRANSLATION = 4  # also text-to-speech
+
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+
+class LLMOverloadedError(Exception):
+    """An LLM call could not be admitted before its queue deadline."""
+
+    def __init__(self, llm_class: LLMClass, reason: str):
+        super().__init__(f"LLM capacity exhausted for {llm_class.label} ({reason})")
+        self.llm_class = llm_class
+        self.reason = reason
+
+
+class LLMScheduler:
+    """
+    Bounded-concurrency admission with per-class priority queues.
+
+    Args:
+        max_concurrency: Calls allowed in flight at once.
+        max_queue: Waiting calls allowed across all classes.
+        deadlines: Max seconds a call of each class may wait in the queue.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        deadlines: dict[LLMClass, float],
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.deadlines = deadlines
+        self._available = self.max_concurrency
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._queued = 0
+        self._seq = itertools.count()
+
+    @property
+    def in_flight(self) -> int:
+        return self.max_concurrency - self._available
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    async def acquire(self, llm_class: LLMClass, deadline: Optional[float] = None) -> float:
+        """
+        Wait for a slot; returns seconds spent queued.
+
+        Raises:
+            LLMOverloadedError: queue full or `deadline` (defaults to the
+                class deadline) elapsed before a slot freed up.
+        """
+        if self._available > 0 and self._queued == 0:
+            self._available -= 1
+            self._publish()
+            return 0.0
+
+        if self._queued >= self.max_queue and not self._shed_below(llm_class):
+            self._reject(llm_class, "queue_full")
+
+        timeout = deadline if deadline is not None else self.deadlines.get(llm_class)
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(llm_class), next(self._seq), fut))
+        self._queued += 1
+        self._publish()
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            # wait_for() can time out after release() already handed us the slot
+            if self._granted(fut):
+                self.release()
+            self._reject(llm_class, "deadline")
+        except asyncio.CancelledError:
+            # Slot handed to us just as the caller went away: pass it on
+            if self._granted(fut):
+                self.release()
+            raise
+        finally:
+            self._queued -= 1
+            self._publish()
+        return time.monotonic() - start
+
+    @staticmethod
+    def _granted(fut: asyncio.Future) -> bool:
+        """Whether release() handed `fut` a slot (a shed error carries none)."""
+        return fut.done() and not fut.cancelled() and fut.exception() is None
+
+    def release(self) -> None:
+        """Return a slot, handing it to the best live waiter if any."""
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)
+                self._publish()
+                return
+        self._available = min(self.max_concurrency, self._available + 1)
+        self._publish()
+
+    @asynccontextmanager
+    async def slot(
+        self, llm_class: LLMClass, deadline: Optional[float] = None
+    ) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block."""
+        waited = await self.acquire(llm_class, deadline)
+        metrics.inc("llm_requests_total", llm_class=llm_class.label)
+        metrics.inc("llm_queue_wait_seconds_total", waited, llm_class=llm_class.label)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+        }
+
+    def _shed_below(self, llm_class: LLMClass) -> bool:
+        """Fail the newest waiter of the lowest class below `llm_class`, if any."""
+        victim = None
+        for entry in self._waiters:
+            if entry[2].done() or entry[0] <= llm_class:
+                continue
+            if victim is None or entry[:2] > victim[:2]:
+                victim = entry
+        if victim is None:
+            return False
+        victim_class = LLMClass(victim[0])
+        metrics.inc("llm_rejected_total", llm_class=victim_class.label, reason="shed")
+        victim[2].set_exception(LLMOverloadedError(victim_class, "shed"))
+        return True
+
+    def _reject(self, llm_class: LLMClass, reason: str) -> None:
+        metrics.inc("llm_rejected_total", llm_class=llm_class.label, reason=reason)
+        logger.warning(
+            "LLM call rejected",
+            llm_class=llm_class.label,
+            reason=reason,
+            in_flight=self.in_flight,
+            queued=self.queued,
+        )
+        raise LLMOverloadedError(llm_class, reason)
+
+    def _publish(self) -> None:
+        metrics.set_gauge("llm_in_flight", self.in_flight)
+        metrics.set_gauge("llm_queued", self.queued)
+
+
+_scheduler: Optional[LLMScheduler] = None
+
+
+def get_scheduler() -> LLMScheduler:
+    """Process-wide scheduler built from settings on first use."""
+    global _scheduler
+    if _scheduler is None:
+        settings = get_settings()
+        deadlines = {
+            llm_class: settings.LLM_QUEUE_DEADLINES_MS.get(llm_class.label, 5000) / 1000
+            for llm_class in LLMClass
+        }
+        _scheduler = LLMScheduler(
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            max_queue=settings.LLM_MAX_QUEUE,
+            deadlines=deadlines,
+        )
+    return _scheduler
@@ -0,0 +1,207 @@
+"""
+═══════════════════════════════════════════════════════════════
+LRU STORE — O(1) LRU + idle-TTL eviction engine
+═══════════════════════════════════════════════════════════════
+A bounded key/value store backed by an OrderedDict:
+  • get() / set() / pop() are O(1)
+  • entries idle longer than `idle_ttl` seconds expire lazily
+  • capacity is capped by entry count and (optionally) total bytes
+  • hit / miss / eviction / expiration counters for observability
+
+Because every access moves the entry to the tail, the head of the
+OrderedDict is always both the least-recently-used entry and the
+first to expire, so eviction never has to scan the store.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Iterator, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class _Entry(Generic[V]):
+    """Internal slot holding a value with its size and last access time."""
+
+    __slots__ = ("value", "size", "last_access")
+
+    def __init__(self, value: V, size: int, last_access: float):
+        self.value = value
+        self.size = size
+        self.last_access = last_access
+
+
+class LRUStore(Generic[V]):
+    """
+    Bounded LRU map with per-entry idle TTL and an optional byte budget.
+
+    Args:
+        max_entries: Maximum number of entries kept.
+        idle_ttl: Seconds an entry may sit unaccessed before it expires
+            (None or 0 disables expiry).
+        max_bytes: Optional cap on the summed `sizeof(value)` of all entries.
+        sizeof: Callable estimating an entry's size in bytes, used for
+            `total_bytes` accounting and the `max_bytes` cap.
+        clock: Monotonic time source (injectable for benchmarks).
+        on_evict: Called with (key, value) for every entry dropped by the
+            store itself (budget eviction or expiry), e.g. to delete a
+            backing file. Not called for pop() / clear().
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        idle_ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        on_evict: Optional[Callable[[str, V], None]] = None,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.idle_ttl = idle_ttl or None
+        self.max_bytes = max_bytes or None
+        self._sizeof = sizeof
+        self._clock = clock
+        self._on_evict = on_evict
+        self._data: OrderedDict[str, _Entry[V]] = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # ── Core operations ────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[V]:
+        """Return the value for `key` and mark it as recently used."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        now = self._clock()
+        if self.idle_ttl and now - entry.last_access > self.idle_ttl:
+            self._remove(key)
+            self.expirations += 1
+            self._notify_evicted(key, entry)
+            self.misses += 1
+            return None
+
+        entry.last_access = now
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def peek(self, key: str) -> Optional[V]:
+        """Return the value for `key` without touching recency or counters."""
+        entry = self._data.get(key)
+        return entry.value if entry is not None else None
+
+    def set(self, key: str, value: V) -> None:
+        """Insert or replace `key`, then evict until within budget."""
+        size = self._sizeof(value) if self._sizeof else 1
+        now = self._clock()
+
+        entry = self._data.get(key)
+        if entry is not None:
+            self._bytes += size - entry.size
+            entry.value = value
+            entry.size = size
+            entry.last_access = now
+            self._data.move_to_end(key)
+        else:
+            self._data[key] = _Entry(value, size, now)
+            self._bytes += size
+
+        self._enforce_budget(now)
+
+    def pop(self, key: str) -> Optional[V]:
+        """Remove `key` and return its value (None if absent)."""
+        entry = self._remove(key)
+        return entry.value if entry is not None else None
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry from the head of the store."""
+        if not self.idle_ttl:
+            return 0
+        return self._expire_head(self._clock())
+
+    # ── Introspection ──────────────────────────────────────────
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def keys(self) -> Iterator[str]:
+        """Iterate keys from least to most recently used."""
+        return iter(list(self._data.keys()))
+
+    def items(self) -> Iterator[tuple[str, V]]:
+        """Iterate (key, value) pairs from least to most recently used."""
+        return iter([(k, e.value) for k, e in self._data.items()])
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes if self._sizeof else 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self.total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "idle_ttl": self.idle_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    # ── Internals ──────────────────────────────────────────────
+
+    def _remove(self, key: str) -> Optional[_Entry[V]]:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+        return entry
+
+    def _expire_head(self, now: float) -> int:
+        expired = 0
+        while self._data:
+            key, entry = next(iter(self._data.items()))
+            if now - entry.last_access <= self.idle_ttl:
+                break
+            self._remove(key)
+            expired += 1
+            self._notify_evicted(key, entry)
+        self.expirations += expired
+        return expired
+
+    def _enforce_budget(self, now: float) -> None:
+        if self.idle_ttl:
+            self._expire_head(now)
+
+        # Always keep the most recent entry, even if it alone exceeds max_bytes
+        while len(self._data) > 1 and (
+            len(self._data) > self.max_entries
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            key, entry = self._data.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+            self._notify_evicted(key, entry)
+
+    def _notify_evicted(self, key: str, entry: _Entry[V]) -> None:
+        if self._on_evict is not None:
+            self._on_evict(key, entry.value)
@@ -0,0 +1,176 @@
+"""
+═══════════════════════════════════════════════════════════════
+METRICS — In-process counters, gauges and histograms
+═══════════════════════════════════════════════════════════════
+A tiny, dependency-free metrics registry. Services publish:
+  • counters   — monotonically increasing totals (inc)
+  • gauges     — point-in-time values (set_gauge / add_gauge)
+  • histograms — bucketed distributions, e.g. latencies (observe)
+
+Every sample is keyed by metric name plus an optional set of labels.
+Request-scoped labels (endpoint, persona) live in a contextvar, so deep
+service code can tag samples without threading them through every call.
+render_prometheus() exposes everything in the Prometheus text format.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+LabelKey = tuple[tuple[str, str], ...]
+
+# Upper bounds (seconds) for latency histograms
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_counters: dict[str, dict[LabelKey, float]] = {}
+_gauges: dict[str, dict[LabelKey, float]] = {}
+_histograms: dict[str, dict[LabelKey, "_Histogram"]] = {}
+_buckets: dict[str, tuple[float, ...]] = {}
+
+_request_labels: ContextVar[dict[str, str]] = ContextVar("metrics_request_labels", default={})
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+def _label_key(labels: dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name: str, value: float = 1, **labels: Any) -> None:
+    """Increase counter `name` by `value`."""
+    series = _counters.setdefault(name, {})
+    key = _label_key(labels)
+    series[key] = series.get(key, 0) + value
+
+
+def set_gauge(name: str, value: float, **labels: Any) -> None:
+    """Set gauge `name` to `value`."""
+    _gauges.setdefault(name, {})[_label_key(labels)] = value
+
+
+def add_gauge(name: str, delta: float, **labels: Any) -> None:
+    """Move gauge `name` by `delta` (e.g. +1 / -1 around in-flight work)."""
+    series = _gauges.setdefault(name, {})
+    key = _label_key(labels)
+    series[key] = series.get(key, 0) + delta
+
+
+def observe(name: str, value: float, buckets: tuple[float, ...] = LATENCY_BUCKETS, **labels: Any) -> None:
+    """Record `value` in histogram `name` (bucket bounds fixed on first use)."""
+    bounds = _buckets.setdefault(name, buckets)
+    series = _histograms.setdefault(name, {})
+    key = _label_key(labels)
+    histogram = series.get(key)
+    if histogram is None:
+        histogram = series[key] = _Histogram(len(bounds) + 1)
+    histogram.counts[bisect_left(bounds, value)] += 1
+    histogram.sum += value
+    histogram.count += 1
+
+
+def get_counter(name: str, **labels: Any) -> float:
+    return _counters.get(name, {}).get(_label_key(labels), 0)
+
+
+def get_gauge(name: str, **labels: Any) -> float:
+    return _gauges.get(name, {}).get(_label_key(labels), 0)
+
+
+# ── Request Labels ─────────────────────────────────────────────
+
+
+def label_request(**labels: Any) -> None:
+    """Attach labels (endpoint, persona, ...) to samples from this request."""
+    _request_labels.set({**_request_labels.get(), **{k: str(v) for k, v in labels.items()}})
+
+
+def request_labels() -> dict[str, str]:
+    """Current request labels, with endpoint / persona always present."""
+    return {"endpoint": "", "persona": "", **_request_labels.get()}
+
+
+@contextmanager
+def track(name: str, **labels: Any) -> Iterator[None]:
+    """
+    Instrument a block: `{name}_in_flight` gauge, `{name}_duration_seconds`
+    histogram and `{name}_errors_total{error=<exception class>}`.
+    """
+    add_gauge(f"{name}_in_flight", 1, **labels)
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        inc(f"{name}_errors_total", error=type(e).__name__, **labels)
+        raise
+    finally:
+        observe(f"{name}_duration_seconds", time.perf_counter() - start, **labels)
+        add_gauge(f"{name}_in_flight", -1, **labels)
+
+
+# ── Export ─────────────────────────────────────────────────────
+
+
+def snapshot() -> dict[str, list[dict[str, Any]]]:
+    """All current samples, e.g. for /health or debugging."""
+    result: dict[str, list[dict[str, Any]]] = {}
+    for registry in (_counters, _gauges):
+        for name, series in registry.items():
+            result[name] = [
+                {"labels": dict(key), "value": value}
+                for key, value in series.items()
+            ]
+    for name, series in _histograms.items():
+        result[name] = [
+            {"labels": dict(key), "count": h.count, "sum": h.sum}
+            for key, h in series.items()
+        ]
+    return result
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus() -> str:
+    """Every metric in the Prometheus text exposition format (0.0.4)."""
+    lines: list[str] = []
+    for kind, registry in (("counter", _counters), ("gauge", _gauges)):
+        for name, series in sorted(registry.items()):
+            lines.append(f"# TYPE {name} {kind}")
+            for key, value in series.items():
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+
+    for name, series in sorted(_histograms.items()):
+        bounds = _buckets[name]
+        lines.append(f"# TYPE {name} histogram")
+        for key, h in series.items():
+            cumulative = 0
+            for bound, count in zip((*bounds, float("inf")), h.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                lines.append(f"{name}_bucket{_format_labels(key, (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(key)} {_format_value(h.sum)}")
+            lines.append(f"{name}_count{_format_labels(key)} {h.count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,138 @@
+"""
+═══════════════════════════════════════════════════════════════
+MODEL ROUTER — Per-request-class model, budget and cascade
+═══════════════════════════════════════════════════════════════
+Maps each kind of LLM request to the cheapest model that does the job:
+
+  route           used by
+  ─────────────── ────────────────────────────────────────────
+  redirect        chat replies steering the user back on track
+  product_faq     product persona chat
+  chat            every other persona chat
+  brief           generateBrief chats (long structured output)
+  search_scoring  company_search_gpt
+  explanation     company_explanation_gpt
+  recommendation  agent recommendations
+
+A route lists one or more models, fastest first, plus max_tokens and a
+per-attempt timeout. The caller validates each answer; only when
+validation fails is the request escalated to the next model (a
+cascade). An answer cut off by max_tokens escalates with the budget
+multiplied by LENGTH_ESCALATION_FACTOR — the next model would hit the
+same cap otherwise. Latency is tracked per route and model.
+
+By default every route uses OPENAI_MODEL_NAME alone, so upgrading that
+setting upgrades every call. Per-route models and cascades are opt-in
+with MODEL_ROUTES, e.g.
+MODEL_ROUTES={"brief": {"models": ["gpt-4o-mini", "gpt-4o"]}}.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from app.config import get_settings
+from app.services import metrics
+from app.services.llm_resilience import LatencyTracker
+
+DEFAULT_ROUTES: dict[str, dict[str, Any]] = {
+    "redirect": {"max_tokens": 150, "timeout": 10},
+    "product_faq": {"max_tokens": 600, "timeout": 20},
+    "chat": {"max_tokens": 600, "timeout": 30},
+    "brief": {"max_tokens": 1500, "timeout": 60},
+    "search_scoring": {"max_tokens": 500, "timeout": 20},
+    "explanation": {"max_tokens": 600, "timeout": 20},
+    "recommendation": {"max_tokens": 2000, "timeout": 45},
+}
+
+# max_tokens multiplier for the next model after a finish_reason="length" stop
+LENGTH_ESCALATION_FACTOR = 2
+
+
+@dataclass(frozen=True, slots=True)
+class Route:
+    name: str
+    models: tuple[str, ...]
+    max_tokens: int
+    timeout: float
+
+
+def get_route(name: str) -> Route:
+    """The route `name` with MODEL_ROUTES overrides applied."""
+    settings = get_settings()
+    spec = {**DEFAULT_ROUTES.get(name, {}), **settings.MODEL_ROUTES.get(name, {})}
+    return Route(
+        name=name,
+        models=tuple(spec.get("models") or [settings.OPENAI_MODEL_NAME]),
+        max_tokens=int(spec.get("max_tokens", 600)),
+        timeout=float(spec.get("timeout", settings.OPENAI_TIMEOUT_SECONDS)),
+    )
+
+
+def chat_route(persona: str, context: Optional[dict]) -> str:
+    """Route name for a persona chat."""
+    if context and context.get("generateBrief"):
+        return "brief"
+    if context and context.get("isRedirecting"):
+        return "redirect"
+    if persona == "product":
+        return "product_faq"
+    return "chat"
+
+
+# ── Output Validators ──────────────────────────────────────────
+# Each takes the first choice of a completion and returns True if the
+# answer is usable; False escalates to the route's next model.
+
+Validator = Callable[[Any], bool]
+
+
+def has_content(choice) -> bool:
+    return bool((choice.message.content or "").strip())
+
+
+def finished(choice) -> bool:
+    """Non-empty and not cut off by max_tokens."""
+    return has_content(choice) and choice.finish_reason != "length"
+
+
+def json_object(*required_keys: str) -> Validator:
+    """Complete JSON object (optionally embedded in text) containing `required_keys`."""
+
+    def validate(choice) -> bool:
+        text = choice.message.content or ""
+        start, end = text.find("{"), text.rfind("}")
+        if choice.finish_reason == "length" or start < 0 or end < start:
+            return False
+        try:
+            parsed = json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            return False
+        return isinstance(parsed, dict) and all(key in parsed for key in required_keys)
+
+    return validate
+
+
+# ── Stats ──────────────────────────────────────────────────────
+
+latency = LatencyTracker()
+
+
+def record(route: Route, model: str, seconds: float, valid: bool) -> None:
+    latency.record(f"{route.name}/{model}", seconds)
+    metrics.inc(
+        "llm_route_requests_total",
+        route=route.name,
+        model=model,
+        result="ok" if valid else "invalid",
+    )
+
+
+def record_escalation(route: Route, from_model: str) -> None:
+    metrics.inc("llm_route_escalations_total", route=route.name, model=from_model)
+
+
+def stats() -> dict:
+    return latency.stats()
@@ -2,56 +2,302 @@
 ═══════════════════════════════════════════════════════════════
 OPENAI SERVICE — Async wrapper for OpenAI Chat, TTS, Translation
 ═══════════════════════════════════════════════════════════════
-Uses the official openai Python SDK with AsyncOpenAI client.
+Uses the official openai Python SDK with one shared AsyncOpenAI client
+per process (pooled keep-alive / HTTP/2 connections, created in the app
+lifespan and closed on shutdown). Every call is admitted through the
+priority LLM scheduler (see llm_scheduler.py) by request class,
+balanced across all configured API keys (see key_pool.py), and bounded
+by a per-class deadline with retries / hedging (see llm_resilience.py).
 Provides:
-  • chat_completion() — multi-persona chat with history
+  • chat_completion() — multi-persona chat with history, with an LRU + TTL
+    response cache for opted-in personas (CHAT_CACHE_PERSONAS, off by
+    default). Chat samples at temperature 0.5–0.7, so opting a persona
+    in trades answer variety for cost: identical requests get the same
+    reply for the TTL. Hits report zero usage marked "cached": true
+  • chat_completion_stream() — the same, yielding tokens as they arrive
+    (both compact long histories to a token budget, see history_compactor.py)
   • text_to_speech() — TTS using tts-1 model
-  • translate_text() — LLM-based translation (English → Hindi)
+  • translate_text() — LLM-based translation (English → Hindi), backed by
+    the translation memory; translate_batch() for many segments in one call
 """
 
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import hashlib
+import time
+from typing import AsyncIterator, Optional
 
+import httpx
+import orjson
 import structlog
 from openai import AsyncOpenAI
 
 from app.config import get_settings
 from app.data.personas import build_system_prompt
+from app.models.chat import Persona
+from app.services import history_compactor, metrics, model_router, translation_memory
+from app.services.key_pool import KeyPool
+from app.services.llm_resilience import LLMDeadlineExceeded, call_with_deadline
+from app.services.llm_scheduler import LLMClass, get_scheduler
+from app.services.lru_store import LRUStore
+from app.services.single_flight import SingleFlight, make_key
 
 logger = structlog.get_logger()
 
 
-def _get_client() -> AsyncOpenAI:
-    """Create an async OpenAI client using the active API key."""
+# ── Shared Client ──────────────────────────────────────────────
+
+_client: Optional[AsyncOpenAI] = None
+_pool: Optional[KeyPool] = None
+
+
+def build_client() -> AsyncOpenAI:
+    """Create an AsyncOpenAI client on a pooled, tuned httpx transport."""
     settings = get_settings()
-    return AsyncOpenAI(api_key=settings.openai_api_key_active)
+    http_client = httpx.AsyncClient(
+        http2=settings.OPENAI_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            settings.OPENAI_TIMEOUT_SECONDS,
+            connect=settings.OPENAI_CONNECT_TIMEOUT_SECONDS,
+        ),
+    )
+    return AsyncOpenAI(
+        api_key=settings.openai_api_key_active,
+        base_url=settings.OPENAI_BASE_URL or None,
+        max_retries=settings.OPENAI_MAX_RETRIES,
+        http_client=http_client,
+    )
 
 
-# ── Chat Completion ────────────────────────────────────────────
+def get_client() -> AsyncOpenAI:
+    """Return the process-wide OpenAI client (created on first use)."""
+    global _client
+    if _client is None:
+        _client = build_client()
+    return _client
 
 
-async def chat_completion(
-    message: str,
-    persona: str = "default",
-    context: Optional[dict] = None,
-    conversation_history: Optional[list[dict]] = None,
-) -> dict:
-    """
-    Generate a chat completion using OpenAI.
+def get_key_pool() -> KeyPool:
+    """Per-key views of the shared client, balanced by the key pool."""
+    global _pool
+    if _pool is None:
+        _pool = KeyPool(get_client(), get_settings().openai_api_keys)
+    return _pool
 
-    Args:
-        message: The user's message text.
-        persona: One of 'product', 'contributor', 'assistant', 'default'.
-        context: Optional context dict (generateBrief, domain, subDomain, etc.).
-        conversation_history: List of prior {role, content} messages.
 
-    Returns:
-        dict with 'message' (str) and 'usage' (dict) keys.
+async def init_client() -> Optional[AsyncOpenAI]:
+    """Create the shared client at startup (skipped when no API key is set)."""
+    settings = get_settings()
+    if not settings.openai_api_key_active:
+        return None
+    client = get_client()
+    logger.info(
+        "OpenAI client ready",
+        http2=settings.OPENAI_HTTP2,
+        max_connections=settings.OPENAI_MAX_CONNECTIONS,
+        max_keepalive=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        api_keys=len(get_key_pool().keys),
+    )
+    return client
+
+
+async def close_client() -> None:
+    """Close the shared client and its connection pool at shutdown."""
+    global _client, _pool
+    if _client is not None:
+        await _client.close()
+        _client = None
+        _pool = None
+
+
+def get_key_pool_stats() -> dict:
+    return get_key_pool().stats() if _pool is not None else {}
+
+
+# ── Scheduled Calls ────────────────────────────────────────────
+
+
+def _call_labels(llm_class: LLMClass, model: str) -> dict:
+    """Metric labels for an outbound call: request labels + model + class."""
+    return {**metrics.request_labels(), "model": model, "llm_class": llm_class.label}
+
+
+def _record_usage(labels: dict, usage) -> None:
+    if usage is not None:
+        metrics.inc("llm_prompt_tokens_total", usage.prompt_tokens or 0, **labels)
+        metrics.inc("llm_completion_tokens_total", usage.completion_tokens or 0, **labels)
+
+
+def _deadline(llm_class: LLMClass) -> float:
+    """Monotonic timestamp by which a call of `llm_class` must finish."""
+    settings = get_settings()
+    seconds = settings.LLM_DEADLINES_SECONDS.get(llm_class.label, settings.OPENAI_TIMEOUT_SECONDS)
+    return time.monotonic() + seconds
+
+
+async def _send(llm_class: LLMClass, op, deadline: float, hedge: bool = True):
+    """
+    Run `op(client)` through the key pool with deadline-bounded retries,
+    hedged when the class is listed in LLM_HEDGE_CLASSES.
     """
     settings = get_settings()
-    client = _get_client()
+    return await call_with_deadline(
+        llm_class.label,
+        lambda: get_key_pool().call(op),
+        deadline,
+        max_retries=settings.OPENAI_MAX_RETRIES,
+        base_delay=settings.LLM_RETRY_BASE_DELAY_MS / 1000,
+        hedge=hedge and llm_class.label in settings.LLM_HEDGE_CLASSES,
+        hedge_min_samples=settings.LLM_HEDGE_MIN_SAMPLES,
+    )
 
+
+async def create_chat_completion(llm_class: LLMClass, timeout: Optional[float] = None, **params):
+    """
+    chat.completions.create() admitted through the LLM scheduler, sent on
+    the least-loaded healthy API key and retried / hedged within the
+    class deadline (time spent queued counts against it), or `timeout`
+    seconds if that is sooner.
+
+    Raises:
+        LLMOverloadedError: no capacity for `llm_class` within its queue deadline.
+        LLMDeadlineExceeded: no successful response within the class deadline.
+    """
+    deadline = _deadline(llm_class)
+    if timeout is not None:
+        deadline = min(deadline, time.monotonic() + timeout)
+    labels = _call_labels(llm_class, params.get("model", ""))
+    with metrics.track("llm_request", **labels):
+        async with get_scheduler().slot(llm_class):
+            response = await _send(
+                llm_class,
+                lambda client: client.chat.completions.with_raw_response.create(**params),
+                deadline,
+            )
+    _record_usage(labels, response.usage)
+    return response
+
+
+async def routed_completion(
+    route_name: str,
+    llm_class: LLMClass,
+    validate: model_router.Validator = model_router.has_content,
+    **params,
+):
+    """
+    create_chat_completion() on the models of a route (see model_router.py),
+    fastest first, escalating to the next model only when `validate`
+    rejects the answer. An answer truncated by max_tokens escalates with
+    a larger budget. The last model's answer is returned regardless.
+    """
+    route = model_router.get_route(route_name)
+    params.setdefault("max_tokens", route.max_tokens)
+    for position, model in enumerate(route.models):
+        start = time.monotonic()
+        response = await create_chat_completion(llm_class, timeout=route.timeout, model=model, **params)
+        choice = response.choices[0]
+        valid = validate(choice)
+        model_router.record(route, model, time.monotonic() - start, valid)
+        if valid or position == len(route.models) - 1:
+            return response
+        if choice.finish_reason == "length":
+            params["max_tokens"] *= model_router.LENGTH_ESCALATION_FACTOR
+        model_router.record_escalation(route, model)
+        logger.info(
+            "Escalating LLM route",
+            route=route.name,
+            from_model=model,
+            reason=choice.finish_reason,
+            max_tokens=params["max_tokens"],
+        )
+
+
+async def stream_completion(
+    llm_class: LLMClass,
+    route: model_router.Route,
+    usage: Optional[dict] = None,
+    **params,
+) -> AsyncIterator[str]:
+    """
+    Stream a completion on the route's first model, yielding content deltas.
+
+    The scheduler slot is held until the stream ends. Opening the stream
+    is retried within the class deadline but never hedged (a duplicate
+    would bill a second full generation); the same deadline bounds every
+    later chunk read, so a stalled stream raises LLMDeadlineExceeded.
+    Tokens already sent cannot be taken back, so there is no cascade.
+    `usage`, if given, is filled with the token usage reported at the
+    end of the stream.
+    """
+    params.setdefault("max_tokens", route.max_tokens)
+    deadline = min(_deadline(llm_class), time.monotonic() + route.timeout)
+    labels = _call_labels(llm_class, route.models[0])
+    started = time.perf_counter()
+    first = True
+    final_usage = None
+    with metrics.track("llm_request", **labels):
+        async with get_scheduler().slot(llm_class):
+            stream = await _send(
+                llm_class,
+                lambda client: client.chat.completions.with_raw_response.create(
+                    model=route.models[0],
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    **params,
+                ),
+                deadline,
+                hedge=False,
+            )
+            try:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(
+                            stream.__anext__(), max(deadline - time.monotonic(), 0)
+                        )
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        raise LLMDeadlineExceeded(
+                            f"{llm_class.label} stream exceeded its deadline"
+                        ) from None
+                    if chunk.usage is not None:
+                        final_usage = chunk.usage
+                    if not chunk.choices:
+                        continue
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        if first:
+                            first = False
+                            metrics.observe(
+                                "llm_time_to_first_token_seconds",
+                                time.perf_counter() - started,
+                                **labels,
+                            )
+                        yield content
+            finally:
+                # Client disconnects close the generator: release the upstream stream too
+                await stream.close()
+    _record_usage(labels, final_usage)
+    if usage is not None:
+        usage.update(_usage_dict(final_usage))
+
+
+# ── Chat Completion ────────────────────────────────────────────
+
+
+def _build_chat_request(
+    message: str,
+    persona: str,
+    context: Optional[dict],
+    conversation_history: Optional[list[dict]],
+) -> dict:
+    """Assemble messages and sampling parameters for a persona chat."""
     # Build system prompt from persona
     system_prompt = build_system_prompt(persona, context)
 
@@ -64,46 +310,233 @@ async def chat_completion(
     # Add current user message
     messages.append({"role": "user", "content": message})
 
-    # Tune parameters based on context
-    is_generating_brief = context and context.get("generateBrief", False)
-    is_redirecting = context and context.get("isRedirecting", False)
-
+    # Tune parameters based on context; output budget comes from the route
+    route = model_router.get_route(model_router.chat_route(persona, context))
+    is_generating_brief = route.name == "brief"
     temperature = 0.5 if is_generating_brief else 0.7
-    max_tokens = 1500 if is_generating_brief else (150 if is_redirecting else 600)
+    max_tokens = route.max_tokens
 
     logger.info(
         "OpenAI chat request",
         persona=persona,
         messages_count=len(messages),
         is_brief=is_generating_brief,
-        model=settings.OPENAI_MODEL_NAME,
+        route=route.name,
+    )
+
+    return {
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+
+
+def _history_summarizer() -> history_compactor.Summarizer:
+    """
+    Summarizer for history_compactor. Summaries are background work, so
+    they run in the lowest-priority class and chats always go first.
+    """
+
+    async def summarize(previous: Optional[str], turns: list[dict]) -> str:
+        transcript = "\n".join(f"{m.get('role')}: {m.get('content')}" for m in turns)
+        if previous:
+            transcript = f"Earlier summary:\n{previous}\n\nLater messages:\n{transcript}"
+        response = await create_chat_completion(
+            max(LLMClass),
+            model=get_settings().OPENAI_MODEL_NAME,
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        "Summarize this conversation for an assistant that will continue it. "
+                        "Keep the user's goals, facts, names, numbers and decisions; drop "
+                        "pleasantries. Write at most 150 words."
+                    ),
+                },
+                {"role": "user", "content": transcript},
+            ],
+            temperature=0.2,
+            max_tokens=get_settings().HISTORY_SUMMARY_MAX_TOKENS,
+        )
+        return (response.choices[0].message.content or "").strip()
+
+    return summarize
+
+
+# ── Response Cache ─────────────────────────────────────────────
+
+_chat_cache: Optional[LRUStore[tuple[float, str]]] = None
+
+
+def _get_chat_cache() -> LRUStore[tuple[float, str]]:
+    global _chat_cache
+    if _chat_cache is None:
+        settings = get_settings()
+        _chat_cache = LRUStore(
+            max_entries=settings.CHAT_CACHE_MAX_ENTRIES,
+            idle_ttl=settings.CHAT_CACHE_TTL_SECONDS,
+        )
+    return _chat_cache
+
+
+def _chat_cache_key(
+    persona: str,
+    route: model_router.Route,
+    message: str,
+    context: Optional[dict],
+    conversation_history: Optional[list[dict]],
+) -> str:
+    """
+    Hash of everything that determines the completion: prompt, the full
+    (uncompacted) history and the route, which fixes models and sampling.
+    """
+    payload = orjson.dumps(
+        [
+            persona,
+            route.name,
+            route.models,
+            route.max_tokens,
+            build_system_prompt(persona, context),
+            conversation_history or [],
+            message,
+        ]
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+# Cache hits cost no tokens; `cached` lets callers tell them apart
+_CACHED_USAGE = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "cached": True}
+
+
+def get_chat_cache_stats() -> dict:
+    return _get_chat_cache().stats()
+
+
+def _usage_dict(usage) -> dict:
+    return {
+        "prompt_tokens": usage.prompt_tokens if usage else 0,
+        "completion_tokens": usage.completion_tokens if usage else 0,
+        "total_tokens": usage.total_tokens if usage else 0,
+    }
+
+
+_PERSONA_LABELS = frozenset(p.value for p in Persona)
+
+
+def _persona_label(persona: str) -> str:
+    """Metric label for `persona`: a Persona value, else "other" (bounded cardinality)."""
+    persona = getattr(persona, "value", persona)
+    return persona if persona in _PERSONA_LABELS else "other"
+
+
+async def chat_completion(
+    message: str,
+    persona: str = "default",
+    context: Optional[dict] = None,
+    conversation_history: Optional[list[dict]] = None,
+    llm_class: LLMClass = LLMClass.FREE_CHAT,
+    history_scope: Optional[history_compactor.HistoryScope] = None,
+) -> dict:
+    """
+    Generate a chat completion using OpenAI.
+
+    Args:
+        message: The user's message text.
+        persona: One of 'product', 'contributor', 'assistant', 'default'.
+        context: Optional context dict (generateBrief, domain, subDomain, etc.).
+        conversation_history: List of prior {role, content} messages.
+        llm_class: Scheduler priority (PAID_CHAT for Stage 2).
+        history_scope: Identifies a server-side conversation, so its history
+            summaries survive head trimming (see history_compactor.py).
+
+    Returns:
+        dict with 'message' (str) and 'usage' (dict) keys.
+    """
+    settings = get_settings()
+    persona_label = _persona_label(persona)
+    metrics.label_request(persona=persona_label)
+    route = model_router.get_route(model_router.chat_route(persona, context))
+
+    # Looked up before compaction, so a hit also skips any summary call
+    cache_key = None
+    if persona in settings.CHAT_CACHE_PERSONAS:
+        cache = _get_chat_cache()
+        cache_key = _chat_cache_key(persona, route, message, context, conversation_history)
+        cached = cache.get(cache_key)
+        # idle_ttl only bounds time since last access; also cap total age
+        if cached is not None and time.time() - cached[0] <= settings.CHAT_CACHE_TTL_SECONDS:
+            metrics.inc("chat_cache_requests_total", result="hit", persona=persona_label)
+            logger.info("OpenAI chat served from cache", persona=persona)
+            return {"message": cached[1], "usage": dict(_CACHED_USAGE)}
+        metrics.inc("chat_cache_requests_total", result="miss", persona=persona_label)
+
+    conversation_history = await history_compactor.compact(
+        conversation_history, _history_summarizer(), history_scope
     )
+    params = _build_chat_request(message, persona, context, conversation_history)
 
-    response = await client.chat.completions.create(
-        model=settings.OPENAI_MODEL_NAME,
-        messages=messages,
-        temperature=temperature,
-        max_tokens=max_tokens,
+    response = await routed_completion(
+        route.name,
+        llm_class,
+        model_router.finished if route.name == "brief" else model_router.has_content,
+        **params,
     )
 
     ai_message = response.choices[0].message.content or (
         "Sorry, I could not generate a response."
     )
 
-    usage = {
-        "prompt_tokens": response.usage.prompt_tokens if response.usage else 0,
-        "completion_tokens": response.usage.completion_tokens if response.usage else 0,
-        "total_tokens": response.usage.total_tokens if response.usage else 0,
-    }
+    usage = _usage_dict(response.usage)
 
     logger.info("OpenAI chat response received", usage=usage)
 
+    if cache_key is not None and response.choices[0].message.content:
+        _get_chat_cache().set(cache_key, (time.time(), ai_message))
     return {"message": ai_message, "usage": usage}
 
 
+async def chat_completion_stream(
+    message: str,
+    persona: str = "default",
+    context: Optional[dict] = None,
+    conversation_history: Optional[list[dict]] = None,
+    llm_class: LLMClass = LLMClass.FREE_CHAT,
+    history_scope: Optional[history_compactor.HistoryScope] = None,
+) -> AsyncIterator[dict]:
+    """
+    Streaming variant of chat_completion().
+
+    Yields {"type": "token", "content": str} for every content delta as it
+    arrives, then one {"type": "done", "message": str, "usage": dict} with
+    the full text and the token usage reported at the end of the stream.
+    See stream_completion() for scheduling, retries and model choice.
+    """
+    metrics.label_request(persona=_persona_label(persona))
+    conversation_history = await history_compactor.compact(
+        conversation_history, _history_summarizer(), history_scope
+    )
+    params = _build_chat_request(message, persona, context, conversation_history)
+    route = model_router.get_route(model_router.chat_route(persona, context))
+
+    parts: list[str] = []
+    usage: dict = {}
+    async for content in stream_completion(llm_class, route, usage, **params):
+        parts.append(content)
+        yield {"type": "token", "content": content}
+
+    ai_message = "".join(parts) or "Sorry, I could not generate a response."
+
+    logger.info("OpenAI chat stream finished", usage=usage)
+
+    yield {"type": "done", "message": ai_message, "usage": usage}
+
+
 # ── Company Search GPT ─────────────────────────────────────────
 
 
+_company_search_flight: SingleFlight[str] = SingleFlight("company_search")
+
+
 async def company_search_gpt(
     search_prompt: str,
     query: str,
@@ -118,20 +551,21 @@ async def company_search_gpt(
     Returns:
         Raw GPT response string (JSON expected).
     """
-    settings = get_settings()
-    client = _get_client()
-
-    response = await client.chat.completions.create(
-        model=settings.OPENAI_MODEL_NAME,
-        messages=[
-            {"role": "system", "content": search_prompt},
-            {"role": "user", "content": f'Find the best startups for: "{query}"'},
-        ],
-        temperature=0.2,
-        max_tokens=500,
-    )
-
-    return response.choices[0].message.content or ""
+    async def search() -> str:
+        response = await routed_completion(
+            "search_scoring",
+            LLMClass.COMPANY_SEARCH,
+            model_router.json_object("topMatches"),
+            messages=[
+                {"role": "system", "content": search_prompt},
+                {"role": "user", "content": f'Find the best startups for: "{query}"'},
+            ],
+            temperature=0.2,
+        )
+        return response.choices[0].message.content or ""
+
+    # Identical searches in flight at once share one call
+    return await _company_search_flight.do(make_key("search", search_prompt, query), search)
 
 
 async def company_explanation_gpt(
@@ -148,24 +582,31 @@ async def company_explanation_gpt(
     Returns:
         Human-friendly explanation string.
     """
-    settings = get_settings()
-    client = _get_client()
-
-    response = await client.chat.completions.create(
-        model=settings.OPENAI_MODEL_NAME,
-        messages=[
-            {"role": "system", "content": explanation_prompt},
-            {"role": "user", "content": f'Explain these tools for: "{query}"'},
-        ],
-        temperature=0.7,
-        max_tokens=600,
-    )
+    async def explain() -> str:
+        response = await routed_completion(
+            "explanation",
+            LLMClass.COMPANY_SEARCH,
+            messages=[
+                {"role": "system", "content": explanation_prompt},
+                {"role": "user", "content": f'Explain these tools for: "{query}"'},
+            ],
+            temperature=0.7,
+        )
+        return response.choices[0].message.content or ""
 
-    return response.choices[0].message.content or ""
+    return await _company_search_flight.do(make_key("explain", explanation_prompt, query), explain)
 
 
 # ── Text-to-Speech ─────────────────────────────────────────────
 
+TTS_MODEL = "tts-1"
+TTS_VOICE = "nova"  # Warm and empathetic voice
+
+
+def tts_speed(language: str) -> float:
+    """Speaking rate used for `language` (Hindi is read slightly slower)."""
+    return 0.9 if language == "hindi" else 0.95
+
 
 async def text_to_speech(
     text: str,
@@ -183,28 +624,37 @@ async def text_to_speech(
     Returns:
         MP3 audio bytes.
     """
-    client = _get_client()
     text_to_speak = text
 
     # Translate to Hindi if requested
     if language == "hindi":
         text_to_speak = await translate_text(text, target_language="hindi")
 
-    speed = 0.9 if language == "hindi" else 0.95
+    return await synthesize_speech(text_to_speak, speed=tts_speed(language))
+
+
+async def synthesize_speech(text: str, speed: float = 0.95) -> bytes:
+    """Run tts-1 on already-translated `text` and return the MP3 bytes."""
 
     logger.info(
         "OpenAI TTS request",
-        language=language,
-        text_length=len(text_to_speak),
+        text_length=len(text),
         speed=speed,
     )
 
-    response = await client.audio.speech.create(
-        model="tts-1",
-        voice="nova",  # Warm and empathetic voice
-        input=text_to_speak,
-        speed=speed,
-    )
+    deadline = _deadline(LLMClass.TRANSLATION)
+    with metrics.track("llm_request", **_call_labels(LLMClass.TRANSLATION, TTS_MODEL)):
+        async with get_scheduler().slot(LLMClass.TRANSLATION):
+            response = await _send(
+                LLMClass.TRANSLATION,
+                lambda client: client.audio.speech.with_raw_response.create(
+                    model=TTS_MODEL,
+                    voice=TTS_VOICE,
+                    input=text,
+                    speed=speed,
+                ),
+                deadline,
+            )
 
     # Read the binary response
     audio_bytes = response.read()
@@ -217,6 +667,15 @@ async def text_to_speech(
 # ── Translation ────────────────────────────────────────────────
 
 
+def _translation_system_prompt(target_language: str) -> str:
+    return (
+        f"You are a translator. Translate the following English text to "
+        f"{target_language}. Keep the same warm, empathetic tone. "
+        f"Use simple {target_language} that is easy to understand. "
+        f"Translate naturally, not word-by-word. Keep any names as they are."
+    )
+
+
 async def translate_text(
     text: str,
     target_language: str = "hindi",
@@ -224,6 +683,9 @@ async def translate_text(
     """
     Translate text using OpenAI chat completion.
 
+    Translations are served from / recorded in the translation memory,
+    so repeated phrases are translated once.
+
     Args:
         text: The source text (English).
         target_language: Target language name.
@@ -231,23 +693,85 @@ async def translate_text(
     Returns:
         Translated text string.
     """
-    client = _get_client()
+    remembered = await translation_memory.lookup(text, target_language)
+    if remembered is not None:
+        return remembered
 
-    response = await client.chat.completions.create(
+    response = await create_chat_completion(
+        LLMClass.TRANSLATION,
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": _translation_system_prompt(target_language)},
+            {"role": "user", "content": text},
+        ],
+        temperature=0.3,
+    )
+
+    translated = response.choices[0].message.content
+    if not translated:
+        return text
+    await translation_memory.remember(text, translated, target_language)
+    return translated
+
+
+async def translate_batch(
+    texts: list[str],
+    target_language: str = "hindi",
+) -> list[str]:
+    """
+    Translate several segments, using one LLM call for all of them.
+
+    Segments already in the translation memory are not sent; duplicates
+    are sent once. Falls back to per-segment translate_text() if the
+    model returns a malformed batch.
+
+    Returns:
+        Translations in the same order as `texts`.
+    """
+    results = await translation_memory.lookup_many(texts, target_language)
+    pending = list(dict.fromkeys(t for t, r in zip(texts, results) if r is None))
+
+    if len(pending) == 1:
+        translated = {pending[0]: await translate_text(pending[0], target_language)}
+    elif pending:
+        translated = await _translate_segments(pending, target_language)
+    else:
+        translated = {}
+
+    return [r if r is not None else translated[t] for t, r in zip(texts, results)]
+
+
+async def _translate_segments(segments: list[str], target_language: str) -> dict[str, str]:
+    response = await create_chat_completion(
+        LLMClass.TRANSLATION,
         model="gpt-4o-mini",
         messages=[
             {
                 "role": "system",
-                "content": (
-                    f"You are a translator. Translate the following English text to "
-                    f"{target_language}. Keep the same warm, empathetic tone. "
-                    f"Use simple {target_language} that is easy to understand. "
-                    f"Translate naturally, not word-by-word. Keep any names as they are."
+                "content": _translation_system_prompt(target_language) + (
+                    " You will receive a JSON array of independent segments. "
+                    'Respond with a JSON object {"translations": [...]} containing '
+                    "exactly one translated string per segment, in the same order."
                 ),
             },
-            {"role": "user", "content": text},
+            {"role": "user", "content": orjson.dumps(segments).decode()},
         ],
         temperature=0.3,
+        response_format={"type": "json_object"},
     )
 
-    return response.choices[0].message.content or text
+    try:
+        translations = orjson.loads(response.choices[0].message.content or "")["translations"]
+        if len(translations) != len(segments) or not all(
+            isinstance(t, str) and t for t in translations
+        ):
+            raise ValueError("segment count mismatch")
+    except (orjson.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        logger.warning("Batch translation malformed, translating one by one", error=str(e))
+        translations = await asyncio.gather(
+            *(translate_text(segment, target_language) for segment in segments)
+        )
+        return dict(zip(segments, translations))
+
+    await translation_memory.remember_many(list(zip(segments, translations)), target_language)
+    return dict(zip(segments, translations))
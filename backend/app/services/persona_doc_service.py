@@ -25,6 +25,8 @@ from typing import Optional
 
 import structlog
 
+from app.utils.interning import register_canonical
+
 logger = structlog.get_logger()
 
 # Path to the persona documents folder
@@ -35,6 +37,14 @@ PERSONAS_DOCS_DIR = Path(__file__).parent.parent / "data" / "personas_docs"
 _DOC_CACHE: dict[str, list[dict]] = {}
 _PRELOADED: bool = False
 
+# Fixed wording of the diagnostic questions built from each task block
+PROBLEMS_QUESTION = "Which of these problem areas best describes your current challenge?"
+RCA_QUESTION = "Which of these symptoms are you experiencing?"
+OPPORTUNITIES_QUESTION = "Which of these opportunities would be most valuable for your situation?"
+
+# Doc option lines are registered as they are parsed (see app/utils/interning.py)
+register_canonical(PROBLEMS_QUESTION, RCA_QUESTION, OPPORTUNITIES_QUESTION)
+
 
 # ── Domain → Document Name Mapping ─────────────────────────────
 # Maps the domain names (as used in the frontend) to the .docx file names.
@@ -281,6 +291,10 @@ def preload_all_docs():
         if doc_name in file_to_blocks:
             _DOC_CACHE[domain_key] = file_to_blocks[doc_name]
 
+    for blocks in file_to_blocks.values():
+        for block in blocks:
+            _intern_block_options(block)
+
     _PRELOADED = True
     logger.info(
         "All persona docs preloaded",
@@ -290,6 +304,18 @@ def preload_all_docs():
     )
 
 
+def _intern_block_options(block: dict) -> None:
+    """Register every user-facing option line of a task block as canonical."""
+    for key in ("problems", "opportunities", "rca_bridge"):
+        for line in block[key].split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+            register_canonical(line)
+            if key == "rca_bridge":
+                register_canonical(_parse_rca_bridge_item(line)["symptom"])
+
+
 def _get_blocks_for_domain(domain: str) -> list[dict]:
     """
     Get parsed task blocks for a domain. Uses preloaded cache first,
@@ -387,7 +413,7 @@ def get_diagnostic_sections(domain: str, task: str) -> Optional[dict]:
             sections.append({
                 "key": "problems",
                 "label": "Problem Areas",
-                "question": "Which of these problem areas best describes your current challenge?",
+                "question": PROBLEMS_QUESTION,
                 "items": items[:8],
                 "allows_free_text": True,
             })
@@ -406,7 +432,7 @@ def get_diagnostic_sections(domain: str, task: str) -> Optional[dict]:
             sections.append({
                 "key": "rca_bridge",
                 "label": "Diagnostic Signals",
-                "question": "Which of these symptoms are you experiencing?",
+                "question": RCA_QUESTION,
                 "items": symptom_items[:8],
                 "allows_free_text": True,
                 "rca_parsed": parsed_items,
@@ -423,7 +449,7 @@ def get_diagnostic_sections(domain: str, task: str) -> Optional[dict]:
             sections.append({
                 "key": "opportunities",
                 "label": "Growth Opportunities",
-                "question": "Which of these opportunities would be most valuable for your situation?",
+                "question": OPPORTUNITIES_QUESTION,
                 "items": items[:8],
                 "allows_free_text": True,
             })
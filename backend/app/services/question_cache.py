@@ -0,0 +1,189 @@
+"""
+═══════════════════════════════════════════════════════════════
+QUESTION CACHE — Precomputed dynamic diagnostic questions
+═══════════════════════════════════════════════════════════════
+generate_dynamic_questions() depends only on (outcome label, domain,
+task, number of questions), and those come from the finite rows of
+data/categories.csv. Its output is therefore kept in a JSON artifact:
+
+  • built offline by scripts.warm_question_cache (one LLM call per
+    category row) and loaded into a dict at startup — O(1) lookups
+  • misses fall through to the LLM; the result is written back and the
+    artifact is rewritten atomically in the background. Writers hold a
+    lock file and merge with what is on disk (newest entry per key
+    wins), so several workers or a concurrent warm-up run never drop
+    each other's entries
+  • each entry records a fingerprint of the prompt and model that
+    produced it, so changing either turns old entries into misses
+    (edited persona docs need a re-run with --force)
+
+With QUESTION_CACHE_PATH="" the cache lives in memory only.
+
+Note: /agent/session/task serves questions parsed from the persona
+docs, so today only scripts.warm_question_cache calls
+generate_dynamic_questions(); the runtime cache matters once that path
+is used for requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import orjson
+import structlog
+
+from app.config import get_settings
+from app.services import metrics
+from app.services.single_flight import make_key
+
+logger = structlog.get_logger()
+
+FORMAT_VERSION = 1
+
+_entries: dict[str, dict] = {}
+_flush_task: Optional[asyncio.Task] = None
+_dirty = False
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+def cache_key(outcome_label: str, domain: str, task: str, num_questions: int) -> str:
+    return make_key(_normalize(outcome_label), _normalize(domain), _normalize(task), num_questions)
+
+
+# ── Lifecycle ──────────────────────────────────────────────────
+
+
+def _read(path: str) -> dict[str, dict]:
+    try:
+        artifact = orjson.loads(Path(path).read_bytes())
+    except FileNotFoundError:
+        return {}
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning("Ignoring unreadable question cache", path=path, error=str(e))
+        return {}
+    if artifact.get("format") != FORMAT_VERSION:
+        logger.warning("Ignoring question cache with unknown format", path=path)
+        return {}
+    return artifact.get("entries", {})
+
+
+def _merge(entries: dict[str, dict], other: dict[str, dict]) -> dict[str, dict]:
+    """Union of both, keeping the most recently created entry per key."""
+    merged = dict(entries)
+    for key, entry in other.items():
+        mine = merged.get(key)
+        if mine is None or entry.get("created_at", 0) > mine.get("created_at", 0):
+            merged[key] = entry
+    return merged
+
+
+def _write(path: str, entries: dict[str, dict]) -> dict[str, dict]:
+    """Merge `entries` into the artifact on disk; returns the merged set."""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target.with_name(target.name + ".lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        merged = _merge(entries, _read(path))
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=target.name + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(
+                    orjson.dumps(
+                        {"format": FORMAT_VERSION, "entries": merged}, option=orjson.OPT_INDENT_2
+                    )
+                )
+            os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+    return merged
+
+
+async def init_cache() -> int:
+    """Load the artifact (no-op when QUESTION_CACHE_PATH is empty)."""
+    global _entries
+    path = get_settings().QUESTION_CACHE_PATH
+    if path:
+        _entries = await asyncio.to_thread(_read, path)
+        logger.info("Question cache loaded", path=path, entries=len(_entries))
+    return len(_entries)
+
+
+async def flush() -> None:
+    """Merge new entries into the artifact if any were added since the last write."""
+    global _dirty
+    path = get_settings().QUESTION_CACHE_PATH
+    if not path or not _dirty:
+        return
+    _dirty = False
+    try:
+        merged = await asyncio.to_thread(_write, path, dict(_entries))
+    except OSError as e:
+        _dirty = True
+        logger.warning("Failed to write question cache", path=path, error=str(e))
+        return
+    # Pick up entries other writers added, without undoing newer local ones
+    _entries.update(_merge(merged, _entries))
+
+
+async def close_cache() -> None:
+    if _flush_task is not None:
+        await _flush_task
+    await flush()
+
+
+def _schedule_flush() -> None:
+    global _flush_task
+    if _flush_task is None or _flush_task.done():
+        _flush_task = asyncio.create_task(flush())
+
+
+# ── Lookup / Store ─────────────────────────────────────────────
+
+
+def lookup(key: str, fingerprint: str) -> Optional[list[dict]]:
+    """Cached questions for `key`, if produced by the same prompt + model."""
+    entry = _entries.get(key)
+    if entry is None or entry["fingerprint"] != fingerprint:
+        metrics.inc("question_cache_requests_total", result="miss")
+        return None
+    metrics.inc("question_cache_requests_total", result="hit")
+    return entry["questions"]
+
+
+def store(
+    key: str,
+    fingerprint: str,
+    questions: list[dict],
+    *,
+    outcome_label: str,
+    domain: str,
+    task: str,
+    num_questions: int,
+) -> None:
+    """Remember generated questions and schedule an artifact rewrite."""
+    global _dirty
+    _entries[key] = {
+        "outcome_label": outcome_label,
+        "domain": domain,
+        "task": task,
+        "num_questions": num_questions,
+        "fingerprint": fingerprint,
+        "questions": questions,
+        "created_at": time.time(),
+    }
+    _dirty = True
+    _schedule_flush()
+
+
+def stats() -> dict:
+    return {"entries": len(_entries), "persistent": bool(get_settings().QUESTION_CACHE_PATH)}
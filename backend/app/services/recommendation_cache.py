@@ -0,0 +1,179 @@
+"""
+═══════════════════════════════════════════════════════════════
+RECOMMENDATION CACHE — Final recommendations by answer vector
+═══════════════════════════════════════════════════════════════
+Most sessions answer the diagnostic questions by picking from the same
+fixed option lists (get_diagnostic_sections), so identical answer sets
+recur constantly. Their recommendations are cached under a canonical
+answer vector — built by agent_service.recommendation_key():
+
+  (domain, matched task, sorted "<section>:<option index>" ids)
+
+  • sessions with any free-text answer get no key and bypass the cache
+  • in-memory LRUStore front, entries expire RECOMMENDATION_CACHE_TTL_SECONDS
+    after they were generated (not after last use)
+  • SQLite (WAL) behind it, so hits survive restarts and are shared by
+    every worker on the host; expired rows are purged at startup
+  • recommendation_cache_requests_total{result=hit|miss|bypass} and the
+    recommendation_cache_hit_ratio gauge track effectiveness
+
+With RECOMMENDATION_CACHE_PATH="" only the in-memory front is used.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import orjson
+import structlog
+
+from app.config import get_settings
+from app.services import metrics
+from app.services.lru_store import LRUStore
+
+logger = structlog.get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recommendations (
+    key        TEXT PRIMARY KEY,
+    value      BLOB NOT NULL,
+    created_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+_front: Optional[LRUStore[tuple[float, dict]]] = None
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+_counts = {"hit": 0, "miss": 0, "bypass": 0}
+
+
+def _get_front() -> LRUStore[tuple[float, dict]]:
+    global _front
+    if _front is None:
+        settings = get_settings()
+        _front = LRUStore(
+            max_entries=settings.RECOMMENDATION_CACHE_MAX_ENTRIES,
+            idle_ttl=settings.RECOMMENDATION_CACHE_TTL_SECONDS,
+        )
+    return _front
+
+
+# ── Lifecycle ──────────────────────────────────────────────────
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _purge(ttl: float) -> int:
+    with _lock:
+        return _conn.execute(
+            "DELETE FROM recommendations WHERE created_at < ?", (time.time() - ttl,)
+        ).rowcount
+
+
+async def init_cache() -> None:
+    """Open the SQLite store (no-op when RECOMMENDATION_CACHE_PATH is empty)."""
+    global _conn
+    settings = get_settings()
+    _get_front()
+    if not settings.RECOMMENDATION_CACHE_PATH or _conn is not None:
+        return
+    _conn = await asyncio.to_thread(_connect, settings.RECOMMENDATION_CACHE_PATH)
+    purged = await asyncio.to_thread(_purge, settings.RECOMMENDATION_CACHE_TTL_SECONDS)
+    logger.info(
+        "Recommendation cache ready", path=settings.RECOMMENDATION_CACHE_PATH, purged=purged
+    )
+
+
+async def close_cache() -> None:
+    global _conn
+    if _conn is not None:
+        with _lock:
+            _conn.close()
+        _conn = None
+
+
+# ── Lookup / Store ─────────────────────────────────────────────
+
+
+def _count(result: str) -> None:
+    _counts[result] += 1
+    metrics.inc("recommendation_cache_requests_total", result=result)
+    lookups = _counts["hit"] + _counts["miss"]
+    if lookups:
+        metrics.set_gauge("recommendation_cache_hit_ratio", _counts["hit"] / lookups)
+
+
+def record_bypass() -> None:
+    """Count a session that could not be keyed (free-text answers)."""
+    _count("bypass")
+
+
+def _db_get(key: str) -> Optional[tuple[float, bytes]]:
+    with _lock:
+        return _conn.execute(
+            "SELECT created_at, value FROM recommendations WHERE key = ?", (key,)
+        ).fetchone()
+
+
+def _db_put(key: str, value: bytes, created_at: float) -> None:
+    with _lock:
+        _conn.execute(
+            "INSERT OR REPLACE INTO recommendations (key, value, created_at) VALUES (?, ?, ?)",
+            (key, value, created_at),
+        )
+
+
+async def lookup(key: str) -> Optional[dict]:
+    """Cached recommendations for `key` if still fresh. Treat as read-only."""
+    ttl = get_settings().RECOMMENDATION_CACHE_TTL_SECONDS
+    front = _get_front()
+    cached = front.get(key)
+    if cached is None and _conn is not None:
+        try:
+            row = await asyncio.to_thread(_db_get, key)
+        except sqlite3.Error as e:
+            logger.warning("Failed to read recommendation cache", error=str(e))
+            row = None
+        if row is not None:
+            cached = (row[0], orjson.loads(row[1]))
+            front.set(key, cached)
+
+    if cached is None or cached[0] < time.time() - ttl:
+        if cached is not None:
+            front.pop(key)
+        _count("miss")
+        return None
+    _count("hit")
+    return cached[1]
+
+
+async def store(key: str, recommendations: dict) -> None:
+    created_at = time.time()
+    _get_front().set(key, (created_at, recommendations))
+    if _conn is not None:
+        try:
+            await asyncio.to_thread(_db_put, key, orjson.dumps(recommendations), created_at)
+        except sqlite3.Error as e:
+            logger.warning("Failed to persist recommendations", error=str(e))
+
+
+def stats() -> dict:
+    lookups = _counts["hit"] + _counts["miss"]
+    return {
+        "persistent": _conn is not None,
+        "requests": dict(_counts),
+        "hit_ratio": round(_counts["hit"] / lookups, 3) if lookups else None,
+        "front": _get_front().stats(),
+    }
@@ -0,0 +1,715 @@
+"""
+═══════════════════════════════════════════════════════════════
+SESSION BACKENDS — Pluggable storage for agent sessions
+═══════════════════════════════════════════════════════════════
+The session store delegates persistence to a SessionBackend:
+
+  • MemorySessionBackend — in-process LRUStore (single worker)
+  • RedisSessionBackend  — shared store speaking the Redis protocol,
+                           so every uvicorn worker sees the same sessions
+  • SQLiteSessionBackend — durable WAL-mode SQLite with write-behind
+                           batching; survives restarts
+
+Select with SESSION_BACKEND=memory|redis|sqlite. Backends store the
+compact SessionRecord; remote/durable ones serialize it as orjson with
+empty fields omitted and Q&A pairs packed as arrays.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+import orjson
+import structlog
+
+from app.config import get_settings
+from app.models.session import QARecord, SessionRecord, SessionStage
+from app.services.lru_store import LRUStore
+
+if TYPE_CHECKING:
+    from app.services.session_snapshot import SessionSnapshot
+
+logger = structlog.get_logger()
+
+# Rough per-object overheads used by the size estimator (CPython, 64-bit)
+_BASE_SESSION_BYTES = 512
+_PER_ITEM_BYTES = 72
+
+
+def estimate_session_bytes(session: SessionRecord) -> int:
+    """Cheap upper-bound estimate of a session's in-memory footprint."""
+    size = _BASE_SESSION_BYTES
+    for qa in session.questions_answers:
+        size += _PER_ITEM_BYTES + len(qa.question) + len(qa.answer)
+    for question in session.dynamic_questions:
+        size += _PER_ITEM_BYTES + len(question)
+    for recs in (
+        session.recommended_extensions,
+        session.recommended_gpts,
+        session.recommended_companies,
+    ):
+        for rec in recs:
+            size += _PER_ITEM_BYTES + sum(
+                len(str(v)) for v in rec.values()
+            )
+    for msg in session.agent_conversation:
+        size += _PER_ITEM_BYTES + len(msg.get("content", ""))
+    return size
+
+
+# ── Serialization ──────────────────────────────────────────────
+
+
+def serialize_session(session: SessionRecord) -> bytes:
+    """Encode a session as compact JSON bytes (empty fields omitted)."""
+    return orjson.dumps(session.to_dict())
+
+
+def deserialize_session(raw: bytes | str) -> SessionRecord:
+    """Decode bytes produced by serialize_session()."""
+    return SessionRecord.from_dict(orjson.loads(raw))
+
+
+# ── Backend Interface ──────────────────────────────────────────
+
+
+class SessionBackend(ABC):
+    """Storage interface used by app.services.session_store."""
+
+    name: str = "abstract"
+
+    async def start(self) -> None:
+        """Open connections / start background work. Called from lifespan."""
+
+    async def close(self) -> None:
+        """Flush and release resources. Called from lifespan."""
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        """Return the session, or None if unknown or expired."""
+
+    @abstractmethod
+    async def put(
+        self, session: SessionRecord, expected_version: Optional[int] = None
+    ) -> bool:
+        """
+        Insert or replace a session. If `expected_version` is given, the
+        write only succeeds when the stored copy still exists and has that
+        version (compare-and-swap); returns False on a version conflict.
+        """
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> bool:
+        """Remove a session. Returns True if it existed."""
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Backend counters for /health and logging."""
+
+    async def sweep(self, completed_ttl: float, idle_ttl: float) -> dict:
+        """
+        Remove completed sessions older than `completed_ttl` and any session
+        idle longer than `idle_ttl`. Returns {"completed", "idle", "sessions",
+        "bytes"}; backends that expire server-side may return only counts.
+        """
+        return {}
+
+
+async def _sweep_store(
+    store: LRUStore[SessionRecord],
+    completed_ttl: float,
+    idle_ttl: float,
+    on_remove=None,
+) -> dict:
+    """Shared sweep over an LRUStore, yielding to the event loop periodically."""
+    now = time.time()
+    removed = {"completed": 0, "idle": 0}
+    for i, (session_id, session) in enumerate(store.items()):
+        if i % 5000 == 4999:
+            await asyncio.sleep(0)
+        idle_for = now - session.updated_at
+        if session.stage == SessionStage.COMPLETE and idle_for > completed_ttl:
+            reason = "completed"
+        elif idle_ttl and idle_for > idle_ttl:
+            reason = "idle"
+        else:
+            continue
+        store.pop(session_id)
+        if on_remove is not None:
+            on_remove(session_id)
+        removed[reason] += 1
+    return {**removed, "sessions": len(store), "bytes": store.total_bytes}
+
+
+def _version_matches(
+    current: Optional[SessionRecord],
+    session: SessionRecord,
+    expected_version: Optional[int],
+) -> bool:
+    """
+    CAS check for in-process stores (mutating the stored object itself
+    always wins). A session that is gone — deleted, expired or evicted —
+    is a conflict unless this is a plain create (`expected_version` None),
+    so a late write never resurrects it.
+    """
+    return expected_version is None or (
+        current is not None
+        and (current is session or current.version == expected_version)
+    )
+
+
+# ── In-process Backend ─────────────────────────────────────────
+
+
+class MemorySessionBackend(SessionBackend):
+    """
+    Sessions held in this process's LRUStore. Not shared across workers.
+
+    If a snapshot from the previous process is attached, sessions missing
+    from the store are restored from it lazily on first access.
+    """
+
+    name = "memory"
+
+    def __init__(
+        self,
+        max_entries: int,
+        idle_ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        completed_ttl: Optional[float] = None,
+    ):
+        self.completed_ttl = completed_ttl or None
+        self.store: LRUStore[SessionRecord] = LRUStore(
+            max_entries=max_entries,
+            idle_ttl=idle_ttl,
+            max_bytes=max_bytes,
+            sizeof=estimate_session_bytes,
+        )
+        self.snapshot: Optional[SessionSnapshot] = None
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        session = self.store.get(session_id)
+        if session is None and self.snapshot is not None:
+            session = self.snapshot.take(session_id, self.store.idle_ttl, self.completed_ttl)
+            if session is not None:
+                self.store.set(session_id, session)
+        return session
+
+    async def put(
+        self, session: SessionRecord, expected_version: Optional[int] = None
+    ) -> bool:
+        if not _version_matches(self.store.peek(session.session_id), session, expected_version):
+            return False
+        evictions_before = self.store.evictions
+        self.store.set(session.session_id, session)
+        if self.store.evictions > evictions_before:
+            logger.info(
+                "Evicted least-recently-used sessions",
+                evicted=self.store.evictions - evictions_before,
+            )
+        return True
+
+    async def delete(self, session_id: str) -> bool:
+        if self.snapshot is not None:
+            self.snapshot.discard(session_id)
+        return self.store.pop(session_id) is not None
+
+    def stats(self) -> dict:
+        stats = {"backend": self.name, **self.store.stats()}
+        if self.snapshot is not None:
+            stats["snapshot_pending"] = len(self.snapshot)
+            stats["snapshot_restored"] = self.snapshot.restored
+        return stats
+
+    async def sweep(self, completed_ttl: float, idle_ttl: float) -> dict:
+        return await _sweep_store(self.store, completed_ttl, idle_ttl)
+
+
+# ── Shared Redis-protocol Backend ──────────────────────────────
+
+
+class RedisSessionBackend(SessionBackend):
+    """
+    Sessions stored as `<prefix><session_id>` string keys in any server
+    speaking the Redis protocol (Redis, Valkey, KeyDB, Dragonfly).
+
+    Idle TTL is enforced server-side with EX and refreshed on every read
+    via GETEX; completed sessions are written with the shorter
+    `completed_ttl`. Capacity eviction is left to the server's maxmemory
+    policy, so sweep() has nothing to do.
+
+    Args:
+        url: redis:// URL (ignored when `client` is given).
+        idle_ttl: Seconds of inactivity before a session expires.
+        key_prefix: Namespace for session keys.
+        client: Pre-built redis.asyncio-compatible client, e.g. a
+            fakeredis instance for local testing.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        url: str = "",
+        idle_ttl: Optional[int] = None,
+        key_prefix: str = "ikshan:session:",
+        client: Any = None,
+        completed_ttl: Optional[int] = None,
+    ):
+        self.url = url
+        self.idle_ttl = idle_ttl or None
+        self.completed_ttl = completed_ttl or None
+        self.key_prefix = key_prefix
+        self._client = client
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.key_prefix}{session_id}"
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError as e:
+                raise RuntimeError(
+                    "SESSION_BACKEND=redis requires the 'redis' package"
+                ) from e
+            self._client = redis_asyncio.Redis.from_url(self.url)
+        return self._client
+
+    async def start(self) -> None:
+        await self.client.ping()
+        logger.info("Redis session backend connected", prefix=self.key_prefix)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        key = self._key(session_id)
+        if self.idle_ttl:
+            raw = await self.client.getex(key, ex=self.idle_ttl)
+        else:
+            raw = await self.client.get(key)
+
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        session = deserialize_session(raw)
+        if session.stage == SessionStage.COMPLETE and self.completed_ttl:
+            # GETEX refreshed the idle TTL; finished sessions keep the shorter one
+            await self.client.expire(key, self.completed_ttl)
+        return session
+
+    async def put(
+        self, session: SessionRecord, expected_version: Optional[int] = None
+    ) -> bool:
+        key = self._key(session.session_id)
+        payload = serialize_session(session)
+        ttl = self.idle_ttl
+        if session.stage == SessionStage.COMPLETE and self.completed_ttl:
+            ttl = min(ttl or self.completed_ttl, self.completed_ttl)
+
+        if expected_version is None:
+            await self.client.set(key, payload, ex=ttl)
+            return True
+
+        # Optimistic CAS: WATCH the key, check the stored version, then
+        # MULTI/EXEC; a write by another worker in between aborts the EXEC.
+        from redis.exceptions import WatchError
+
+        async with self.client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                raw = await pipe.get(key)
+                # A deleted / expired key is a conflict too: writing would resurrect it
+                if raw is None or orjson.loads(raw).get("version", 0) != expected_version:
+                    await pipe.unwatch()
+                    return False
+                pipe.multi()
+                pipe.set(key, payload, ex=ttl)
+                await pipe.execute()
+                return True
+            except WatchError:
+                return False
+
+    async def delete(self, session_id: str) -> bool:
+        return bool(await self.client.delete(self._key(session_id)))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "idle_ttl": self.idle_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# ── Durable SQLite Backend ─────────────────────────────────────
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    stage      TEXT NOT NULL,
+    state      BLOB NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS session_qa (
+    session_id    TEXT NOT NULL,
+    seq           INTEGER NOT NULL,
+    question      TEXT NOT NULL,
+    answer        TEXT NOT NULL,
+    question_type TEXT NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions(updated_at);
+"""
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """
+    Durable sessions in a WAL-mode SQLite file with write-behind batching.
+
+    Reads and writes hit an in-memory LRUStore; put() only marks the
+    session dirty. A background task flushes dirty sessions every
+    `flush_interval_ms` in a single transaction, so request latency never
+    includes an fsync. Q&A pairs are stored as append-only rows: a flush
+    inserts only the pairs added since the previous flush.
+
+    Args:
+        path: SQLite database file (parent dirs are created).
+        max_entries: Size of the in-memory hot set.
+        idle_ttl: Seconds of inactivity before a session expires.
+        max_bytes: Estimated byte budget for the in-memory hot set.
+        flush_interval_ms: Write-behind flush period.
+        batch_size: Maximum sessions written per transaction.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10_000,
+        idle_ttl: Optional[int] = None,
+        flush_interval_ms: int = 5,
+        batch_size: int = 500,
+        max_bytes: Optional[int] = None,
+    ):
+        self.path = path
+        self.idle_ttl = idle_ttl or None
+        self.flush_interval = max(flush_interval_ms, 1) / 1000
+        self.batch_size = max(batch_size, 1)
+        self.cache: LRUStore[SessionRecord] = LRUStore(
+            max_entries=max_entries,
+            idle_ttl=idle_ttl,
+            max_bytes=max_bytes,
+            sizeof=estimate_session_bytes,
+        )
+
+        self._dirty: dict[str, SessionRecord] = {}
+        self._deleted: set[str] = set()
+        # Q&A records as last written, compared by identity to find the
+        # first changed row (answers can be replaced, not only appended)
+        self._qa_persisted: dict[str, list[QARecord]] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        self.db_loads = 0
+        self.flushes = 0
+        self.rows_written = 0
+
+    # ── Lifecycle ──────────────────────────────────────────────
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SQLITE_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    async def start(self) -> None:
+        await asyncio.to_thread(self._connect)
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+        logger.info("SQLite session backend ready", path=self.path)
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        while self._dirty or self._deleted:
+            await self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ── SessionBackend API ─────────────────────────────────────
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        session = self.cache.get(session_id)
+        if session is not None:
+            return session
+        if session_id in self._deleted:
+            return None
+
+        # Evicted from the hot set but not yet flushed
+        session = self._dirty.get(session_id)
+        if session is None:
+            session = await asyncio.to_thread(self._load, session_id)
+            if session is None:
+                return None
+            self.db_loads += 1
+        self.cache.set(session_id, session)
+        return session
+
+    async def put(
+        self, session: SessionRecord, expected_version: Optional[int] = None
+    ) -> bool:
+        current = self.cache.peek(session.session_id) or self._dirty.get(session.session_id)
+        if not _version_matches(current, session, expected_version):
+            return False
+        self._deleted.discard(session.session_id)
+        self.cache.set(session.session_id, session)
+        self._dirty[session.session_id] = session
+        return True
+
+    async def delete(self, session_id: str) -> bool:
+        existed = self.cache.pop(session_id) is not None
+        existed = self._dirty.pop(session_id, None) is not None or existed
+        self._qa_persisted.pop(session_id, None)
+        self._deleted.add(session_id)
+        return existed
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.name,
+            **self.cache.stats(),
+            "dirty": len(self._dirty),
+            "db_loads": self.db_loads,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+        }
+
+    async def sweep(self, completed_ttl: float, idle_ttl: float) -> dict:
+        def forget(session_id: str) -> None:
+            self._dirty.pop(session_id, None)
+            self._qa_persisted.pop(session_id, None)
+
+        result = await _sweep_store(self.cache, completed_ttl, idle_ttl, forget)
+        on_disk = await asyncio.to_thread(self._sweep_db, completed_ttl, idle_ttl)
+        result["completed"] += on_disk["completed"]
+        result["idle"] += on_disk["idle"]
+        return result
+
+    def _sweep_db(self, completed_ttl: float, idle_ttl: float) -> dict:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            completed = [
+                row[0] for row in conn.execute(
+                    "SELECT session_id FROM sessions WHERE stage = ? AND updated_at < ?",
+                    (SessionStage.COMPLETE.value, now - completed_ttl),
+                )
+            ]
+            idle = [
+                row[0] for row in conn.execute(
+                    "SELECT session_id FROM sessions WHERE updated_at < ?",
+                    (now - idle_ttl,),
+                )
+            ] if idle_ttl else []
+            expired = [
+                (sid,) for sid in set(completed) | set(idle)
+                if sid not in self._dirty
+            ]
+            if expired:
+                conn.execute("BEGIN")
+                try:
+                    conn.executemany("DELETE FROM sessions WHERE session_id = ?", expired)
+                    conn.executemany("DELETE FROM session_qa WHERE session_id = ?", expired)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+        for (sid,) in expired:
+            self._qa_persisted.pop(sid, None)
+        completed_set = set(completed)
+        n_completed = sum(1 for (sid,) in expired if sid in completed_set)
+        return {"completed": n_completed, "idle": len(expired) - n_completed}
+
+    # ── Write-behind ───────────────────────────────────────────
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if not (self._dirty or self._deleted):
+                continue
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("Session flush failed", error=str(e))
+
+    async def flush(self) -> int:
+        """Write one batch of dirty sessions and deletions. Returns sessions written."""
+        batch_ids = list(self._dirty)[: self.batch_size]
+        deleted = list(self._deleted)
+
+        # Serialize on the event loop so the worker thread never sees a
+        # session mid-mutation; only Q&A rows that changed are captured.
+        rows = []
+        previous: dict[str, tuple[SessionRecord, list[QARecord]]] = {}
+        for session_id in batch_ids:
+            session = self._dirty.pop(session_id)
+            qa_list = session.questions_answers
+            persisted = self._qa_persisted.get(session_id, [])
+            start, limit = 0, min(len(persisted), len(qa_list))
+            while start < limit and qa_list[start] is persisted[start]:
+                start += 1
+            qa_rows = [
+                (session_id, seq, qa.question, qa.answer, qa.question_type)
+                for seq, qa in enumerate(qa_list[start:], start)
+            ]
+            state = orjson.dumps(session.to_dict(include_qa=False))
+            truncate_at = len(qa_list) if len(persisted) > len(qa_list) else None
+            rows.append(
+                (session_id, session.stage.value, state, session.updated_at,
+                 qa_rows, truncate_at)
+            )
+            previous[session_id] = (session, persisted)
+            self._qa_persisted[session_id] = list(qa_list)
+        self._deleted.difference_update(deleted)
+
+        try:
+            written = await asyncio.to_thread(self._write_batch, rows, deleted)
+        except Exception:
+            # Re-queue the batch's own sessions so nothing is lost, even if
+            # they have left the cache since; newer dirty versions win and
+            # sessions deleted meanwhile stay deleted
+            for session_id, (session, persisted) in previous.items():
+                if session_id in self._deleted:
+                    continue
+                self._qa_persisted[session_id] = persisted
+                self._dirty.setdefault(session_id, session)
+            self._deleted.update(deleted)
+            raise
+
+        self.flushes += 1
+        self.rows_written += written
+        return len(rows)
+
+    def _write_batch(self, rows: list, deleted: list[str]) -> int:
+        written = 0
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            try:
+                for session_id, stage, state, updated_at, qa_rows, truncate_at in rows:
+                    conn.execute(
+                        "INSERT INTO sessions (session_id, stage, state, updated_at) "
+                        "VALUES (?, ?, ?, ?) ON CONFLICT(session_id) DO UPDATE SET "
+                        "stage = excluded.stage, state = excluded.state, "
+                        "updated_at = excluded.updated_at",
+                        (session_id, stage, state, updated_at),
+                    )
+                    if qa_rows:
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO session_qa "
+                            "(session_id, seq, question, answer, question_type) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            qa_rows,
+                        )
+                    if truncate_at is not None:
+                        conn.execute(
+                            "DELETE FROM session_qa WHERE session_id = ? AND seq >= ?",
+                            (session_id, truncate_at),
+                        )
+                    written += 1 + len(qa_rows)
+                for session_id in deleted:
+                    conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                    conn.execute("DELETE FROM session_qa WHERE session_id = ?", (session_id,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return written
+
+    def _load(self, session_id: str) -> Optional[SessionRecord]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT state, updated_at FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            if self.idle_ttl and time.time() - row[1] > self.idle_ttl:
+                return None
+            qa_rows = conn.execute(
+                "SELECT question, answer, question_type FROM session_qa "
+                "WHERE session_id = ? ORDER BY seq",
+                (session_id,),
+            ).fetchall()
+
+        data = orjson.loads(row[0])
+        data["qa"] = qa_rows
+        session = SessionRecord.from_dict(data)
+        self._qa_persisted[session_id] = list(session.questions_answers)
+        return session
+
+
+# ── Factory ────────────────────────────────────────────────────
+
+
+def build_backend() -> SessionBackend:
+    """Create the backend selected by SESSION_BACKEND."""
+    settings = get_settings()
+    kind = settings.SESSION_BACKEND.lower()
+
+    if kind == "redis":
+        return RedisSessionBackend(
+            url=settings.REDIS_URL,
+            idle_ttl=settings.SESSION_IDLE_TTL_SECONDS,
+            completed_ttl=settings.SESSION_COMPLETED_TTL_SECONDS,
+        )
+
+    if kind == "sqlite":
+        return SQLiteSessionBackend(
+            path=settings.SESSION_SQLITE_PATH,
+            max_entries=settings.SESSION_MAX_ENTRIES,
+            idle_ttl=settings.SESSION_IDLE_TTL_SECONDS,
+            flush_interval_ms=settings.SESSION_FLUSH_INTERVAL_MS,
+            batch_size=settings.SESSION_FLUSH_BATCH_SIZE,
+            max_bytes=settings.SESSION_MAX_BYTES,
+        )
+
+    if kind != "memory":
+        logger.warning("Unknown SESSION_BACKEND, using memory", backend=kind)
+    return MemorySessionBackend(
+        max_entries=settings.SESSION_MAX_ENTRIES,
+        idle_ttl=settings.SESSION_IDLE_TTL_SECONDS,
+        max_bytes=settings.SESSION_MAX_BYTES,
+        completed_ttl=settings.SESSION_COMPLETED_TTL_SECONDS,
+    )
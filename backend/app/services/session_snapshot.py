@@ -0,0 +1,219 @@
+"""
+═══════════════════════════════════════════════════════════════
+SESSION SNAPSHOT — Binary snapshot/restore of in-memory sessions
+═══════════════════════════════════════════════════════════════
+Lets in-flight agent sessions survive a restart of a single-worker
+deployment using the memory backend:
+
+  • on shutdown, every live session is written to a snapshot file
+  • on startup, the file is memory-mapped (O(1), nothing decoded)
+  • a session is decoded only when first requested, via binary search
+    over a sorted fixed-width index
+
+File layout (little-endian):
+  header  : magic "IKSNAP01" | u64 count | u64 index_offset
+  records : serialize_session() bytes, back to back
+  index   : count × (16-byte session UUID | f64 updated_at | u64 offset | u32 length),
+            sorted by UUID bytes
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import structlog
+
+from app.models.session import SessionRecord, SessionStage
+from app.services.session_backends import deserialize_session, serialize_session
+
+logger = structlog.get_logger()
+
+MAGIC = b"IKSNAP01"
+_HEADER = struct.Struct("<8sQQ")
+_INDEX_ENTRY = struct.Struct("<16sdQI")
+
+
+def _uuid_bytes(session_id: str) -> Optional[bytes]:
+    try:
+        return uuid.UUID(session_id).bytes
+    except ValueError:
+        return None
+
+
+def write_snapshot(
+    path: str,
+    sessions: Iterable[SessionRecord],
+    carry_over: Optional["SessionSnapshot"] = None,
+    idle_ttl: Optional[float] = None,
+) -> int:
+    """
+    Atomically write `sessions` (plus any unrestored, unexpired entries of
+    `carry_over`) to `path`. Returns the number of sessions written.
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Unique per writer, so concurrent workers never interleave one tmp file
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=target.name + ".", suffix=".tmp")
+    try:
+        count = _write_records(fd, sessions, carry_over, idle_ttl)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return count
+
+
+def _write_records(
+    fd: int,
+    sessions: Iterable[SessionRecord],
+    carry_over: Optional["SessionSnapshot"],
+    idle_ttl: Optional[float],
+) -> int:
+    now = time.time()
+    index: list[tuple[bytes, float, int, int]] = []
+    seen: set[bytes] = set()
+
+    with os.fdopen(fd, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, 0, 0))
+        offset = _HEADER.size
+
+        for session in sessions:
+            key = _uuid_bytes(session.session_id)
+            if key is None or key in seen:
+                continue
+            payload = serialize_session(session)
+            f.write(payload)
+            index.append((key, session.updated_at, offset, len(payload)))
+            seen.add(key)
+            offset += len(payload)
+
+        if carry_over is not None:
+            for key, updated_at, payload in carry_over.iter_raw():
+                if key in seen or (idle_ttl and now - updated_at > idle_ttl):
+                    continue
+                f.write(payload)
+                index.append((key, updated_at, offset, len(payload)))
+                seen.add(key)
+                offset += len(payload)
+
+        index.sort(key=lambda entry: entry[0])
+        for entry in index:
+            f.write(_INDEX_ENTRY.pack(*entry))
+
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, len(index), offset))
+        f.flush()
+        os.fsync(f.fileno())
+    return len(index)
+
+
+class SessionSnapshot:
+    """
+    Read-only, memory-mapped view of a snapshot file.
+
+    Opening is O(1) regardless of size; get() is an O(log n) binary search
+    plus one record decode. Restored or deleted sessions are tombstoned so
+    they are never handed out twice.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            # e.g. an empty or truncated file
+            self._file.close()
+            raise
+
+        magic, self.count, self._index_offset = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not a session snapshot: {path}")
+        self._tombstones: set[bytes] = set()
+        self.restored = 0
+
+    @classmethod
+    def open(cls, path: str) -> Optional["SessionSnapshot"]:
+        """Open `path` if it exists and is valid, else None."""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning("Ignoring unreadable session snapshot", path=path, error=str(e))
+            return None
+
+    def __len__(self) -> int:
+        return self.count - len(self._tombstones)
+
+    def _entry(self, i: int) -> tuple[bytes, float, int, int]:
+        return _INDEX_ENTRY.unpack_from(
+            self._mm, self._index_offset + i * _INDEX_ENTRY.size
+        )
+
+    def _find(self, key: bytes) -> Optional[tuple[bytes, float, int, int]]:
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = self._entry(mid)
+            if entry[0] < key:
+                lo = mid + 1
+            elif entry[0] > key:
+                hi = mid
+            else:
+                return entry
+        return None
+
+    def take(
+        self,
+        session_id: str,
+        idle_ttl: Optional[float] = None,
+        completed_ttl: Optional[float] = None,
+    ) -> Optional[SessionRecord]:
+        """
+        Decode and tombstone a session; None if absent, taken or expired
+        (completed sessions expire after `completed_ttl` instead).
+        """
+        key = _uuid_bytes(session_id)
+        if key is None or key in self._tombstones:
+            return None
+        entry = self._find(key)
+        if entry is None:
+            return None
+
+        self._tombstones.add(key)
+        _, updated_at, offset, length = entry
+        age = time.time() - updated_at
+        if idle_ttl and age > idle_ttl:
+            return None
+        session = deserialize_session(self._mm[offset:offset + length])
+        if session.stage == SessionStage.COMPLETE and completed_ttl and age > completed_ttl:
+            return None
+        self.restored += 1
+        return session
+
+    def discard(self, session_id: str) -> None:
+        """Tombstone a session so it is never restored (e.g. deleted)."""
+        key = _uuid_bytes(session_id)
+        # Only ids in the index: __len__ counts tombstones against `count`
+        if key is not None and key not in self._tombstones and self._find(key) is not None:
+            self._tombstones.add(key)
+
+    def iter_raw(self) -> Iterator[tuple[bytes, float, bytes]]:
+        """Yield (uuid bytes, updated_at, payload) for every live entry."""
+        for i in range(self.count):
+            key, updated_at, offset, length = self._entry(i)
+            if key not in self._tombstones:
+                yield key, updated_at, self._mm[offset:offset + length]
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
@@ -1,175 +1,391 @@
 """
 ═══════════════════════════════════════════════════════════════
-SESSION STORE — In-memory session context management
+SESSION STORE — Session context management
 ═══════════════════════════════════════════════════════════════
-Stores and manages chat session contexts in memory.
+Stores and manages chat session contexts.
 Each session preserves the full flow: Q1-Q3, dynamic questions,
 answers, persona context, and recommendations.
 
-NOTE: In production, replace this with Redis or a database.
+Storage is delegated to a pluggable SessionBackend (see
+session_backends.py): an in-process LRUStore by default, or a shared
+Redis-protocol store so every uvicorn worker sees the same sessions.
+With the memory backend, sessions are snapshotted on shutdown and
+restored lazily after the next startup (see session_snapshot.py).
 """
 
 from __future__ import annotations
 
+import asyncio
+import time
 import uuid
-from datetime import datetime
-from typing import Optional
+import weakref
+from datetime import datetime, timezone
+from typing import Callable, Optional
 
 import structlog
 
-from app.models.session import QuestionAnswer, SessionContext, SessionStage
+from app.config import get_settings
+from app.models.session import QARecord, SessionRecord, SessionStage
+from app.services import metrics
+from app.utils.interning import intern_text, register_canonical
+from app.services.session_backends import (
+    MemorySessionBackend,
+    SessionBackend,
+    build_backend,
+)
+from app.services.session_snapshot import SessionSnapshot, write_snapshot
 
 logger = structlog.get_logger()
 
-# In-memory session store (replace with Redis/DB in production)
-_sessions: dict[str, SessionContext] = {}
+# Static Q1-Q3 question texts (shared by every session)
+Q1_OUTCOME = "What matters most to you right now?"
+Q2_DOMAIN = "Which domain best matches your need?"
+Q3_TASK = "What task would you like help with?"
+register_canonical(Q1_OUTCOME, Q2_DOMAIN, Q3_TASK)
+
+# Active storage backend (built lazily from settings, or set in lifespan)
+_backend: Optional[SessionBackend] = None
+
+
+def get_backend() -> SessionBackend:
+    """Return the active backend, building it from settings on first use."""
+    global _backend
+    if _backend is None:
+        _backend = build_backend()
+    return _backend
+
+
+async def init_backend(backend: Optional[SessionBackend] = None) -> SessionBackend:
+    """Install (or build) the backend and start it. Called from lifespan."""
+    global _backend
+    if backend is not None:
+        _backend = backend
+    active = get_backend()
+    await active.start()
+    logger.info("Session backend ready", backend=active.name)
+    return active
+
+
+async def close_backend() -> None:
+    """Flush and release the active backend. Called from lifespan."""
+    global _backend
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
+
+
+async def restore_snapshot() -> int:
+    """
+    Memory-map the previous process's snapshot so its sessions can be
+    restored lazily on first access. Called from lifespan after
+    init_backend(). Returns the number of sessions available.
+    """
+    backend = get_backend()
+    path = get_settings().SESSION_SNAPSHOT_PATH
+    if not path or not isinstance(backend, MemorySessionBackend):
+        return 0
+
+    snapshot = SessionSnapshot.open(path)
+    if snapshot is None:
+        return 0
+    backend.snapshot = snapshot
+    logger.info("Session snapshot mapped", path=path, sessions=snapshot.count)
+    return snapshot.count
+
+
+async def save_snapshot() -> int:
+    """
+    Write every live session (plus unrestored ones from the previous
+    snapshot) to SESSION_SNAPSHOT_PATH. Called from lifespan on shutdown.
+    Returns the number of sessions written.
+    """
+    backend = get_backend()
+    path = get_settings().SESSION_SNAPSHOT_PATH
+    if not path or not isinstance(backend, MemorySessionBackend):
+        return 0
+
+    idle_ttl = backend.store.idle_ttl
+    now = time.time()
+    sessions = [
+        session for _, session in backend.store.items()
+        if not idle_ttl or now - session.updated_at <= idle_ttl
+    ]
+    previous = backend.snapshot
+
+    start = time.perf_counter()
+    written = await asyncio.to_thread(
+        write_snapshot, path, sessions, previous, idle_ttl
+    )
+    if previous is not None:
+        previous.close()
+        backend.snapshot = None
+
+    logger.info(
+        "Session snapshot written",
+        path=path,
+        sessions=written,
+        duration_ms=round((time.perf_counter() - start) * 1000, 1),
+    )
+    return written
+
+
+async def sweep_sessions() -> dict:
+    """
+    Reclaim completed and idle sessions, then publish gauges:
+    sessions_active, sessions_bytes, session_sweep_duration_seconds and the
+    sessions_swept_total{reason} counter.
+    """
+    settings = get_settings()
+    start = time.perf_counter()
+    result = await get_backend().sweep(
+        completed_ttl=settings.SESSION_COMPLETED_TTL_SECONDS,
+        idle_ttl=settings.SESSION_IDLE_TTL_SECONDS,
+    )
+    duration = time.perf_counter() - start
+
+    for reason in ("completed", "idle"):
+        if result.get(reason):
+            metrics.inc("sessions_swept_total", result[reason], reason=reason)
+    if "sessions" in result:
+        metrics.set_gauge("sessions_active", result["sessions"])
+        metrics.set_gauge("sessions_bytes", result["bytes"])
+    metrics.set_gauge("session_sweep_duration_seconds", duration)
+
+    if result.get("completed") or result.get("idle"):
+        logger.info(
+            "Session sweep",
+            duration_ms=round(duration * 1000, 1),
+            **result,
+        )
+    return result
 
-# Max sessions to keep in memory (LRU eviction)
-MAX_SESSIONS = 1000
 
+async def run_sweeper() -> None:
+    """Sweep every SESSION_SWEEP_INTERVAL_SECONDS until cancelled (lifespan task)."""
+    interval = max(get_settings().SESSION_SWEEP_INTERVAL_SECONDS, 1)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await sweep_sessions()
+        except Exception as e:
+            logger.error("Session sweep failed", error=str(e))
 
-def create_session() -> SessionContext:
+
+async def create_session() -> SessionRecord:
     """Create a new session with a unique ID."""
     session_id = str(uuid.uuid4())
-    session = SessionContext(session_id=session_id)
-
-    # Evict oldest sessions if at capacity
-    if len(_sessions) >= MAX_SESSIONS:
-        oldest_id = min(_sessions, key=lambda k: _sessions[k].created_at)
-        del _sessions[oldest_id]
-        logger.info("Evicted oldest session", session_id=oldest_id)
+    session = SessionRecord(session_id=session_id)
 
-    _sessions[session_id] = session
+    await get_backend().put(session)
     logger.info("Session created", session_id=session_id)
     return session
 
 
-def get_session(session_id: str) -> Optional[SessionContext]:
-    """Retrieve a session by ID."""
-    return _sessions.get(session_id)
+async def get_session(session_id: str) -> Optional[SessionRecord]:
+    """Retrieve a session by ID (None if unknown or expired)."""
+    return await get_backend().get(session_id)
+
 
+async def update_session(
+    session: SessionRecord, expected_version: Optional[int] = None
+) -> SessionRecord:
+    """
+    Write a session back, bumping its version.
 
-def update_session(session: SessionContext) -> SessionContext:
-    """Update a session in the store."""
-    session.updated_at = datetime.utcnow()
-    _sessions[session.session_id] = session
+    The write is a compare-and-swap against `expected_version` (defaults
+    to the session's current version): if another worker committed in the
+    meantime, SessionConflictError is raised instead of losing its update.
+    """
+    if expected_version is None:
+        expected_version = session.version
+    session.version = expected_version + 1
+    session.updated_at = time.time()
+    if not await get_backend().put(session, expected_version):
+        raise SessionConflictError(session.session_id)
     return session
 
 
-def delete_session(session_id: str) -> bool:
+async def delete_session(session_id: str) -> bool:
     """Delete a session."""
-    if session_id in _sessions:
-        del _sessions[session_id]
-        return True
-    return False
+    async with _lock_for(session_id):
+        return await get_backend().delete(session_id)
+
+
+def get_store_stats() -> dict:
+    """Hit / miss / eviction counters and current size of the store."""
+    return get_backend().stats()
+
+
+# ── Concurrency-safe Mutation ──────────────────────────────────
+
+
+class SessionConflictError(Exception):
+    """A session kept changing underneath a mutation (concurrent writers)."""
 
 
-def set_outcome(session_id: str, outcome: str, outcome_label: str) -> Optional[SessionContext]:
+# Attempts per mutation before giving up on a contended session
+MAX_MUTATION_ATTEMPTS = 5
+
+# One asyncio.Lock per session currently being mutated in this process;
+# entries vanish once no coroutine holds or awaits the lock.
+_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def _lock_for(session_id: str) -> asyncio.Lock:
+    lock = _locks.get(session_id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _locks[session_id] = lock
+    return lock
+
+
+async def _mutate(
+    session_id: str, mutator: Callable[[SessionRecord], None]
+) -> Optional[SessionRecord]:
+    """
+    Read-modify-write a session safely.
+
+    Writers in this process are serialized by a per-session lock (no global
+    lock). Writers in other processes are detected by the version CAS in
+    update_session(); on conflict the session is re-read and `mutator`
+    re-applied.
+    """
+    async with _lock_for(session_id):
+        for attempt in range(MAX_MUTATION_ATTEMPTS):
+            session = await get_backend().get(session_id)
+            if session is None:
+                return None
+            expected_version = session.version
+            mutator(session)
+            try:
+                return await update_session(session, expected_version)
+            except SessionConflictError:
+                logger.info(
+                    "Session version conflict, retrying",
+                    session_id=session_id,
+                    attempt=attempt + 1,
+                )
+    raise SessionConflictError(session_id)
+
+
+# ── Flow Mutations ─────────────────────────────────────────────
+
+
+async def set_outcome(session_id: str, outcome: str, outcome_label: str) -> Optional[SessionRecord]:
     """Set the Q1 answer (outcome/growth bucket)."""
-    session = get_session(session_id)
-    if not session:
-        return None
+    def apply(session: SessionRecord) -> None:
+        session.outcome = intern_text(outcome)
+        session.outcome_label = intern_text(outcome_label)
+        session.stage = SessionStage.DOMAIN
+        _set_static_answer(session, Q1_OUTCOME, session.outcome_label)
 
-    session.outcome = outcome
-    session.outcome_label = outcome_label
-    session.stage = SessionStage.DOMAIN
-    session.questions_answers.append(
-        QuestionAnswer(
-            question="What matters most to you right now?",
-            answer=outcome_label,
-            question_type="static",
-        )
-    )
-    return update_session(session)
+    return await _mutate(session_id, apply)
 
 
-def set_domain(session_id: str, domain: str) -> Optional[SessionContext]:
+async def set_domain(session_id: str, domain: str) -> Optional[SessionRecord]:
     """Set the Q2 answer (domain/sub-category)."""
-    session = get_session(session_id)
-    if not session:
-        return None
+    def apply(session: SessionRecord) -> None:
+        session.domain = intern_text(domain)
+        session.stage = SessionStage.TASK
+        _set_static_answer(session, Q2_DOMAIN, session.domain)
 
-    session.domain = domain
-    session.stage = SessionStage.TASK
-    session.questions_answers.append(
-        QuestionAnswer(
-            question="Which domain best matches your need?",
-            answer=domain,
-            question_type="static",
-        )
-    )
-    return update_session(session)
+    return await _mutate(session_id, apply)
 
 
-def set_task(session_id: str, task: str) -> Optional[SessionContext]:
+async def set_task(session_id: str, task: str) -> Optional[SessionRecord]:
     """Set the Q3 answer (task). Moves to dynamic questions stage."""
-    session = get_session(session_id)
-    if not session:
-        return None
+    def apply(session: SessionRecord) -> None:
+        session.task = intern_text(task)
+        session.stage = SessionStage.DYNAMIC_QUESTIONS
+        _set_static_answer(session, Q3_TASK, session.task)
 
-    session.task = task
-    session.stage = SessionStage.DYNAMIC_QUESTIONS
-    session.questions_answers.append(
-        QuestionAnswer(
-            question="What task would you like help with?",
-            answer=task,
-            question_type="static",
-        )
-    )
-    return update_session(session)
+    return await _mutate(session_id, apply)
 
 
-def add_dynamic_answer(
-    session_id: str, question: str, answer: str
-) -> Optional[SessionContext]:
-    """Record a dynamic question answer."""
-    session = get_session(session_id)
-    if not session:
-        return None
+async def set_dynamic_questions(
+    session_id: str,
+    questions: list[str],
+    persona_doc_name: Optional[str],
+) -> Optional[SessionRecord]:
+    """Store the diagnostic questions generated after Q3 (replaces any previous set)."""
+    def apply(session: SessionRecord) -> None:
+        session.persona_doc_name = persona_doc_name
+        session.persona_context_loaded = persona_doc_name is not None
+        session.dynamic_questions = [intern_text(q) for q in questions]
+        session.dynamic_questions_total = len(questions)
 
-    session.questions_answers.append(
-        QuestionAnswer(
-            question=question,
-            answer=answer,
-            question_type="dynamic",
-        )
-    )
-    session.dynamic_questions_asked += 1
+    return await _mutate(session_id, apply)
+
+
+async def add_dynamic_answer(
+    session_id: str, question_index: int, answer: str
+) -> Optional[SessionRecord]:
+    """
+    Record the answer to dynamic question `question_index`.
+
+    Re-submitting an already answered index (double click, client retry)
+    replaces that answer instead of recording it twice.
+
+    Raises:
+        ValueError: if `question_index` is out of range.
+    """
+    def apply(session: SessionRecord) -> None:
+        if not 0 <= question_index < len(session.dynamic_questions):
+            raise ValueError("Invalid question index")
 
-    # If all dynamic questions answered, move to recommendation
-    if session.dynamic_questions_asked >= session.dynamic_questions_total:
-        session.stage = SessionStage.RECOMMENDATION
+        question = session.dynamic_questions[question_index]
+        record = QARecord(question, intern_text(answer), "dynamic")
+        for i, qa in enumerate(session.questions_answers):
+            if qa.question_type == "dynamic" and qa.question == question:
+                session.questions_answers[i] = record
+                return
 
-    return update_session(session)
+        session.questions_answers.append(record)
+        session.dynamic_questions_asked += 1
 
+        # If all dynamic questions answered, move to recommendation
+        if session.dynamic_questions_asked >= session.dynamic_questions_total:
+            session.stage = SessionStage.RECOMMENDATION
 
-def set_recommendations(
+    return await _mutate(session_id, apply)
+
+
+async def set_recommendations(
     session_id: str,
     extensions: list[dict],
     gpts: list[dict],
     companies: list[dict],
-) -> Optional[SessionContext]:
+) -> Optional[SessionRecord]:
     """Store the final recommendations in the session."""
-    session = get_session(session_id)
-    if not session:
-        return None
+    def apply(session: SessionRecord) -> None:
+        session.recommended_extensions = extensions
+        session.recommended_gpts = gpts
+        session.recommended_companies = companies
+        session.stage = SessionStage.COMPLETE
+
+    return await _mutate(session_id, apply)
+
 
-    session.recommended_extensions = extensions
-    session.recommended_gpts = gpts
-    session.recommended_companies = companies
-    session.stage = SessionStage.COMPLETE
-    return update_session(session)
+def _set_static_answer(session: SessionRecord, question: str, answer: str) -> None:
+    """Record a Q1-Q3 answer, replacing an earlier answer to the same question."""
+    for i, qa in enumerate(session.questions_answers):
+        if qa.question is question or qa.question == question:
+            session.questions_answers[i] = QARecord(question, answer, "static")
+            return
+    session.questions_answers.append(QARecord(question, answer, "static"))
 
 
-def get_session_summary(session_id: str) -> Optional[dict]:
+async def get_session_summary(session_id: str) -> Optional[dict]:
     """Get a summary of the full session context."""
-    session = get_session(session_id)
+    session = await get_session(session_id)
     if not session:
         return None
 
     return {
         "session_id": session.session_id,
-        "created_at": session.created_at.isoformat(),
+        "created_at": datetime.fromtimestamp(
+            session.created_at, tz=timezone.utc
+        ).isoformat(),
         "stage": session.stage.value,
         "outcome": session.outcome_label,
         "domain": session.domain,
@@ -18,7 +18,10 @@ import httpx
 import structlog
 
 from app.config import get_settings
-from app.services import openai_service
+from app.services import metrics, openai_service
+from app.services.llm_resilience import LLMDeadlineExceeded
+from app.services.llm_scheduler import LLMOverloadedError
+from app.services.single_flight import SingleFlight
 
 logger = structlog.get_logger()
 
@@ -82,7 +85,7 @@ HEADER_INDICATORS = [
 
 def _build_csv_url(sheet_id: str, sheet_name: str | None = None) -> str:
     """Build Google Sheets CSV export URL."""
-    base = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv"
+    base = f"{get_settings().GOOGLE_SHEETS_BASE_URL}/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv"
     if sheet_name:
         base += f"&sheet={httpx.URL(sheet_name)}"
     return base
@@ -136,12 +139,22 @@ def _get_column_value(row: list[str], headers: list[str], possible_names: list[s
     return ""
 
 
+# Concurrent fetches of the same sheet / domain share one upstream call
+_csv_flight: SingleFlight[str] = SingleFlight("sheets_csv")
+_domain_flight: SingleFlight[dict] = SingleFlight("companies_by_domain")
+
+
+async def _download_csv(url: str) -> str:
+    with metrics.track("upstream_request", upstream="google_sheets", **metrics.request_labels()):
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.get(url)
+            response.raise_for_status()
+            return response.text
+
+
 async def _fetch_csv(url: str) -> str:
     """Fetch CSV text from a URL."""
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(url)
-        response.raise_for_status()
-        return response.text
+    return await _csv_flight.do(url, lambda: _download_csv(url))
 
 
 # ── Public API ─────────────────────────────────────────────────
@@ -156,10 +169,16 @@ async def fetch_companies_by_domain(domain: str | None = None) -> dict:
         domain: Domain slug (e.g., 'social-media', 'legal'). Defaults to 'Social media'.
 
     Returns:
-        dict with 'success', 'count', and 'companies' list.
+        dict with 'success', 'count', and 'companies' list (shared between
+        coalesced callers — do not mutate).
     """
     sheet_name = DOMAIN_TO_SHEET.get(domain or "", "Social media")
-    url = f"https://docs.google.com/spreadsheets/d/{DOMAIN_SHEET_ID}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
+    return await _domain_flight.do(sheet_name, lambda: _load_domain_companies(domain, sheet_name))
+
+
+async def _load_domain_companies(domain: str | None, sheet_name: str) -> dict:
+    """Fetch and parse one domain tab (run once per burst by fetch_companies_by_domain)."""
+    url = f"{get_settings().GOOGLE_SHEETS_BASE_URL}/spreadsheets/d/{DOMAIN_SHEET_ID}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
 
     try:
         csv_text = await _fetch_csv(url)
@@ -221,7 +240,7 @@ async def search_companies(
     Returns:
         dict with matched companies, explanations, and metadata.
     """
-    url = f"https://docs.google.com/spreadsheets/d/{CONSOLIDATED_SHEET_ID}/gviz/tq?tqx=out:csv"
+    url = f"{get_settings().GOOGLE_SHEETS_BASE_URL}/spreadsheets/d/{CONSOLIDATED_SHEET_ID}/gviz/tq?tqx=out:csv"
 
     try:
         csv_text = await _fetch_csv(url)
@@ -393,6 +412,8 @@ Return EXACTLY this JSON format:
             "userRequirement": requirement,
         }
 
+    except (LLMOverloadedError, LLMDeadlineExceeded):
+        raise
     except Exception as e:
         logger.error("Company search failed", error=str(e))
         return {"success": False, "companies": [], "error": str(e)}
@@ -0,0 +1,69 @@
+"""
+═══════════════════════════════════════════════════════════════
+SINGLE FLIGHT — Coalesce identical in-flight async calls
+═══════════════════════════════════════════════════════════════
+When a burst of requests asks for the same thing at once (a popular
+domain's company sheet, the same search prompt, the same Q&A for
+recommendations), only the first caller runs the upstream call; every
+concurrent caller with the same key awaits that one shared task.
+
+  • keys live only while the call is in flight — this is coalescing,
+    not caching, so results are never stale
+  • results and exceptions are delivered to every waiter, so shared
+    results must be treated as read-only
+  • a waiter that is cancelled (client went away) does not cancel the
+    shared call for the others
+  • coalesced callers are counted in single_flight_coalesced_total
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+import orjson
+
+from app.services import metrics
+
+T = TypeVar("T")
+
+
+def make_key(*parts: Any) -> str:
+    """Stable hash of JSON-serializable call arguments."""
+    return hashlib.sha256(orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+class SingleFlight(Generic[T]):
+    """
+    One in-flight call per key within a named group.
+
+    Args:
+        group: Label for metrics (e.g. "company_search").
+    """
+
+    def __init__(self, group: str):
+        self.group = group
+        self._calls: dict[str, asyncio.Future[T]] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn()` unless a call for `key` is already in flight; share its result."""
+        call = self._calls.get(key)
+        if call is not None:
+            metrics.inc("single_flight_coalesced_total", group=self.group)
+        else:
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            call.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(call)
+
+    def _finish(self, key: str, call: asyncio.Future[T]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark the error retrieved even if every waiter was cancelled
+        if not call.cancelled():
+            call.exception()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
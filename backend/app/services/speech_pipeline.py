@@ -0,0 +1,130 @@
+"""
+═══════════════════════════════════════════════════════════════
+SPEECH PIPELINE — Sentence-pipelined streaming TTS
+═══════════════════════════════════════════════════════════════
+Instead of translate → synthesize → buffer the whole MP3 → respond,
+the text is split into sentences and processed as a pipeline:
+
+  • sentences are translated concurrently (Hindi only): the first one
+    on its own for a fast start, the rest together in one batch call
+  • sentence 1 is synthesized as soon as its translation lands, while
+    later sentences are still translating
+  • MP3 chunks are yielded strictly in sentence order as each completes
+
+Each sentence is cached individually in the TTS disk cache, so common
+sentences are reused across different messages.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import AsyncIterator, Optional
+
+import structlog
+
+from app.config import get_settings
+from app.services import openai_service, tts_cache
+
+logger = structlog.get_logger()
+
+# Split after sentence-ending punctuation (incl. Devanagari danda) + whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?।])\s+")
+
+# Fragments shorter than this are merged into the following sentence
+MIN_SENTENCE_CHARS = 40
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split `text` into sentences, merging very short fragments."""
+    sentences: list[str] = []
+    pending = ""
+    for part in _SENTENCE_END.split(tts_cache.normalize_text(text)):
+        pending = f"{pending} {part}".strip() if pending else part
+        if len(pending) >= MIN_SENTENCE_CHARS:
+            sentences.append(pending)
+            pending = ""
+    if pending:
+        if sentences and len(pending) < MIN_SENTENCE_CHARS:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+    return sentences
+
+
+async def stream_speech(text: str, language: str = "english") -> AsyncIterator[bytes]:
+    """
+    Yield MP3 audio for `text` one sentence at a time, in order.
+
+    Closing the generator early (client disconnect) cancels any
+    translation / synthesis still in flight.
+    """
+    speed = openai_service.tts_speed(language)
+    voice = openai_service.TTS_VOICE
+    synth_slots = asyncio.Semaphore(get_settings().TTS_PIPELINE_CONCURRENCY)
+
+    sentences = split_sentences(text)
+    keys = [tts_cache.cache_key(s, language, voice, speed) for s in sentences]
+    cached = [tts_cache.lookup(key) for key in keys]
+
+    # Only sentences without cached audio need translating: the first of
+    # them alone (fast start), the rest in a single batch call
+    to_translate = [i for i, path in enumerate(cached) if path is None]
+    translations: dict[int, asyncio.Future] = {}
+    batch: Optional[asyncio.Future] = None
+    if language == "hindi" and to_translate:
+        head, rest = to_translate[0], to_translate[1:]
+        translations[head] = asyncio.ensure_future(
+            openai_service.translate_text(sentences[head], target_language="hindi")
+        )
+        if rest:
+            batch = asyncio.ensure_future(
+                openai_service.translate_batch([sentences[i] for i in rest], target_language="hindi")
+            )
+            for position, i in enumerate(rest):
+                translations[i] = _pick(batch, position)
+
+    async def render(i: int) -> bytes:
+        if cached[i] is not None:
+            try:
+                return await asyncio.to_thread(cached[i].read_bytes)
+            except FileNotFoundError:
+                # Evicted since lookup — synthesize it after all
+                pass
+
+        if i in translations:
+            text_to_speak = await translations[i]
+        elif language == "hindi":
+            text_to_speak = await openai_service.translate_text(sentences[i], target_language="hindi")
+        else:
+            text_to_speak = sentences[i]
+        async with synth_slots:
+            audio = await openai_service.synthesize_speech(text_to_speak, speed=speed)
+        try:
+            await tts_cache.store(keys[i], audio)
+        except OSError as e:
+            logger.warning("Failed to cache TTS sentence", error=str(e))
+        return audio
+
+    renders = [asyncio.create_task(render(i)) for i in range(len(sentences))]
+
+    logger.info(
+        "Pipelined TTS started",
+        language=language,
+        sentences=len(sentences),
+        cached=len(sentences) - len(to_translate),
+    )
+    try:
+        for task in renders:
+            yield await task
+    finally:
+        for task in (*renders, *translations.values(), *([batch] if batch else [])):
+            task.cancel()
+
+
+def _pick(batch: asyncio.Future, position: int) -> asyncio.Future:
+    """Future resolving to item `position` of `batch`'s result."""
+    async def pick() -> str:
+        return (await asyncio.shield(batch))[position]
+
+    return asyncio.ensure_future(pick())
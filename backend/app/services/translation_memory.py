@@ -0,0 +1,178 @@
+"""
+═══════════════════════════════════════════════════════════════
+TRANSLATION MEMORY — Persistent cache of LLM translations
+═══════════════════════════════════════════════════════════════
+The bot's canned phrases repeat heavily, so every translation is
+remembered and reused:
+
+  • keyed by (SHA-256 of the whitespace-normalized source, target language)
+  • in-memory LRUStore front for microsecond lookups
+  • SQLite (WAL) behind it, so the memory survives restarts and is
+    shared by every worker on the host
+
+With TRANSLATION_MEMORY_PATH="" only the in-memory front is used.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import structlog
+
+from app.config import get_settings
+from app.services import metrics
+from app.services.lru_store import LRUStore
+
+logger = structlog.get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    source_hash TEXT NOT NULL,
+    target      TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    PRIMARY KEY (source_hash, target)
+) WITHOUT ROWID;
+"""
+
+_front: Optional[LRUStore[str]] = None
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+
+
+def normalize_source(text: str) -> str:
+    return " ".join(text.split())
+
+
+def source_hash(text: str) -> str:
+    return hashlib.sha256(normalize_source(text).encode("utf-8")).hexdigest()
+
+
+def _get_front() -> LRUStore[str]:
+    global _front
+    if _front is None:
+        _front = LRUStore(max_entries=get_settings().TRANSLATION_MEMORY_MAX_ENTRIES)
+    return _front
+
+
+# ── Lifecycle ──────────────────────────────────────────────────
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+async def init_memory() -> None:
+    """Open the SQLite store (no-op when TRANSLATION_MEMORY_PATH is empty)."""
+    global _conn
+    path = get_settings().TRANSLATION_MEMORY_PATH
+    _get_front()
+    if not path or _conn is not None:
+        return
+    _conn = await asyncio.to_thread(_connect, path)
+    logger.info("Translation memory ready", path=path)
+
+
+async def close_memory() -> None:
+    global _conn
+    if _conn is not None:
+        with _lock:
+            _conn.close()
+        _conn = None
+
+
+# ── Lookup / Store ─────────────────────────────────────────────
+
+
+def _db_get_many(keys: list[tuple[str, str]]) -> dict[tuple[str, str], str]:
+    found: dict[tuple[str, str], str] = {}
+    with _lock:
+        for digest, target in keys:
+            row = _conn.execute(
+                "SELECT translation FROM translations WHERE source_hash = ? AND target = ?",
+                (digest, target),
+            ).fetchone()
+            if row is not None:
+                found[(digest, target)] = row[0]
+    return found
+
+
+def _db_put_many(rows: list[tuple[str, str, str, str, float]]) -> None:
+    with _lock:
+        _conn.execute("BEGIN")
+        try:
+            _conn.executemany(
+                "INSERT OR REPLACE INTO translations "
+                "(source_hash, target, source, translation, created_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            _conn.execute("COMMIT")
+        except Exception:
+            _conn.execute("ROLLBACK")
+            raise
+
+
+async def lookup_many(texts: list[str], target: str) -> list[Optional[str]]:
+    """Remembered translations of `texts` into `target` (None where unknown)."""
+    front = _get_front()
+    digests = [source_hash(text) for text in texts]
+    results: list[Optional[str]] = [front.get(f"{target}:{d}") for d in digests]
+
+    missing = [(d, target) for d, r in zip(digests, results) if r is None]
+    if missing and _conn is not None:
+        found = await asyncio.to_thread(_db_get_many, missing)
+        for i, digest in enumerate(digests):
+            translation = found.get((digest, target))
+            if results[i] is None and translation is not None:
+                front.set(f"{target}:{digest}", translation)
+                results[i] = translation
+
+    hits = sum(r is not None for r in results)
+    if hits:
+        metrics.inc("translation_memory_requests_total", hits, result="hit", target=target)
+    if len(results) - hits:
+        metrics.inc(
+            "translation_memory_requests_total", len(results) - hits, result="miss", target=target
+        )
+    return results
+
+
+async def lookup(text: str, target: str) -> Optional[str]:
+    return (await lookup_many([text], target))[0]
+
+
+async def remember_many(pairs: list[tuple[str, str]], target: str) -> None:
+    """Store (source, translation) pairs for `target`."""
+    front = _get_front()
+    now = time.time()
+    rows = []
+    for source, translation in pairs:
+        digest = source_hash(source)
+        front.set(f"{target}:{digest}", translation)
+        rows.append((digest, target, normalize_source(source), translation, now))
+
+    if rows and _conn is not None:
+        try:
+            await asyncio.to_thread(_db_put_many, rows)
+        except sqlite3.Error as e:
+            logger.warning("Failed to persist translations", error=str(e))
+
+
+async def remember(source: str, translation: str, target: str) -> None:
+    await remember_many([(source, translation)], target)
+
+
+def stats() -> dict:
+    return {"persistent": _conn is not None, **_get_front().stats()}
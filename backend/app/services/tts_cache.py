@@ -0,0 +1,172 @@
+"""
+═══════════════════════════════════════════════════════════════
+TTS CACHE — Content-addressed, disk-backed MP3 cache
+═══════════════════════════════════════════════════════════════
+Synthesized speech is stored on local disk under a SHA-256 of
+(normalized text, language, voice, speed), so a bot message replayed
+by many users is translated and synthesized once:
+
+  • files live at <TTS_CACHE_DIR>/<2 hex>/<64 hex>.mp3 and are written
+    atomically (uniquely named tmp file + rename)
+  • an in-memory LRU index tracks file sizes and recency, bounded by
+    TTS_CACHE_MAX_BYTES; evicted entries are unlinked
+  • on startup the index is rebuilt from a directory scan, oldest
+    mtime first; hits bump the mtime so recency survives restarts
+
+The index is per process: with several workers sharing one directory
+each enforces TTS_CACHE_MAX_BYTES on its own view, so disk usage can
+reach workers × budget — size the budget accordingly. A worker may
+also unlink a file another worker still has indexed; lookup() treats a
+vanished file as a miss, and callers re-check it before serving.
+
+The key doubles as a strong ETag, and hits are served straight from
+the file (sendfile) without reading the audio into Python.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+import time
+import unicodedata
+from pathlib import Path
+from typing import Optional
+
+import structlog
+
+from app.config import get_settings
+from app.services import metrics
+from app.services.lru_store import LRUStore
+
+logger = structlog.get_logger()
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Leftover tmp files older than this are from a crashed write, not a live one
+_STALE_TMP_SECONDS = 3600
+
+_root: Optional[Path] = None
+_index: Optional[LRUStore[int]] = None
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for keying: NFC, collapsed whitespace, trimmed."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(text: str, language: str, voice: str, speed: float) -> str:
+    """SHA-256 hex digest identifying one rendition of `text`."""
+    material = "\0".join((normalize_text(text), language.lower(), voice, f"{speed:.3f}"))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def is_enabled() -> bool:
+    return bool(get_settings().TTS_CACHE_DIR)
+
+
+def _path_for(key: str) -> Path:
+    return _root / key[:2] / f"{key}.mp3"
+
+
+def _unlink_evicted(key: str, size: int) -> None:
+    try:
+        _path_for(key).unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning("Failed to delete evicted TTS file", key=key, error=str(e))
+
+
+def _scan(root: Path) -> list[tuple[float, str, int]]:
+    entries = []
+    for path in root.glob("??/*.mp3"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, path.stem, stat.st_size))
+    cutoff = time.time() - _STALE_TMP_SECONDS
+    for tmp in root.glob("??/*.tmp"):
+        try:
+            if tmp.stat().st_mtime < cutoff:
+                tmp.unlink(missing_ok=True)
+        except OSError:
+            continue
+    entries.sort()
+    return entries
+
+
+async def init_cache() -> None:
+    """Rebuild the index from the cache directory (no-op when disabled)."""
+    global _root, _index
+    settings = get_settings()
+    if not settings.TTS_CACHE_DIR:
+        return
+
+    _root = Path(settings.TTS_CACHE_DIR)
+    _root.mkdir(parents=True, exist_ok=True)
+    _index = LRUStore(
+        max_entries=settings.TTS_CACHE_MAX_ENTRIES,
+        max_bytes=settings.TTS_CACHE_MAX_BYTES,
+        sizeof=lambda size: size,
+        on_evict=_unlink_evicted,
+    )
+
+    for _, key, size in await asyncio.to_thread(_scan, _root):
+        _index.set(key, size)
+    logger.info(
+        "TTS cache index loaded",
+        path=str(_root),
+        entries=len(_index),
+        bytes=_index.total_bytes,
+    )
+
+
+def lookup(key: str) -> Optional[Path]:
+    """Path of the cached MP3 for `key`, or None on a miss."""
+    if _index is None:
+        return None
+    if _index.get(key) is None:
+        metrics.inc("tts_cache_requests_total", result="miss")
+        return None
+
+    path = _path_for(key)
+    try:
+        os.utime(path)
+    except OSError:
+        # Deleted behind our back — forget it
+        _index.pop(key)
+        metrics.inc("tts_cache_requests_total", result="miss")
+        return None
+    metrics.inc("tts_cache_requests_total", result="hit")
+    return path
+
+
+def _write(path: Path, audio: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f"{path.stem}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(audio)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+async def store(key: str, audio: bytes) -> Optional[Path]:
+    """Persist `audio` under `key`; returns its path (None when disabled)."""
+    if _index is None or not audio:
+        return None
+    path = _path_for(key)
+    await asyncio.to_thread(_write, path, audio)
+    _index.set(key, len(audio))
+    # The new entry itself may have been evicted if it exceeds the budget
+    return path if key in _index else None
+
+
+def stats() -> dict:
+    if _index is None:
+        return {"enabled": False}
+    return {"enabled": True, **_index.stats()}
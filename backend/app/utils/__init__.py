@@ -0,0 +1 @@
+# Dependency-free helpers shared by models and services
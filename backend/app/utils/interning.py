@@ -0,0 +1,31 @@
+"""
+═══════════════════════════════════════════════════════════════
+INTERNING — Canonical instances of fixed server-side strings
+═══════════════════════════════════════════════════════════════
+Session answers are mostly picked from fixed option lists (persona doc
+lines, static question wording), so thousands of sessions would each
+hold their own copy of the same few strings. Texts registered here
+are stored once; intern_text() swaps an equal string for the
+registered instance.
+
+Only server-side text is ever registered. Client strings pass through
+unchanged and are never sys.intern'ed, since interned strings are
+immortal on Python 3.12+.
+
+Dependency-free, so both app.models and app.services can import it.
+"""
+
+from __future__ import annotations
+
+_CANONICAL: dict[str, str] = {}
+
+
+def register_canonical(*texts: str) -> None:
+    """Add fixed server-side texts to the canonical table."""
+    for text in texts:
+        _CANONICAL.setdefault(text, text)
+
+
+def intern_text(text: str) -> str:
+    """The registered instance equal to `text`, otherwise `text` itself."""
+    return _CANONICAL.get(text, text)
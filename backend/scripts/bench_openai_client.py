@@ -0,0 +1,126 @@
+"""
+═══════════════════════════════════════════════════════════════
+BENCHMARK — Per-call AsyncOpenAI vs the shared pooled client
+═══════════════════════════════════════════════════════════════
+Starts scripts.mock_openai_server in a subprocess and sends N chat
+completions through:
+  • per-call — a fresh AsyncOpenAI per request (the old behaviour:
+    new connection pool, new TCP/TLS handshake every time)
+  • shared   — openai_service.get_client(), one pooled client
+
+and reports p50 / p99 latency and throughput for each.
+
+Usage (from backend/):
+    python -m scripts.bench_openai_client --requests 2000 --concurrency 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.config import get_settings
+from app.services import openai_service
+
+MESSAGES = [{"role": "user", "content": "ping"}]
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def _wait_ready(base_url: str, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(base_url.rsplit("/v1", 1)[0] + "/docs")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"Mock OpenAI server did not start at {base_url}")
+
+
+async def _per_call() -> None:
+    settings = get_settings()
+    client = AsyncOpenAI(api_key=settings.openai_api_key_active, base_url=settings.OPENAI_BASE_URL)
+    try:
+        await client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES)
+    finally:
+        await client.close()
+
+
+async def _shared() -> None:
+    client = openai_service.get_client()
+    await client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES)
+
+
+async def _bench(label: str, call, requests: int, concurrency: int) -> dict:
+    samples: list[float] = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            start = time.perf_counter()
+            await call()
+            samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    return {
+        "client": label,
+        "requests": requests,
+        "req_per_s": round(requests / elapsed),
+        "p50_ms": round(statistics.median(samples) * 1000, 2),
+        "p99_ms": round(_percentile(samples, 0.99) * 1000, 2),
+    }
+
+
+async def main(requests: int, concurrency: int, port: int, latency_ms: float) -> None:
+    base_url = f"http://127.0.0.1:{port}/v1"
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "sk-mock")
+    get_settings.cache_clear()
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "scripts.mock_openai_server",
+         "--port", str(port), "--latency-ms", str(latency_ms)],
+    )
+    try:
+        await _wait_ready(base_url)
+        await openai_service.init_client()
+        # Warm both paths so import / first-connection costs are excluded
+        await _per_call()
+        await _shared()
+
+        results = [
+            await _bench("per-call", _per_call, requests, concurrency),
+            await _bench("shared", _shared, requests, concurrency),
+        ]
+        await openai_service.close_client()
+    finally:
+        server.terminate()
+        server.wait()
+
+    for row in results:
+        print("  ".join(f"{k}={v}" for k, v in row.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.port, args.latency_ms))
@@ -0,0 +1,111 @@
+"""
+═══════════════════════════════════════════════════════════════
+BENCHMARK — In-memory vs SQLite (WAL, write-behind) session backends
+═══════════════════════════════════════════════════════════════
+Drives the full Q1 → Q3 → 3 dynamic answers → recommendations flow
+through app.services.session_store for N sessions and reports
+per-call latency (p50 / p99) and total throughput for each backend.
+
+Usage (from backend/):
+    python -m scripts.bench_session_backends --sessions 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from app.services import session_store
+from app.services.session_backends import (
+    MemorySessionBackend,
+    SessionBackend,
+    SQLiteSessionBackend,
+)
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def _run_flow(samples: list[float]) -> None:
+    async def timed(coro):
+        start = time.perf_counter()
+        result = await coro
+        samples.append(time.perf_counter() - start)
+        return result
+
+    session = await timed(session_store.create_session())
+    sid = session.session_id
+    await timed(session_store.set_outcome(sid, "lead-generation", "Lead Generation"))
+    await timed(session_store.set_domain(sid, "Content & Social Media"))
+    await timed(session_store.set_task(sid, "Generate social media posts captions & hooks"))
+    await timed(session_store.set_dynamic_questions(
+        sid, [f"Question {i}?" for i in range(3)], persona_doc_name=None
+    ))
+    for i in range(3):
+        await timed(session_store.add_dynamic_answer(sid, i, f"Answer {i}"))
+    await timed(session_store.set_recommendations(
+        sid,
+        extensions=[{"name": "Tool", "description": "Does things", "url": "https://example.com"}],
+        gpts=[],
+        companies=[],
+    ))
+
+
+async def _bench(backend: SessionBackend, sessions: int, concurrency: int) -> dict:
+    await session_store.init_backend(backend)
+    samples: list[float] = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            await _run_flow(samples)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+
+    close_start = time.perf_counter()
+    await session_store.close_backend()
+    drain = time.perf_counter() - close_start
+
+    return {
+        "backend": backend.name,
+        "calls": len(samples),
+        "elapsed_s": round(elapsed, 3),
+        "calls_per_s": round(len(samples) / elapsed),
+        "p50_us": round(statistics.median(samples) * 1e6, 1),
+        "p99_us": round(_percentile(samples, 0.99) * 1e6, 1),
+        "final_drain_s": round(drain, 3),
+    }
+
+
+async def main(sessions: int, concurrency: int) -> None:
+    results = [
+        await _bench(
+            MemorySessionBackend(max_entries=sessions * 2), sessions, concurrency
+        ),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_backend = SQLiteSessionBackend(
+            path=str(Path(tmp) / "sessions.db"), max_entries=sessions * 2
+        )
+        results.append(await _bench(sqlite_backend, sessions, concurrency))
+        results[-1]["rows_written"] = sqlite_backend.rows_written
+        results[-1]["flushes"] = sqlite_backend.flushes
+
+    for row in results:
+        print("  ".join(f"{k}={v}" for k, v in row.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions, args.concurrency))
@@ -0,0 +1,116 @@
+"""
+═══════════════════════════════════════════════════════════════
+BENCHMARK — Memory per session: pydantic SessionContext vs SessionRecord
+═══════════════════════════════════════════════════════════════
+Builds N fully-answered sessions (Q1-Q3 + one answer per diagnostic
+section, options taken from the real persona docs) in each
+representation and reports traced bytes per session plus the time
+spent building them.
+
+Usage (from backend/):
+    python -m scripts.bench_session_memory --sizes 10000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+import uuid
+
+from app.models.session import (
+    QARecord,
+    QuestionAnswer,
+    SessionContext,
+    SessionRecord,
+    SessionStage,
+)
+from app.services.persona_doc_service import get_diagnostic_sections, preload_all_docs
+from app.services.session_store import Q1_OUTCOME, Q2_DOMAIN, Q3_TASK
+from app.utils.interning import intern_text
+
+DOMAIN = "Content & Social Media"
+TASK = "Generate social media posts captions & hooks"
+OUTCOME_LABEL = "Lead Generation (Marketing, SEO & Social)"
+
+
+def _sections() -> list[dict]:
+    diagnostic = get_diagnostic_sections(DOMAIN, TASK) or {}
+    return diagnostic.get("sections", [])
+
+
+def _build_pydantic(i: int, sections: list[dict]) -> SessionContext:
+    # Answers arrive as fresh strings from the request body
+    session = SessionContext(session_id=str(uuid.uuid4()))
+    session.outcome = "lead-generation"
+    session.outcome_label = "".join(OUTCOME_LABEL)
+    session.domain = "".join(DOMAIN)
+    session.task = "".join(TASK)
+    session.stage = SessionStage.DYNAMIC_QUESTIONS
+    session.questions_answers = [
+        QuestionAnswer(question=Q1_OUTCOME, answer=session.outcome_label),
+        QuestionAnswer(question=Q2_DOMAIN, answer=session.domain),
+        QuestionAnswer(question=Q3_TASK, answer=session.task),
+    ]
+    for section in sections:
+        session.dynamic_questions.append(section["question"])
+        answer = "".join(section["items"][i % len(section["items"])])
+        session.questions_answers.append(
+            QuestionAnswer(question=section["question"], answer=answer, question_type="dynamic")
+        )
+    return SessionContext.model_validate(session.model_dump())
+
+
+def _build_record(i: int, sections: list[dict]) -> SessionRecord:
+    session = SessionRecord(session_id=str(uuid.uuid4()))
+    session.outcome = intern_text("lead-generation")
+    session.outcome_label = intern_text("".join(OUTCOME_LABEL))
+    session.domain = intern_text("".join(DOMAIN))
+    session.task = intern_text("".join(TASK))
+    session.stage = SessionStage.DYNAMIC_QUESTIONS
+    session.questions_answers = [
+        QARecord(Q1_OUTCOME, session.outcome_label),
+        QARecord(Q2_DOMAIN, session.domain),
+        QARecord(Q3_TASK, session.task),
+    ]
+    for section in sections:
+        session.dynamic_questions.append(section["question"])
+        answer = intern_text("".join(section["items"][i % len(section["items"])]))
+        session.questions_answers.append(
+            QARecord(intern_text(section["question"]), answer, "dynamic")
+        )
+    return session
+
+
+def _measure(builder, n: int, sections: list[dict]) -> tuple[float, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    sessions = [builder(i, sections) for i in range(n)]
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del sessions
+    return current / n, elapsed
+
+
+def main(sizes: list[int]) -> None:
+    preload_all_docs()
+    sections = _sections()
+
+    for n in sizes:
+        for label, builder in (("pydantic", _build_pydantic), ("slots", _build_record)):
+            per_session, elapsed = _measure(builder, n, sections)
+            print(
+                f"sessions={n:<7} repr={label:<8} "
+                f"bytes_per_session={per_session:,.0f}  "
+                f"total_mb={per_session * n / 1e6:,.1f}  build_s={elapsed:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+    main(args.sizes)
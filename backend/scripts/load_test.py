@@ -0,0 +1,233 @@
+"""
+═══════════════════════════════════════════════════════════════
+LOAD TEST — Concurrent end-to-end flows against the HTTP API
+═══════════════════════════════════════════════════════════════
+N virtual users run for a fixed duration, each repeatedly picking a
+flow by weight (--mix):
+  • agent  — /agent/session → outcome → domain → task → every answer
+             → recommend
+  • chat   — /chat
+  • speak  — /speak
+  • search — /companies/search
+
+Every HTTP call is timed per route; the report lists count, errors,
+throughput and p50 / p95 / p99 latency for each.
+
+Without --base-url the script is self-contained: it starts
+scripts.mock_openai_server (OpenAI + Google Sheets stand-in) and a
+backend on --port wired to it with rate limiting off, so runs are
+reproducible and spend no quota. Pass --replay to serve recorded
+responses from a cassette instead of canned ones.
+
+Usage (from backend/):
+    python -m scripts.load_test --users 50 --duration 60
+    python -m scripts.load_test --mix agent=1,chat=4 --mock-latency-ms lognormal:400,0.5 --rate-429 0.02
+    python -m scripts.load_test --base-url http://127.0.0.1:8000 --users 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+DOMAIN = "Content & Social Media"
+TASK = "Generate social media posts captions & hooks"
+CHAT_MESSAGES = [
+    "How can AI help me write better hooks?",
+    "What should I automate first in my marketing?",
+    "Which tools do you recommend for a small team?",
+]
+SEARCH_REQUIREMENTS = ["campaign reporting", "lead scoring", "ad spend optimisation"]
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def _parse_mix(spec: str) -> dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in FLOWS:
+            raise SystemExit(f"Unknown flow {name!r}; choose from {', '.join(FLOWS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+async def _wait_ready(url: str, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server did not start at {url}")
+
+
+class Recorder:
+    """Per-route latency samples and error counts."""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, route: str, json: dict | None = None) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            resp = await client.post(route, json=json)
+        except httpx.HTTPError:
+            resp = None
+        self.samples[route].append(time.perf_counter() - start)
+        if resp is None or resp.status_code >= 400:
+            self.errors[route] += 1
+            return None
+        return resp
+
+    def report(self, elapsed: float) -> list[dict]:
+        rows = []
+        for route in sorted(self.samples):
+            samples = self.samples[route]
+            rows.append({
+                "route": route,
+                "count": len(samples),
+                "errors": self.errors[route],
+                "req_per_s": round(len(samples) / elapsed, 1),
+                "p50_ms": round(_percentile(samples, 0.50) * 1000, 1),
+                "p95_ms": round(_percentile(samples, 0.95) * 1000, 1),
+                "p99_ms": round(_percentile(samples, 0.99) * 1000, 1),
+            })
+        return rows
+
+
+# ── Flows ──────────────────────────────────────────────────────
+
+
+async def _agent_flow(client: httpx.AsyncClient, rec: Recorder) -> None:
+    resp = await rec.call(client, "/api/v1/agent/session")
+    if resp is None:
+        return
+    sid = resp.json()["session_id"]
+    steps = [
+        ("/api/v1/agent/session/outcome",
+         {"session_id": sid, "outcome": "lead-generation", "outcome_label": "Lead Generation"}),
+        ("/api/v1/agent/session/domain", {"session_id": sid, "domain": DOMAIN}),
+    ]
+    for route, body in steps:
+        if await rec.call(client, route, body) is None:
+            return
+    resp = await rec.call(client, "/api/v1/agent/session/task", {"session_id": sid, "task": TASK})
+    if resp is None:
+        return
+    for index, question in enumerate(resp.json().get("questions", [])):
+        options = question.get("options") or ["Not sure"]
+        answer = {"session_id": sid, "question_index": index, "answer": random.choice(options)}
+        if await rec.call(client, "/api/v1/agent/session/answer", answer) is None:
+            return
+    await rec.call(client, "/api/v1/agent/session/recommend", {"session_id": sid})
+
+
+async def _chat_flow(client: httpx.AsyncClient, rec: Recorder) -> None:
+    await rec.call(client, "/api/v1/chat", {"message": random.choice(CHAT_MESSAGES), "persona": "default"})
+
+
+async def _speak_flow(client: httpx.AsyncClient, rec: Recorder) -> None:
+    await rec.call(client, "/api/v1/speak", {"text": random.choice(CHAT_MESSAGES), "language": "english"})
+
+
+async def _search_flow(client: httpx.AsyncClient, rec: Recorder) -> None:
+    await rec.call(
+        client,
+        "/api/v1/companies/search",
+        {"domain": "Marketing", "requirement": random.choice(SEARCH_REQUIREMENTS)},
+    )
+
+
+FLOWS = {"agent": _agent_flow, "chat": _chat_flow, "speak": _speak_flow, "search": _search_flow}
+
+
+async def run(base_url: str, users: int, duration: float, mix: dict[str, float]) -> None:
+    rec = Recorder()
+    names, weights = list(mix), list(mix.values())
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as client:
+        stop_at = time.monotonic() + duration
+
+        async def user() -> None:
+            while time.monotonic() < stop_at:
+                await FLOWS[random.choices(names, weights)[0]](client, rec)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(users)))
+        elapsed = time.perf_counter() - start
+
+    for row in rec.report(elapsed):
+        print("  ".join(f"{k}={v}" for k, v in row.items()))
+
+
+def _start_stack(args) -> list[subprocess.Popen]:
+    """Mock OpenAI / Sheets server plus a backend wired to it."""
+    mock_url = f"http://127.0.0.1:{args.mock_port}"
+    mock_cmd = [
+        sys.executable, "-m", "scripts.mock_openai_server", "--port", str(args.mock_port),
+        "--latency-ms", args.mock_latency_ms, "--token-delay-ms", args.mock_token_delay_ms,
+        "--rate-429", str(args.rate_429), "--rate-timeout", str(args.rate_timeout),
+    ]
+    if args.replay:
+        mock_cmd += ["--replay", args.replay]
+    env = {
+        **os.environ,
+        "OPENAI_BASE_URL": f"{mock_url}/v1",
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "sk-mock",
+        "GOOGLE_SHEETS_BASE_URL": mock_url,
+        "RATE_LIMIT_ENABLED": "false",
+    }
+    backend_cmd = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--port", str(args.port), "--log-level", "warning",
+    ]
+    return [subprocess.Popen(mock_cmd), subprocess.Popen(backend_cmd, env=env)]
+
+
+async def main(args) -> None:
+    mix = _parse_mix(args.mix)
+    processes: list[subprocess.Popen] = []
+    base_url = args.base_url
+    if base_url is None:
+        base_url = f"http://127.0.0.1:{args.port}"
+        processes = _start_stack(args)
+    try:
+        if processes:
+            await _wait_ready(f"http://127.0.0.1:{args.mock_port}/mock/stats")
+        await _wait_ready(f"{base_url}/health")
+        await run(base_url, args.users, args.duration, mix)
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--base-url", help="Existing backend to target (skips starting one)")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds")
+    parser.add_argument("--mix", default="agent=1,chat=3,speak=1,search=1")
+    parser.add_argument("--port", type=int, default=8010)
+    parser.add_argument("--mock-port", type=int, default=8787)
+    parser.add_argument("--mock-latency-ms", default="lognormal:300,0.5")
+    parser.add_argument("--mock-token-delay-ms", default="uniform:5,20")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-timeout", type=float, default=0.0)
+    parser.add_argument("--replay", metavar="CASSETTE")
+    asyncio.run(main(parser.parse_args()))
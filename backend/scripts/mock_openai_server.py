@@ -0,0 +1,394 @@
+"""
+═══════════════════════════════════════════════════════════════
+MOCK OPENAI SERVER — Local stand-in for api.openai.com
+═══════════════════════════════════════════════════════════════
+OpenAI-compatible endpoints for benchmarks and load tests, so no real
+quota is spent:
+  • POST /v1/chat/completions — canned (or replayed) completion after a
+    sampled latency; with "stream": true, SSE chunks paced by a sampled
+    per-token delay
+  • POST /v1/audio/speech     — a few KB of fake (or replayed) MP3 bytes
+  • GET  /spreadsheets/d/{id}/gviz/tq — a small company sheet as CSV
+
+Modes:
+  • canned (default)  — built-in replies shaped like the real ones
+  • --record FILE     — proxy every call to --upstream with the caller's
+                        API key and append the responses to a cassette
+  • --replay FILE     — serve recorded responses by request hash, falling
+                        back to canned replies for unknown requests
+
+Latency and token pacing take a distribution spec: "50" (fixed ms),
+"uniform:20,80", "normal:50,10" or "lognormal:50,0.5" (median ms, sigma).
+--rate-429 / --rate-500 / --rate-timeout inject faults on that fraction
+of OpenAI calls (a timeout holds the request for --timeout-s).
+
+Point the backend at it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1
+and GOOGLE_SHEETS_BASE_URL=http://127.0.0.1:<port>.
+
+Usage (from backend/):
+    python -m scripts.mock_openai_server --port 8787 --latency-ms lognormal:400,0.5
+    python -m scripts.mock_openai_server --record var/openai.cassette
+    python -m scripts.mock_openai_server --replay var/openai.cassette --rate-429 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+import httpx
+import orjson
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+
+FAKE_MP3 = b"ID3" + bytes(4093)
+REPLY = "This is a mock reply."
+STREAM_TOKENS = 40
+
+MOCK_SHEET_CSV = """MARKETING,,,,
+Startup name,Country,Basic problem,Core product description (<=3 lines),Differentiator
+Mockly,India,Slow campaign reporting,AI dashboards for marketing teams,Setup in minutes
+Adster,USA,Wasted ad spend,Automated bid optimisation for SMBs,Works across networks
+SALES,,,,
+Startup name,Country,Basic problem,Core product description (<=3 lines),Differentiator
+Leadfox,UK,Manual lead scoring,Scores inbound leads against your ICP,CRM native
+"""
+
+# Only these response headers are kept in cassettes / passed through
+_KEPT_HEADERS = ("content-type", "x-ratelimit-remaining-requests", "x-ratelimit-remaining-tokens")
+
+
+# ── Distributions ──────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """Milliseconds sampled from a named distribution."""
+    kind: str
+    a: float
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str | float) -> "Distribution":
+        if isinstance(spec, (int, float)):
+            return cls("fixed", float(spec))
+        kind, _, params = spec.partition(":")
+        if not params:
+            return cls("fixed", float(kind))
+        values = [float(v) for v in params.split(",")]
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown distribution {kind!r}")
+        return cls(kind, *values)
+
+    def sample_seconds(self) -> float:
+        if self.kind == "uniform":
+            ms = random.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            ms = random.gauss(self.a, self.b)
+        elif self.kind == "lognormal":
+            ms = self.a * random.lognormvariate(0.0, self.b)
+        else:
+            ms = self.a
+        return max(ms, 0.0) / 1000
+
+
+@dataclass(frozen=True)
+class Faults:
+    """Fraction of OpenAI calls answered with 429 / 500 / a hang."""
+    rate_429: float = 0.0
+    rate_500: float = 0.0
+    rate_timeout: float = 0.0
+    timeout_s: float = 120.0
+
+
+# ── Cassettes ──────────────────────────────────────────────────
+
+
+def request_key(path: str, body: dict) -> str:
+    """Hash identifying a request for record / replay."""
+    return hashlib.sha256(
+        path.encode() + b"\n" + orjson.dumps(body, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+
+
+class Cassette:
+    """
+    Recorded responses, one JSON object per line:
+    {"key", "path", "status", "headers", "body" (base64) | "events" (SSE data lines)}.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.entries: dict[str, dict] = {}
+        if self.path.exists():
+            for line in self.path.read_bytes().splitlines():
+                if line.strip():
+                    entry = orjson.loads(line)
+                    self.entries[entry["key"]] = entry
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.entries.get(key)
+
+    def add(self, entry: dict) -> None:
+        self.entries[entry["key"]] = entry
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as f:
+            f.write(orjson.dumps(entry) + b"\n")
+
+
+# ── Canned Replies ─────────────────────────────────────────────
+
+
+def _chunk(completion_id: str, model: str, delta: dict, finish: str | None = None, usage=None) -> bytes:
+    payload = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish}] if delta is not None else [],
+        "usage": usage,
+    }
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+def _reply_for(body: dict) -> str:
+    """Canned reply shaped like what each backend caller parses."""
+    messages = body.get("messages") or [{}]
+    if "topMatches" in (messages[0].get("content") or ""):
+        return orjson.dumps(
+            {"topMatches": [{"index": 0, "score": 9, "matchReason": "[mock] match"}], "alternatives": []}
+        ).decode()
+    if (body.get("response_format") or {}).get("type") != "json_object":
+        return REPLY
+    try:
+        segments = orjson.loads(messages[-1]["content"])
+    except (orjson.JSONDecodeError, KeyError, IndexError, TypeError):
+        segments = None
+    if isinstance(segments, list):
+        return orjson.dumps({"translations": [f"[mock] {s}" for s in segments]}).decode()
+    # Questions / recommendations: one object satisfying every JSON caller
+    return orjson.dumps({
+        "questions": [{"question": "[mock] question?", "options": ["A", "B"], "allows_free_text": True}],
+        "extensions": [{"name": "Mock Extension", "description": "[mock]", "why_recommended": "[mock]"}],
+        "gpts": [],
+        "companies": [],
+        "summary": "[mock] summary",
+    }).decode()
+
+
+def _completion(completion_id: str, model: str, content: str) -> dict:
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+        ],
+        "usage": {"prompt_tokens": 12, "completion_tokens": 6, "total_tokens": 18},
+    }
+
+
+# ── App ────────────────────────────────────────────────────────
+
+
+def create_mock_app(
+    latency_ms: float | str | Distribution = 50.0,
+    token_delay_ms: float | str | Distribution = 10.0,
+    faults: Faults = Faults(),
+    cassette: Optional[Cassette] = None,
+    record_upstream: Optional[str] = None,
+) -> FastAPI:
+    """
+    Args:
+        latency_ms: Time to the response (or first stream chunk).
+        token_delay_ms: Delay between streamed chunks.
+        faults: Injected error / hang rates.
+        cassette: Replay source, or record target with `record_upstream`.
+        record_upstream: Real API base URL to proxy to while recording.
+    """
+    latency = latency_ms if isinstance(latency_ms, Distribution) else Distribution.parse(latency_ms)
+    token_delay = (
+        token_delay_ms if isinstance(token_delay_ms, Distribution) else Distribution.parse(token_delay_ms)
+    )
+    app = FastAPI(default_response_class=ORJSONResponse)
+    upstream = httpx.AsyncClient(base_url=record_upstream, timeout=120.0) if record_upstream else None
+    stats = {"replayed": 0, "canned": 0, "recorded": 0, "faults": 0}
+
+    async def inject_fault() -> Optional[Response]:
+        roll = random.random()
+        if roll < faults.rate_429:
+            stats["faults"] += 1
+            return ORJSONResponse(
+                {"error": {"message": "Rate limit reached (mock)", "type": "requests", "code": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"retry-after": "1", "x-ratelimit-reset-requests": "1s"},
+            )
+        roll -= faults.rate_429
+        if roll < faults.rate_500:
+            stats["faults"] += 1
+            return ORJSONResponse({"error": {"message": "Internal error (mock)"}}, status_code=500)
+        roll -= faults.rate_500
+        if roll < faults.rate_timeout:
+            stats["faults"] += 1
+            await asyncio.sleep(faults.timeout_s)
+        return None
+
+    async def paced(events: list[bytes]) -> AsyncIterator[bytes]:
+        await asyncio.sleep(latency.sample_seconds())
+        for event in events:
+            yield event
+            await asyncio.sleep(token_delay.sample_seconds())
+
+    def canned_stream(body: dict, include_usage: bool) -> list[bytes]:
+        model = body.get("model", "gpt-4o-mini")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        reply = _reply_for(body)
+        if reply == REPLY:
+            tokens = [f"tok{i} " for i in range(STREAM_TOKENS)]
+        else:
+            # JSON answers are streamed in small pieces, like real tokens
+            tokens = [reply[i:i + 8] for i in range(0, len(reply), 8)]
+        events = [_chunk(completion_id, model, {"role": "assistant", "content": ""})]
+        events += [_chunk(completion_id, model, {"content": token}) for token in tokens]
+        events.append(_chunk(completion_id, model, {}, finish="stop"))
+        if include_usage:
+            usage = {"prompt_tokens": 12, "completion_tokens": len(tokens), "total_tokens": 12 + len(tokens)}
+            events.append(_chunk(completion_id, model, None, usage=usage))
+        events.append(b"data: [DONE]\n\n")
+        return events
+
+    async def record(request: Request, path: str, body: dict, key: str) -> Response:
+        """Proxy to the real API and store the response in the cassette."""
+        headers = {"authorization": request.headers.get("authorization", "")}
+        if body.get("stream"):
+            upstream_request = upstream.build_request("POST", path, json=body, headers=headers)
+            response = await upstream.send(upstream_request, stream=True)
+            events: list[bytes] = []
+
+            async def relay() -> AsyncIterator[bytes]:
+                buffer = b""
+                try:
+                    async for data in response.aiter_bytes():
+                        buffer += data
+                        *complete, buffer = buffer.split(b"\n\n")
+                        for event in complete:
+                            if event.strip():
+                                events.append(event + b"\n\n")
+                                yield event + b"\n\n"
+                finally:
+                    await response.aclose()
+                    if response.status_code == 200:
+                        cassette.add({"key": key, "path": path, "status": 200,
+                                      "headers": {"content-type": "text/event-stream"},
+                                      "events": [e.decode() for e in events]})
+                        stats["recorded"] += 1
+
+            return StreamingResponse(relay(), status_code=response.status_code, media_type="text/event-stream")
+
+        response = await upstream.post(path, json=body, headers=headers)
+        kept = {k: v for k, v in response.headers.items() if k.lower() in _KEPT_HEADERS}
+        if response.status_code == 200:
+            cassette.add({"key": key, "path": path, "status": 200, "headers": kept,
+                          "body": base64.b64encode(response.content).decode()})
+            stats["recorded"] += 1
+        return Response(response.content, status_code=response.status_code, headers=kept)
+
+    async def replay(entry: dict) -> Response:
+        stats["replayed"] += 1
+        if "events" in entry:
+            return StreamingResponse(
+                paced([e.encode() for e in entry["events"]]), media_type="text/event-stream"
+            )
+        await asyncio.sleep(latency.sample_seconds())
+        return Response(base64.b64decode(entry["body"]), status_code=entry["status"], headers=entry["headers"])
+
+    async def handle(request: Request, path: str, canned) -> Response:
+        body = await request.json()
+        fault = await inject_fault()
+        if fault is not None:
+            return fault
+        key = request_key(path, body)
+        if upstream is not None and cassette is not None:
+            return await record(request, path, body, key)
+        entry = cassette.get(key) if cassette is not None else None
+        if entry is not None:
+            return await replay(entry)
+        stats["canned"] += 1
+        return await canned(body)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        async def canned(body: dict) -> Response:
+            model = body.get("model", "gpt-4o-mini")
+            if body.get("stream"):
+                include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+                return StreamingResponse(paced(canned_stream(body, include_usage)), media_type="text/event-stream")
+            await asyncio.sleep(latency.sample_seconds())
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+            return ORJSONResponse(_completion(completion_id, model, _reply_for(body)))
+
+        return await handle(request, "/chat/completions", canned)
+
+    @app.post("/v1/audio/speech")
+    async def speech(request: Request):
+        async def canned(body: dict) -> Response:
+            await asyncio.sleep(latency.sample_seconds())
+            return Response(content=FAKE_MP3, media_type="audio/mpeg")
+
+        return await handle(request, "/audio/speech", canned)
+
+    @app.get("/spreadsheets/d/{sheet_id}/gviz/tq")
+    async def sheet_csv(sheet_id: str):
+        return Response(MOCK_SHEET_CSV, media_type="text/csv")
+
+    @app.get("/mock/stats")
+    async def mock_stats():
+        return stats
+
+    @app.on_event("shutdown")
+    async def close_upstream():
+        if upstream is not None:
+            await upstream.aclose()
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency-ms", default="50", help='e.g. "50", "lognormal:400,0.5"')
+    parser.add_argument("--token-delay-ms", default="10", help='e.g. "10", "uniform:5,30"')
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-500", type=float, default=0.0)
+    parser.add_argument("--rate-timeout", type=float, default=0.0)
+    parser.add_argument("--timeout-s", type=float, default=120.0)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", metavar="CASSETTE")
+    mode.add_argument("--replay", metavar="CASSETTE")
+    parser.add_argument("--upstream", default="https://api.openai.com/v1")
+    args = parser.parse_args()
+
+    cassette_path = args.record or args.replay
+    uvicorn.run(
+        create_mock_app(
+            args.latency_ms,
+            args.token_delay_ms,
+            faults=Faults(args.rate_429, args.rate_500, args.rate_timeout, args.timeout_s),
+            cassette=Cassette(cassette_path) if cassette_path else None,
+            record_upstream=args.upstream if args.record else None,
+        ),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
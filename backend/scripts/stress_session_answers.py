@@ -0,0 +1,145 @@
+"""
+═══════════════════════════════════════════════════════════════
+STRESS — Concurrent /session/answer submissions
+═══════════════════════════════════════════════════════════════
+Creates N sessions through the HTTP API, then fires every dynamic
+answer for all of them at once — each answer submitted several times
+(double clicks / client retries) and in shuffled order. Afterwards
+every session must hold exactly one answer per diagnostic question
+and be in the recommendation stage; any lost or duplicated update is
+reported and the script exits non-zero.
+
+With --backend redis, two RedisSessionBackend instances share one
+in-process fakeredis server and requests alternate between them, so
+the cross-worker version CAS is exercised as well.
+
+Usage (from backend/):
+    python -m scripts.stress_session_answers --sessions 500 --duplicates 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+import httpx
+
+from app.main import create_app
+from app.middleware.rate_limit import limiter
+from app.services import session_store
+from app.services.persona_doc_service import preload_all_docs
+from app.services.session_backends import MemorySessionBackend, RedisSessionBackend
+
+DOMAIN = "Content & Social Media"
+TASK = "Generate social media posts captions & hooks"
+
+
+async def _create(client: httpx.AsyncClient) -> tuple[str, int]:
+    resp = await client.post("/api/v1/agent/session")
+    sid = resp.json()["session_id"]
+    await client.post(
+        "/api/v1/agent/session/outcome",
+        json={"session_id": sid, "outcome": "lead-generation", "outcome_label": "Lead Generation"},
+    )
+    await client.post("/api/v1/agent/session/domain", json={"session_id": sid, "domain": DOMAIN})
+    resp = await client.post("/api/v1/agent/session/task", json={"session_id": sid, "task": TASK})
+    return sid, len(resp.json()["questions"])
+
+
+async def _run_redis_workers(sessions: int, duplicates: int, concurrency: int) -> int:
+    from fakeredis import FakeServer
+    from fakeredis.aioredis import FakeRedis
+
+    server = FakeServer()
+    workers = [
+        RedisSessionBackend(url="redis://fake", client=FakeRedis(server=server))
+        for _ in range(2)
+    ]
+    current = {"i": 0}
+
+    # Alternate the active backend per request to mimic two uvicorn workers
+    def pick() -> RedisSessionBackend:
+        current["i"] += 1
+        return workers[current["i"] % len(workers)]
+
+    original = session_store.get_backend
+    session_store.get_backend = pick
+    try:
+        return await _run(sessions, duplicates, concurrency)
+    finally:
+        session_store.get_backend = original
+
+
+async def _run(sessions: int, duplicates: int, concurrency: int) -> int:
+    app = create_app()
+    transport = httpx.ASGITransport(app=app)
+    sem = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://stress") as client:
+        created = await asyncio.gather(*(_create(client) for _ in range(sessions)))
+
+        jobs = [
+            (sid, index)
+            for sid, total in created
+            for index in range(total)
+            for _ in range(duplicates)
+        ]
+        random.shuffle(jobs)
+        statuses: dict[int, int] = {}
+
+        async def submit(sid: str, index: int) -> None:
+            async with sem:
+                resp = await client.post(
+                    "/api/v1/agent/session/answer",
+                    json={"session_id": sid, "question_index": index, "answer": f"answer {index}"},
+                )
+                statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(submit(sid, index) for sid, index in jobs))
+        elapsed = time.perf_counter() - start
+
+    failures = 0
+    for sid, total in created:
+        session = await session_store.get_session(sid)
+        answers = [qa for qa in session.questions_answers if qa.question_type == "dynamic"]
+        if (
+            len(answers) != total
+            or session.dynamic_questions_asked != total
+            or session.stage.value != "recommendation"
+        ):
+            failures += 1
+
+    print(
+        f"sessions={sessions} requests={len(jobs)} elapsed_s={elapsed:.2f} "
+        f"req_per_s={len(jobs) / elapsed:,.0f} statuses={statuses} bad_sessions={failures}"
+    )
+    return failures
+
+
+async def main(backend: str, sessions: int, duplicates: int, concurrency: int) -> int:
+    preload_all_docs()
+    limiter.enabled = False
+
+    if backend == "redis":
+        return await _run_redis_workers(sessions, duplicates, concurrency)
+
+    await session_store.init_backend(MemorySessionBackend(max_entries=sessions * 2))
+    try:
+        return await _run(sessions, duplicates, concurrency)
+    finally:
+        await session_store.close_backend()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--backend", choices=["memory", "redis"], default="memory")
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--duplicates", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+    failures = asyncio.run(main(args.backend, args.sessions, args.duplicates, args.concurrency))
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,78 @@
+"""
+═══════════════════════════════════════════════════════════════
+WARM-UP — Pre-generate dynamic questions for every category row
+═══════════════════════════════════════════════════════════════
+Runs agent_service.generate_dynamic_questions() for each (growth
+bucket, sub-category, task) row of data/categories.csv and writes the
+results to the QUESTION_CACHE_PATH artifact that the backend loads at
+startup. Rows already cached for the current prompt + model are
+skipped unless --force is given, so an interrupted run can simply be
+restarted.
+
+Usage (from backend/):
+    python -m scripts.warm_question_cache --concurrency 8
+    python -m scripts.warm_question_cache --num-questions 2,3 --force
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from app.config import get_settings
+from app.data.categories import load_categories
+from app.services import agent_service, openai_service, question_cache
+from app.services.persona_doc_service import preload_all_docs
+
+
+async def main(num_questions: list[int], concurrency: int, force: bool) -> None:
+    preload_all_docs()
+    await question_cache.init_cache()
+    await openai_service.init_client()
+
+    fingerprint = agent_service.questions_fingerprint()
+    jobs = []
+    for entry in load_categories():
+        for n in num_questions:
+            key = question_cache.cache_key(entry.growth_bucket, entry.sub_category, entry.task, n)
+            if force or question_cache.lookup(key, fingerprint) is None:
+                jobs.append((entry, n))
+
+    sem = asyncio.Semaphore(concurrency)
+    done = {"ok": 0, "fallback": 0}
+
+    async def one(entry, n: int) -> None:
+        async with sem:
+            await agent_service.generate_dynamic_questions(
+                outcome="",
+                outcome_label=entry.growth_bucket,
+                domain=entry.sub_category,
+                task=entry.task,
+                num_questions=n,
+                refresh=True,
+            )
+        key = question_cache.cache_key(entry.growth_bucket, entry.sub_category, entry.task, n)
+        done["ok" if question_cache.lookup(key, fingerprint) is not None else "fallback"] += 1
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(one(entry, n) for entry, n in jobs))
+    finally:
+        await question_cache.close_cache()
+        await openai_service.close_client()
+
+    print(
+        f"generated={done['ok']} failed={done['fallback']} "
+        f"cached_total={question_cache.stats()['entries']} "
+        f"seconds={time.perf_counter() - start:.1f} path={get_settings().QUESTION_CACHE_PATH}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--num-questions", default="3", help="Comma-separated, e.g. 2,3")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--force", action="store_true", help="Regenerate rows that are already cached")
+    args = parser.parse_args()
+    asyncio.run(main([int(n) for n in args.num_questions.split(",")], args.concurrency, args.force))